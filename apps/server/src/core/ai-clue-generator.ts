@@ -1,5 +1,5 @@
 import type { AgentInterfaceInput } from "../types/game.js";
-import { WordServiceClient } from "./word-service-client.js";
+import { type RelatedWordNeighbor, WordServiceClient, WordServiceError } from "./word-service-client.js";
 
 const CLUE_MAX_LEN = 10;
 
@@ -10,11 +10,47 @@ const fallbackClue = (word: string): string => trimClue(word.slice(0, 2));
 const randomPick = <T>(items: T[]): T => items[Math.floor(Math.random() * items.length)];
 
 export class AIClueGenerator {
+  private readonly sessionByRoom = new Map<string, string>();
+
   constructor(private readonly wordServiceClient: WordServiceClient) {}
 
+  async prefetchRoom(roomId: string, secretWords: string[]): Promise<void> {
+    // Hand every team's secret words to the word-service at game start so AI turns read precomputed data.
+    this.sessionByRoom.delete(roomId);
+    try {
+      const sessionId = await this.wordServiceClient.createSession(roomId, secretWords);
+      this.sessionByRoom.set(roomId, sessionId);
+    } catch {
+      // Prefetch is an optimization; clue generation falls back to live queries.
+    }
+  }
+
+  releaseRoom(roomId: string): void {
+    this.sessionByRoom.delete(roomId);
+  }
+
+  private async fetchCandidates(roomId: string, word: string, teamWords: string[]): Promise<RelatedWordNeighbor[]> {
+    // One budget for the whole lookup: a slow session call leaves the live fallback only what remains.
+    const deadline = Date.now() + this.wordServiceClient.timeoutMs;
+    const sessionId = this.sessionByRoom.get(roomId);
+    if (sessionId) {
+      try {
+        return await this.wordServiceClient.getClueCandidates(sessionId, word, 10, deadline, teamWords);
+      } catch (error) {
+        // Only an expired/unknown session is gone for good; timeouts and overload are worth retrying next turn.
+        if (error instanceof WordServiceError && error.status === 404) {
+          this.sessionByRoom.delete(roomId);
+        }
+      }
+    }
+    // The word-service masks clues that contain one of our secret words, so all 10 neighbors are usable.
+    return this.wordServiceClient.getRelatedWords(word, 10, deadline, teamWords);
+  }
+
   async generate(input: AgentInterfaceInput): Promise<[string, string, string]> {
     const wordsByIndex = new Map(input.secretWords.map((slot) => [slot.index, slot.zh]));
     const selectedWords = input.code.map((digit) => wordsByIndex.get(digit) ?? "");
+    const teamWords = input.secretWords.map((slot) => slot.zh).filter((word) => word.length > 0);
 
     const generated = await Promise.all(
       selectedWords.map(async (word) => {
@@ -22,7 +58,7 @@ export class AIClueGenerator {
           return "";
         }
         try {
-          const neighbors = await this.wordServiceClient.getRelatedWords(word, 10);
+          const neighbors = await this.fetchCandidates(input.roomId, word, teamWords);
           const candidateWords = neighbors
             .map((neighbor) => trimClue(neighbor.word))
             .filter((candidate) => candidate.length > 0);
@@ -754,6 +754,7 @@ export class GameService {
     }
 
     const result = await this.agentInterface({
+      roomId: room.id,
       secretWords: team.secretWords,
       history: room.deductionRows.filter((r) => r.teamId === teamId),
       code: attempt.code
@@ -1,45 +1,179 @@
+import http from "node:http";
+
 export type RelatedWordNeighbor = {
   word: string;
   score: number;
 };
 
+// Compact responses carry neighbors as `[word, score]` pairs and move model metadata to headers.
+type CompactNeighbor = [string, number];
+
 type RelatedWordsResponse = {
-  word: string;
-  k: number;
-  neighbors: RelatedWordNeighbor[];
+  neighbors: CompactNeighbor[];
+};
+
+type CreateSessionResponse = {
+  session_id: string;
+};
+
+type ClueCandidatesResponse = {
+  candidates: CompactNeighbor[];
 };
 
+const toNeighbors = (items: CompactNeighbor[]): RelatedWordNeighbor[] =>
+  items.map(([word, score]) => ({ word, score }));
+
+const excludeField = (fragments: string[]): { exclude_containing?: string[] } =>
+  fragments.length > 0 ? { exclude_containing: fragments } : {};
+
+export class WordServiceError extends Error {
+  constructor(
+    message: string,
+    readonly status?: number
+  ) {
+    super(message);
+    this.name = "WordServiceError";
+  }
+}
+
 export class WordServiceClient {
   private readonly baseUrl: string;
-  private readonly timeoutMs: number;
+  private readonly socketPath?: string;
+  readonly timeoutMs: number;
   private readonly topK: number;
+  private readonly agent = new http.Agent({ keepAlive: true });
 
-  constructor(params?: { baseUrl?: string; timeoutMs?: number; topK?: number }) {
+  constructor(params?: { baseUrl?: string; socketPath?: string; timeoutMs?: number; topK?: number }) {
     this.baseUrl = (params?.baseUrl ?? process.env.WORD_SERVICE_URL ?? "http://127.0.0.1:4201").replace(/\/+$/, "");
+    this.socketPath = params?.socketPath ?? (process.env.WORD_SERVICE_SOCKET || undefined);
     this.timeoutMs = params?.timeoutMs ?? Number(process.env.WORD_SERVICE_TIMEOUT_MS ?? 1_500);
     this.topK = params?.topK ?? 10;
   }
 
-  async getRelatedWords(word: string, k = this.topK): Promise<RelatedWordNeighbor[]> {
-    const signal = AbortSignal.timeout(this.timeoutMs);
-    const response = await fetch(`${this.baseUrl}/api/v1/related-words`, {
+  /**
+   * `deadline` (epoch ms) lets callers spend one budget across several requests; defaults to now + timeoutMs.
+   * Neighbors containing any `excludeContaining` fragment are dropped by the word-service before top-k.
+   */
+  async getRelatedWords(
+    word: string,
+    k = this.topK,
+    deadline = Date.now() + this.timeoutMs,
+    excludeContaining: string[] = []
+  ): Promise<RelatedWordNeighbor[]> {
+    const payload = await this.postJson<RelatedWordsResponse>(
+      "/api/v1/related-words",
+      { word, k, format: "compact", ...excludeField(excludeContaining) },
+      deadline
+    );
+    if (!Array.isArray(payload.neighbors)) {
+      throw new Error("word-service response malformed: neighbors must be array");
+    }
+
+    return toNeighbors(payload.neighbors);
+  }
+
+  async createSession(roomId: string, words: string[], k = this.topK): Promise<string> {
+    const payload = await this.postJson<CreateSessionResponse>(
+      "/api/v1/sessions",
+      { room_id: roomId, words, k },
+      Date.now() + this.timeoutMs
+    );
+    if (typeof payload.session_id !== "string") {
+      throw new Error("word-service response malformed: session_id must be string");
+    }
+    return payload.session_id;
+  }
+
+  async getClueCandidates(
+    sessionId: string,
+    word: string,
+    k = this.topK,
+    deadline = Date.now() + this.timeoutMs,
+    excludeContaining: string[] = []
+  ): Promise<RelatedWordNeighbor[]> {
+    const payload = await this.postJson<ClueCandidatesResponse>(
+      `/api/v1/sessions/${encodeURIComponent(sessionId)}/clues`,
+      { word, k, format: "compact", ...excludeField(excludeContaining) },
+      deadline
+    );
+    if (!Array.isArray(payload.candidates)) {
+      throw new Error("word-service response malformed: candidates must be array");
+    }
+    return toNeighbors(payload.candidates);
+  }
+
+  private async postJson<T>(path: string, body: Record<string, unknown>, deadline: number): Promise<T> {
+    const budgetMs = deadline - Date.now();
+    if (budgetMs <= 0) {
+      throw new WordServiceError("word-service request deadline already passed");
+    }
+    // Share our abort deadline so the word-service can degrade or drop work we will not wait for.
+    const payload = { ...body, budget_ms: budgetMs };
+    const headers = { "x-request-deadline": String(deadline) };
+    if (this.socketPath) {
+      return this.postJsonOverSocket<T>(this.socketPath, path, payload, headers, budgetMs);
+    }
+
+    const response = await fetch(`${this.baseUrl}${path}`, {
       method: "POST",
       headers: {
-        "content-type": "application/json"
+        "content-type": "application/json",
+        ...headers
       },
-      body: JSON.stringify({ word, k }),
-      signal
+      body: JSON.stringify(payload),
+      signal: AbortSignal.timeout(budgetMs)
     });
 
     if (!response.ok) {
-      throw new Error(`word-service request failed with status ${response.status}`);
+      throw new WordServiceError(`word-service request failed with status ${response.status}`, response.status);
     }
 
-    const payload = (await response.json()) as RelatedWordsResponse;
-    if (!Array.isArray(payload.neighbors)) {
-      throw new Error("word-service response malformed: neighbors must be array");
-    }
+    return (await response.json()) as T;
+  }
 
-    return payload.neighbors;
+  private postJsonOverSocket<T>(
+    socketPath: string,
+    path: string,
+    body: unknown,
+    headers: Record<string, string>,
+    budgetMs: number
+  ): Promise<T> {
+    // Same-host deployments: Unix socket + keep-alive agent skips TCP loopback and per-call connection setup.
+    const raw = JSON.stringify(body);
+    return new Promise<T>((resolve, reject) => {
+      const request = http.request(
+        {
+          socketPath,
+          path,
+          method: "POST",
+          agent: this.agent,
+          headers: {
+            "content-type": "application/json",
+            "content-length": Buffer.byteLength(raw),
+            ...headers
+          },
+          signal: AbortSignal.timeout(budgetMs)
+        },
+        (response) => {
+          const chunks: Buffer[] = [];
+          response.on("data", (chunk: Buffer) => chunks.push(chunk));
+          response.on("error", reject);
+          response.on("end", () => {
+            const status = response.statusCode ?? 0;
+            if (status < 200 || status >= 300) {
+              reject(new WordServiceError(`word-service request failed with status ${status}`, status));
+              return;
+            }
+            try {
+              resolve(JSON.parse(Buffer.concat(chunks).toString("utf-8")) as T);
+            } catch (error) {
+              reject(error);
+            }
+          });
+        }
+      );
+      request.on("error", reject);
+      request.end(raw);
+    });
   }
 }
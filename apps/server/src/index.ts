@@ -50,7 +50,19 @@ const broadcastRoom = (roomId: string): void => {
   }
 };
 
+const releaseRoomIfDone = (roomId: string): void => {
+  try {
+    if (gameService.getRoomOrThrow(roomId).status === "FINISHED") {
+      aiClueGenerator.releaseRoom(roomId);
+    }
+  } catch {
+    // Room was disbanded or emptied.
+    aiClueGenerator.releaseRoom(roomId);
+  }
+};
+
 gameService.setOnRoomChanged((roomId) => {
+  releaseRoomIfDone(roomId);
   try {
     broadcastRoom(roomId);
   } catch {
@@ -146,6 +158,8 @@ io.on("connection", (socket) => {
       const room = gameService.startGame(parsed.roomId.toUpperCase(), parsed.playerId);
       ack?.({ ok: true });
       broadcastRoom(room.id);
+      const secretWords = room.teamOrder.flatMap((teamId) => room.teams[teamId]?.secretWords.map((slot) => slot.zh) ?? []);
+      void aiClueGenerator.prefetchRoom(room.id, secretWords);
     } catch (error) {
       ack?.({ ok: false, error: (error as Error).message });
     }
@@ -92,6 +92,7 @@ export type JoinableRoomSummary = {
 };
 
 export type AgentInterfaceInput = {
+  roomId: string;
   secretWords: SecretWordSlot[];
   history: DeductionRow[];
   code: [1 | 2 | 3 | 4, 1 | 2 | 3 | 4, 1 | 2 | 3 | 4];
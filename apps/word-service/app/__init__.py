@@ -1,38 +1,130 @@
 from __future__ import annotations
 
+import math
+
 from flask import Flask, jsonify
+from werkzeug.exceptions import HTTPException
 
+from .admin_routes import create_admin_blueprint
+from .clue_history import ClueHistoryService, ClueHistoryStore
 from .config import Settings
 from .errors import ApiError
-from .model_loader import FastTextModelStore
+from .inference_pool import InferencePool
+from .memory import MemoryAccountant, MemoryFootprint
+from .metrics import Metrics
+from .model_registry import ModelRegistry
 from .routes import create_routes_blueprint
 from .service import RelatedWordsService
+from .sharded_search import ShardedSearchPool
+from .sessions import PrefetchSessionService, SessionStore
+from .warmup import CacheWarmer
+
+
+# Rooms hold up to 8 players, i.e. 4 teams, each with its own clue history.
+_MAX_TEAMS_PER_ROOM = 4
 
 
 def create_app() -> tuple[Flask, Settings]:
     settings = Settings.from_env()
 
-    model_store = FastTextModelStore(settings.model_path)
-    model_store.load()
-    model_store.warm_up()
-    related_words_service = RelatedWordsService(model_store)
+    shard_pool = ShardedSearchPool(settings.search_shards) if settings.search_shards > 1 else None
+    model_registry = ModelRegistry(
+        settings.model_tiers,
+        settings.default_tier,
+        settings.matrix_cache_dir,
+        shard_pool,
+    )
+    model_registry.load_all()
+    model_registry.warm_up_all()
+    metrics = Metrics()
+    if shard_pool is not None:
+        metrics.register_gauge("search.shard_restarts", lambda: shard_pool.restarts)
+    inference_pool = InferencePool(settings.inference_workers, settings.inference_queue_size, metrics)
+    related_words_service = RelatedWordsService(
+        model_registry,
+        metrics,
+        inference_pool,
+        settings.neighbor_cache_size,
+        settings.neighbor_cache_ttl_seconds,
+    )
+    session_service = PrefetchSessionService(
+        model_registry,
+        related_words_service,
+        inference_pool,
+        metrics,
+        SessionStore(settings.session_max_count, settings.session_ttl_seconds),
+    )
+    clue_history_service = ClueHistoryService(
+        model_registry,
+        related_words_service,
+        metrics,
+        ClueHistoryStore(settings.session_max_count * _MAX_TEAMS_PER_ROOM, settings.session_ttl_seconds),
+    )
+    memory_accountant = MemoryAccountant(settings.memory_budget_bytes, metrics)
+    for tier, model_store in model_registry.items():
+        memory_accountant.register(f"model.{tier}", model_store.memory_footprints)
+        # A swap changes the fixed footprint, so the caches' share of the budget is recomputed right away.
+        model_store.add_swap_listener(lambda _previous, _current: memory_accountant.enforce())
+    memory_accountant.register("sessions", lambda: MemoryFootprint(session_service.memory_bytes))
+    memory_accountant.register("clue_history", lambda: MemoryFootprint(clue_history_service.memory_bytes))
+    memory_accountant.register_cache(
+        "neighbor_cache",
+        lambda: related_words_service.neighbor_cache_bytes,
+        related_words_service.limit_neighbor_cache_bytes,
+    )
+    memory_accountant.start()
+
+    cache_warmer = CacheWarmer(
+        model_registry,
+        related_words_service,
+        settings.warmup_word_bank_path,
+        settings.warmup_budget_seconds,
+        settings.warmup_k,
+    )
+    cache_warmer.start()
 
     app = Flask(__name__)
-    app.register_blueprint(create_routes_blueprint(settings, related_words_service))
+    app.register_blueprint(
+        create_routes_blueprint(
+            settings,
+            related_words_service,
+            session_service,
+            clue_history_service,
+            model_registry,
+            cache_warmer,
+            memory_accountant,
+            metrics,
+        )
+    )
+    if settings.admin_token is not None:
+        app.register_blueprint(create_admin_blueprint(settings, model_registry))
 
     @app.errorhandler(ApiError)
     def handle_api_error(error: ApiError):
+        body: dict[str, object] = {
+            "code": error.code,
+            "message": error.message,
+        }
+        headers: dict[str, str] = {}
+        if error.retry_after_ms is not None:
+            body["retry_after_ms"] = error.retry_after_ms
+            headers["Retry-After"] = str(max(1, math.ceil(error.retry_after_ms / 1000)))
+        return jsonify({"ok": False, "error": body}), error.status_code, headers
+
+    @app.errorhandler(HTTPException)
+    def handle_http_error(error: HTTPException):
+        # Routing errors (e.g. /admin without ADMIN_TOKEN) keep their status instead of becoming a 500.
         return (
             jsonify(
                 {
                     "ok": False,
                     "error": {
-                        "code": error.code,
-                        "message": error.message,
+                        "code": (error.name or "HTTP_ERROR").upper().replace(" ", "_"),
+                        "message": error.description,
                     },
                 }
             ),
-            error.status_code,
+            error.code,
         )
 
     @app.errorhandler(Exception)
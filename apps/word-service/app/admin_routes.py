@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+import hmac
+
+from flask import Blueprint, jsonify, request
+
+from .config import Settings
+from .encoding import model_payload
+from .errors import ApiError
+from .model_loader import FastTextModelStore
+from .model_registry import ModelRegistry
+from .schemas import parse_reload_model_request
+
+
+def create_admin_blueprint(settings: Settings, model_registry: ModelRegistry) -> Blueprint:
+    """Admin endpoints; only registered when `ADMIN_TOKEN` is set, since reload loads arbitrary server files."""
+    bp = Blueprint("word_service_admin", __name__, url_prefix="/admin")
+    admin_token = settings.admin_token
+    if admin_token is None:
+        raise ValueError("the admin blueprint requires ADMIN_TOKEN")
+
+    @bp.before_request
+    def require_admin_token() -> None:
+        provided = request.headers.get("X-Admin-Token", "")
+        if not hmac.compare_digest(provided, admin_token):
+            raise ApiError("FORBIDDEN", "invalid admin token", 403)
+
+    def model_state(tier: str, model_store: FastTextModelStore) -> dict[str, object]:
+        info = model_store.get_model_info_or_none()
+        return {
+            "tier": tier,
+            "ready": model_store.is_ready,
+            "load_error": model_store.load_error,
+            "model": model_payload(info) if info is not None else None,
+            "reload": asdict(model_store.reload_status),
+        }
+
+    @bp.get("/model")
+    def model_status():
+        return jsonify(
+            {
+                "default_tier": model_registry.default_tier,
+                "tiers": [model_state(tier, model_store) for tier, model_store in model_registry.items()],
+            }
+        )
+
+    @bp.post("/model/reload")
+    def reload_model():
+        req = parse_reload_model_request(request.get_json(silent=True))
+        tier = model_registry.resolve_tier(req.tier)
+        model_store = model_registry.get_store(tier)
+        if not model_store.reload(req.model_path):
+            raise ApiError("RELOAD_IN_PROGRESS", f"a model reload is already running for tier {tier}", 409)
+        return jsonify(model_state(tier, model_store)), 202
+
+    return bp
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import random
+import threading
+import time
+from typing import Callable, Generic, Hashable, TypeVar
+
+
+V = TypeVar("V")
+
+_TTL_JITTER_FRACTION = 0.1
+
+
+class NeighborCache(Generic[V]):
+    """Thread-safe LRU keyed by `(tier, model_version, *query)` so a model swap can drop one model's entries.
+
+    With a TTL, each entry's lifetime is jittered so keys filled together (e.g. at warm-up) do not all
+    expire in the same instant; callers coalesce the refill of an expired key through `SingleFlight`.
+    With `size_of`, the cache keeps a running byte total and can also be bounded in bytes (`limit_bytes`).
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float = 0.0,
+        size_of: Callable[[V], int] | None = None,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._size_of = size_of
+        self._max_bytes: int | None = None
+        self._nbytes = 0
+        self._byte_evictions = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[Hashable, ...], tuple[V, float, int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def max_entries(self) -> int:
+        return self._max_entries
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    @property
+    def max_bytes(self) -> int | None:
+        return self._max_bytes
+
+    @property
+    def byte_evictions(self) -> int:
+        """Entries evicted by the byte bound rather than the entry bound."""
+        return self._byte_evictions
+
+    def limit_bytes(self, max_bytes: int | None) -> int:
+        """Bound the cache to `max_bytes` (None lifts the bound), evicting LRU entries. Returns the entries evicted."""
+        with self._lock:
+            self._max_bytes = max_bytes
+            return self._evict_locked()
+
+    def get(self, key: tuple[Hashable, ...]) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at, nbytes = entry
+            if expires_at and expires_at <= time.monotonic():
+                del self._entries[key]
+                self._nbytes -= nbytes
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: tuple[Hashable, ...], value: V) -> None:
+        if self._max_entries <= 0:
+            return
+        expires_at = 0.0
+        if self._ttl_seconds > 0:
+            jitter = random.uniform(-_TTL_JITTER_FRACTION, _TTL_JITTER_FRACTION)
+            expires_at = time.monotonic() + self._ttl_seconds * (1.0 + jitter)
+        nbytes = self._size_of(value) if self._size_of is not None else 0
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._nbytes -= previous[2]
+            self._entries[key] = (value, expires_at, nbytes)
+            self._nbytes += nbytes
+            self._evict_locked()
+
+    def invalidate_model(self, tier: str, version: str) -> int:
+        with self._lock:
+            stale_keys = [key for key in self._entries if key[0] == tier and key[1] == version]
+            for key in stale_keys:
+                self._nbytes -= self._entries.pop(key)[2]
+            return len(stale_keys)
+
+    def _evict_locked(self) -> int:
+        evicted = 0
+        while self._entries and (
+            len(self._entries) > self._max_entries or (self._max_bytes is not None and self._nbytes > self._max_bytes)
+        ):
+            if len(self._entries) <= self._max_entries:
+                self._byte_evictions += 1
+            self._nbytes -= self._entries.popitem(last=False)[1][2]
+            evicted += 1
+        return evicted
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from array import array
+
+import numpy as np
+
+from .vocabulary import VocabularyIndex
+
+
+_EMPTY_ROWS = np.empty(0, dtype=np.int64)
+
+
+class CharacterIndex:
+    """Character -> vocabulary rows inverted index, for excluding every word that contains a fragment.
+
+    Postings are one flat row array grouped by code point, so a lookup is a binary search plus a slice. A
+    multi-character fragment intersects the postings of its characters and only checks the survivors' text.
+    """
+
+    def __init__(self, vocabulary: VocabularyIndex, chars: np.ndarray, starts: np.ndarray, rows: np.ndarray) -> None:
+        self._vocabulary = vocabulary
+        self._chars = chars
+        self._starts = starts
+        self._rows = rows
+
+    @classmethod
+    def build(cls, vocabulary: VocabularyIndex) -> "CharacterIndex":
+        codes = array("I")
+        rows = array("I")
+        for row, word in enumerate(vocabulary):
+            for ch in set(word):
+                codes.append(ord(ch))
+                rows.append(row)
+        code_array = np.frombuffer(codes, dtype=np.uint32)
+        row_array = np.frombuffer(rows, dtype=np.uint32)
+        # Stable sort keeps each character's rows ascending, which intersect1d(assume_unique=True) relies on.
+        order = np.argsort(code_array, kind="stable")
+        code_array = code_array[order]
+        chars, starts = np.unique(code_array, return_index=True)
+        return cls(vocabulary, chars, np.append(starts, len(code_array)), row_array[order])
+
+    @property
+    def nbytes(self) -> int:
+        return int(self._chars.nbytes + self._starts.nbytes + self._rows.nbytes)
+
+    def _rows_with_char(self, ch: str) -> np.ndarray:
+        code = ord(ch)
+        position = int(np.searchsorted(self._chars, code))
+        if position == len(self._chars) or int(self._chars[position]) != code:
+            return _EMPTY_ROWS
+        return self._rows[self._starts[position] : self._starts[position + 1]]
+
+    def rows_containing(self, fragment: str) -> np.ndarray:
+        """Rows whose word contains `fragment` as a substring."""
+        postings = sorted((self._rows_with_char(ch) for ch in set(fragment)), key=len)
+        if not postings:
+            return _EMPTY_ROWS
+        candidates = postings[0]
+        for other in postings[1:]:
+            if len(candidates) == 0:
+                break
+            candidates = np.intersect1d(candidates, other, assume_unique=True)
+        if len(fragment) == 1:
+            return candidates.astype(np.int64)
+        # Having every character is necessary, not sufficient: 果苹 has both characters of 苹果.
+        word_at = self._vocabulary.word_at
+        return np.array([row for row in candidates.tolist() if fragment in word_at(row)], dtype=np.int64)
+
+    def rows_containing_any(self, fragments: tuple[str, ...]) -> np.ndarray:
+        if not fragments:
+            return _EMPTY_ROWS
+        return np.unique(np.concatenate([self.rows_containing(fragment) for fragment in fragments]))
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import sys
+import threading
+import time
+
+import numpy as np
+
+from .metrics import Metrics
+from .model_loader import LoadedModel, ModelInfo
+from .model_registry import ModelRegistry
+from .schemas import SECRET_SLOTS
+from .service import RelatedWordsService
+
+
+@dataclass
+class SlotHistory:
+    """Running statistics of one slot's clues: enough to score coherence without revisiting old clues."""
+
+    words: list[str]
+    vector_sum: np.ndarray
+    # Sum of squared norms: 1 per clue with a vector, 0 per clue the model has no vector for.
+    norm_sum: float = 0.0
+
+    def add(self, word: str, vector: np.ndarray | None) -> None:
+        self.words.append(word)
+        if vector is not None:
+            self.vector_sum += vector
+            self.norm_sum += float(vector @ vector)
+
+
+@dataclass
+class TeamClueHistory:
+    room_id: str
+    team_id: str
+    tier: str
+    model: ModelInfo
+    expires_at: float
+    last_round: int = 0
+    slots: dict[int, SlotHistory] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @property
+    def nbytes(self) -> int:
+        with self.lock:
+            return sum(
+                slot.vector_sum.nbytes + sys.getsizeof(slot.words) + sum(sys.getsizeof(word) for word in slot.words)
+                for slot in self.slots.values()
+            )
+
+
+@dataclass(frozen=True)
+class SlotScore:
+    slot: int
+    clues: int
+    coherence: float | None
+    intercept_risk: float | None
+
+
+@dataclass(frozen=True)
+class ClueHistoryResult:
+    room_id: str
+    team_id: str
+    round: int
+    appended: bool
+    slots: list[SlotScore]
+    tier: str
+    model: ModelInfo
+
+
+def _clamp_0_1(value: float) -> float:
+    return min(1.0, max(0.0, value))
+
+
+def score_slots(slots: dict[int, SlotHistory]) -> list[SlotScore]:
+    """Coherence and intercept risk of every slot, from the running sums alone: O(slots² × dimension).
+
+    Coherence is the mean pairwise cosine of a slot's clues, which for unit vectors is
+    (|Σv|² - Σ|v|²) / (n(n-1)). Intercept risk is how much closer a slot's clues are to each other than to
+    any other slot's clues (mean cross-slot cosine Σv_a·Σv_b / (n_a n_b)): the more a slot stands apart,
+    the easier opponents can tie its next clue to its number.
+    """
+    scores: list[SlotScore] = []
+    for slot in SECRET_SLOTS:
+        history = slots.get(slot)
+        count = len(history.words) if history is not None else 0
+        if history is None or count < 2:
+            scores.append(SlotScore(slot=slot, clues=count, coherence=None, intercept_risk=None))
+            continue
+        pair_sum = float(history.vector_sum @ history.vector_sum) - history.norm_sum
+        coherence = _clamp_0_1(pair_sum / (count * (count - 1)))
+        closest_other = 0.0
+        for other_slot, other in slots.items():
+            if other_slot == slot or not other.words:
+                continue
+            cross = float(history.vector_sum @ other.vector_sum) / (count * len(other.words))
+            closest_other = max(closest_other, cross)
+        scores.append(
+            SlotScore(
+                slot=slot,
+                clues=count,
+                coherence=coherence,
+                intercept_risk=_clamp_0_1(coherence - closest_other),
+            )
+        )
+    return scores
+
+
+class ClueHistoryStore:
+    """TTL + LRU bounded map of per-team clue histories, keyed by (room, team, tier)."""
+
+    def __init__(self, max_histories: int, ttl_seconds: float) -> None:
+        self._max_histories = max_histories
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._histories: OrderedDict[tuple[str, str, str], TeamClueHistory] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._histories)
+
+    @property
+    def nbytes(self) -> int:
+        with self._lock:
+            histories = list(self._histories.values())
+        return sum(history.nbytes for history in histories)
+
+    def get_or_create(self, room_id: str, team_id: str, tier: str, model: ModelInfo) -> TeamClueHistory:
+        key = (room_id, team_id, tier)
+        now = time.monotonic()
+        with self._lock:
+            history = self._histories.get(key)
+            if history is None or history.expires_at <= now:
+                history = TeamClueHistory(
+                    room_id=room_id,
+                    team_id=team_id,
+                    tier=tier,
+                    model=model,
+                    expires_at=now + self._ttl_seconds,
+                )
+                self._histories[key] = history
+            # Every round extends the history, so a long game never loses it mid-way.
+            history.expires_at = now + self._ttl_seconds
+            self._histories.move_to_end(key)
+            self._evict_locked(now)
+            return history
+
+    def _evict_locked(self, now: float) -> None:
+        expired = [key for key, history in self._histories.items() if history.expires_at <= now]
+        for key in expired:
+            del self._histories[key]
+        while len(self._histories) > self._max_histories:
+            self._histories.popitem(last=False)
+
+
+class ClueHistoryService:
+    """Per-round coherence and intercept-risk tracking of each team's clues, updated in O(new clues).
+
+    Callers append only the clues of the round just played; vectors are looked up for those clues alone and
+    folded into per-slot running sums. A model swap rebuilds a history's sums once from its stored words.
+    """
+
+    def __init__(
+        self,
+        model_registry: ModelRegistry,
+        related_words_service: RelatedWordsService,
+        metrics: Metrics,
+        store: ClueHistoryStore,
+    ) -> None:
+        self._model_registry = model_registry
+        self._related_words_service = related_words_service
+        self._metrics = metrics
+        self._store = store
+        metrics.register_gauge("clue_history.teams", lambda: len(self._store))
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._store.nbytes
+
+    def append_round(
+        self,
+        room_id: str,
+        team_id: str,
+        round_number: int,
+        clues: dict[int, list[str]],
+        tier: str | None = None,
+    ) -> ClueHistoryResult:
+        """Fold one round's clues into the team's history and score every slot.
+
+        A round at or below the last one appended is not applied again, so a retried request is harmless.
+        """
+        tier = self._model_registry.resolve_tier(tier)
+        started = time.perf_counter()
+        snapshot = self._related_words_service.require_snapshot(tier)
+        vectors = {slot: [snapshot.query_vector(word) for word in words] for slot, words in clues.items()}
+        history = self._store.get_or_create(room_id, team_id, tier, snapshot.info)
+
+        with history.lock:
+            if history.model != snapshot.info:
+                self._rebuild(history, snapshot)
+            appended = round_number > history.last_round
+            if appended:
+                for slot, words in clues.items():
+                    slot_history = history.slots.get(slot)
+                    if slot_history is None:
+                        slot_history = history.slots[slot] = SlotHistory(
+                            words=[],
+                            vector_sum=np.zeros(snapshot.info.dimension, dtype=np.float64),
+                        )
+                    for word, vector in zip(words, vectors[slot]):
+                        slot_history.add(word, vector)
+                history.last_round = round_number
+            else:
+                self._metrics.increment("clue_history.duplicate_round")
+            slots = score_slots(history.slots)
+            last_round = history.last_round
+
+        self._metrics.observe_ms(f"clue_history.{tier}", (time.perf_counter() - started) * 1000.0)
+        return ClueHistoryResult(
+            room_id=room_id,
+            team_id=team_id,
+            round=last_round,
+            appended=appended,
+            slots=slots,
+            tier=tier,
+            model=snapshot.info,
+        )
+
+    def _rebuild(self, history: TeamClueHistory, snapshot: LoadedModel) -> None:
+        # Sums from the old model are meaningless under the new one; replay the stored words once.
+        self._metrics.increment("clue_history.rebuilt")
+        rebuilt: dict[int, SlotHistory] = {}
+        for slot, old in history.slots.items():
+            slot_history = SlotHistory(words=[], vector_sum=np.zeros(snapshot.info.dimension, dtype=np.float64))
+            for word in old.words:
+                slot_history.add(word, snapshot.query_vector(word))
+            rebuilt[slot] = slot_history
+        history.slots = rebuilt
+        history.model = snapshot.info
@@ -8,6 +8,8 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_REDUCED_MODEL_PATH = ROOT / "models" / "cc.zh.100.bin"
 DEFAULT_FULL_MODEL_PATH = ROOT / "models" / "cc.zh.300.bin"
+DEFAULT_MATRIX_CACHE_DIR = ROOT / "models" / "cache"
+DEFAULT_WARMUP_WORD_BANK_PATH = ROOT.parent / "server" / "src" / "data" / "thuocl_words_max4.txt"
 
 
 def _resolve_default_model_path() -> Path:
@@ -16,26 +18,170 @@ def _resolve_default_model_path() -> Path:
     return DEFAULT_FULL_MODEL_PATH
 
 
+def _parse_model_tiers(raw_tiers: str) -> dict[str, Path]:
+    # Format: "fast=/models/cc.zh.100.bin,quality=/models/cc.zh.300.bin"
+    tiers: dict[str, Path] = {}
+    for entry in raw_tiers.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, sep, raw_path = entry.partition("=")
+        name = name.strip()
+        raw_path = raw_path.strip()
+        if not sep or not name or not raw_path:
+            raise ValueError(f"MODEL_TIERS entry must look like name=path: {entry!r}")
+        if name in tiers:
+            raise ValueError(f"MODEL_TIERS has duplicate tier: {name}")
+        tiers[name] = Path(raw_path)
+    if not tiers:
+        raise ValueError("MODEL_TIERS must declare at least one tier")
+    return tiers
+
+
+_BYTE_SIZE_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def _parse_byte_size(raw_size: str) -> int:
+    # Format: "536870912", "512M", "2G" (binary units; a trailing "B"/"iB" is accepted).
+    value = raw_size.strip().upper().removesuffix("B").removesuffix("I")
+    unit = value[-1:] if value[-1:] in _BYTE_SIZE_UNITS else ""
+    number = value[: len(value) - len(unit)].strip()
+    try:
+        return int(float(number) * _BYTE_SIZE_UNITS[unit])
+    except (ValueError, OverflowError):
+        raise ValueError(f"MEMORY_BUDGET must be a byte count such as 536870912, 512M or 2G: {raw_size!r}") from None
+
+
 @dataclass(frozen=True)
 class Settings:
     port: int
     max_k: int
-    model_path: Path
+    model_tiers: dict[str, Path]
+    default_tier: str
+    matrix_cache_dir: Path
+    neighbor_cache_size: int = 10000
+    neighbor_cache_ttl_seconds: float = 0.0
+    inference_workers: int = 1
+    inference_queue_size: int = 4
+    search_shards: int = 1
+    session_ttl_seconds: float = 7200.0
+    session_max_count: int = 1000
+    unix_socket_path: Path | None = None
+    # Octal file mode of the Unix socket, as waitress's `unix_socket_perms` takes it.
+    unix_socket_perms: str = "600"
+    http_threads: int = 16
+    admin_token: str | None = None
+    warmup_word_bank_path: Path | None = DEFAULT_WARMUP_WORD_BANK_PATH
+    warmup_budget_seconds: float = 30.0
+    warmup_k: int = 10
+    memory_budget_bytes: int | None = None
     service_name: str = "word-service"
 
+    @property
+    def model_path(self) -> Path:
+        return self.model_tiers[self.default_tier]
+
     @classmethod
     def from_env(cls) -> "Settings":
         raw_port = os.getenv("PORT", "4201")
         raw_max_k = os.getenv("MAX_K", "50")
         raw_model_path = os.getenv("FASTTEXT_MODEL_PATH", "").strip()
+        raw_model_tiers = os.getenv("MODEL_TIERS", "").strip()
+        raw_default_tier = os.getenv("DEFAULT_MODEL_TIER", "").strip()
+        raw_matrix_cache_dir = os.getenv("WORD_MATRIX_CACHE_DIR", "").strip()
+        raw_neighbor_cache_size = os.getenv("NEIGHBOR_CACHE_SIZE", "10000")
+        raw_neighbor_cache_ttl = os.getenv("NEIGHBOR_CACHE_TTL_SECONDS", "0")
+        raw_inference_workers = os.getenv("INFERENCE_WORKERS", "").strip()
+        raw_inference_queue_size = os.getenv("INFERENCE_QUEUE_SIZE", "").strip()
+        raw_search_shards = os.getenv("SEARCH_SHARDS", "1")
+        raw_session_ttl = os.getenv("SESSION_TTL_SECONDS", "7200")
+        raw_session_max_count = os.getenv("SESSION_MAX_COUNT", "1000")
+        raw_unix_socket_path = os.getenv("UNIX_SOCKET_PATH", "").strip()
+        raw_unix_socket_perms = os.getenv("UNIX_SOCKET_PERMS", "600").strip()
+        raw_http_threads = os.getenv("HTTP_THREADS", "16")
+        raw_admin_token = os.getenv("ADMIN_TOKEN", "").strip()
+        raw_warmup_word_bank_path = os.getenv("WARMUP_WORD_BANK_PATH", "").strip()
+        raw_warmup_budget = os.getenv("WARMUP_BUDGET_SECONDS", "30")
+        raw_warmup_k = os.getenv("WARMUP_K", "10")
+        raw_memory_budget = os.getenv("MEMORY_BUDGET", "").strip()
 
         port = int(raw_port)
         max_k = int(raw_max_k)
-        model_path = Path(raw_model_path) if raw_model_path else _resolve_default_model_path()
+        if raw_model_tiers:
+            model_tiers = _parse_model_tiers(raw_model_tiers)
+        else:
+            # Several resident models multiply memory and startup time; only MODEL_TIERS opts into that.
+            model_tiers = {"default": Path(raw_model_path) if raw_model_path else _resolve_default_model_path()}
+        default_tier = raw_default_tier or next(iter(model_tiers))
+        matrix_cache_dir = Path(raw_matrix_cache_dir) if raw_matrix_cache_dir else DEFAULT_MATRIX_CACHE_DIR
+        neighbor_cache_size = int(raw_neighbor_cache_size)
+        neighbor_cache_ttl_seconds = float(raw_neighbor_cache_ttl)
+        inference_workers = int(raw_inference_workers) if raw_inference_workers else os.cpu_count() or 1
+        inference_queue_size = int(raw_inference_queue_size) if raw_inference_queue_size else inference_workers * 4
+        search_shards = int(raw_search_shards)
+        session_ttl_seconds = float(raw_session_ttl)
+        session_max_count = int(raw_session_max_count)
+        http_threads = int(raw_http_threads)
+        warmup_budget_seconds = float(raw_warmup_budget)
+        warmup_k = int(raw_warmup_k)
+        memory_budget_bytes = _parse_byte_size(raw_memory_budget) if raw_memory_budget else None
 
         if max_k <= 0:
             raise ValueError("MAX_K must be a positive integer")
         if port <= 0:
             raise ValueError("PORT must be a positive integer")
+        if default_tier not in model_tiers:
+            raise ValueError(f"DEFAULT_MODEL_TIER must be one of: {', '.join(model_tiers)}")
+        if neighbor_cache_size < 0:
+            raise ValueError("NEIGHBOR_CACHE_SIZE must be zero or a positive integer")
+        if neighbor_cache_ttl_seconds < 0:
+            raise ValueError("NEIGHBOR_CACHE_TTL_SECONDS must be zero or a positive number")
+        if inference_workers <= 0:
+            raise ValueError("INFERENCE_WORKERS must be a positive integer")
+        if inference_queue_size <= 0:
+            raise ValueError("INFERENCE_QUEUE_SIZE must be a positive integer")
+        if search_shards <= 0:
+            raise ValueError("SEARCH_SHARDS must be a positive integer")
+        if session_ttl_seconds <= 0:
+            raise ValueError("SESSION_TTL_SECONDS must be a positive number")
+        if session_max_count <= 0:
+            raise ValueError("SESSION_MAX_COUNT must be a positive integer")
+        if http_threads <= 0:
+            raise ValueError("HTTP_THREADS must be a positive integer")
+        try:
+            unix_socket_mode = int(raw_unix_socket_perms, 8)
+        except ValueError:
+            unix_socket_mode = -1
+        if not 0 <= unix_socket_mode <= 0o777:
+            raise ValueError("UNIX_SOCKET_PERMS must be an octal file mode such as 600 or 660")
+        if warmup_budget_seconds < 0:
+            raise ValueError("WARMUP_BUDGET_SECONDS must be zero or a positive number")
+        if warmup_k <= 0 or warmup_k > max_k:
+            raise ValueError("WARMUP_K must be a positive integer no larger than MAX_K")
+        if memory_budget_bytes is not None and memory_budget_bytes <= 0:
+            raise ValueError("MEMORY_BUDGET must be a positive byte count")
 
-        return cls(port=port, max_k=max_k, model_path=model_path)
+        return cls(
+            port=port,
+            max_k=max_k,
+            model_tiers=model_tiers,
+            default_tier=default_tier,
+            matrix_cache_dir=matrix_cache_dir,
+            neighbor_cache_size=neighbor_cache_size,
+            neighbor_cache_ttl_seconds=neighbor_cache_ttl_seconds,
+            inference_workers=inference_workers,
+            inference_queue_size=inference_queue_size,
+            search_shards=search_shards,
+            session_ttl_seconds=session_ttl_seconds,
+            session_max_count=session_max_count,
+            unix_socket_path=Path(raw_unix_socket_path) if raw_unix_socket_path else None,
+            unix_socket_perms=raw_unix_socket_perms,
+            http_threads=http_threads,
+            admin_token=raw_admin_token or None,
+            warmup_word_bank_path=(
+                Path(raw_warmup_word_bank_path) if raw_warmup_word_bank_path else DEFAULT_WARMUP_WORD_BANK_PATH
+            ),
+            warmup_budget_seconds=warmup_budget_seconds,
+            warmup_k=warmup_k,
+            memory_budget_bytes=memory_budget_bytes,
+        )
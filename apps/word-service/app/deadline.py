@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import math
+import threading
+import time
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """Absolute wall-clock deadline (epoch milliseconds) for one request."""
+
+    expires_at_ms: float
+
+    @classmethod
+    def from_budget(cls, budget_ms: float) -> "Deadline":
+        return cls(expires_at_ms=time.time() * 1000.0 + budget_ms)
+
+    def remaining_ms(self) -> float:
+        return self.expires_at_ms - time.time() * 1000.0
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining_ms() <= 0.0
+
+    def earliest(self, other: "Deadline | None") -> "Deadline":
+        if other is None or self.expires_at_ms <= other.expires_at_ms:
+            return self
+        return other
+
+
+class SharedDeadline:
+    """Deadline of work shared by several callers: it lasts until the latest caller's deadline.
+
+    Callers join with `extend`; a caller without a deadline makes it unbounded. Exposes the same
+    `remaining_ms` / `expired` interface as `Deadline`, so queues can drop work nobody waits for any more.
+    """
+
+    def __init__(self, deadline: Deadline | None) -> None:
+        self._lock = threading.Lock()
+        self._expires_at_ms: float | None = None if deadline is None else deadline.expires_at_ms
+
+    def extend(self, deadline: Deadline | None) -> None:
+        with self._lock:
+            if self._expires_at_ms is None:
+                return
+            if deadline is None:
+                self._expires_at_ms = None
+            elif deadline.expires_at_ms > self._expires_at_ms:
+                self._expires_at_ms = deadline.expires_at_ms
+
+    def remaining_ms(self) -> float:
+        expires_at_ms = self._expires_at_ms
+        if expires_at_ms is None:
+            return math.inf
+        return expires_at_ms - time.time() * 1000.0
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining_ms() <= 0.0
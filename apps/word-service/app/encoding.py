@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import struct
+
+from flask import Response, jsonify
+
+from .model_loader import ModelInfo
+from .service import NeighborItem
+
+
+BINARY_CONTENT_TYPE = "application/vnd.word-service.neighbors"
+BINARY_MAGIC = b"WSN1"
+
+_HEADER = struct.Struct("<4sH")
+_ITEM = struct.Struct("<fB")
+_MAX_WORD_BYTES = 255
+
+
+def model_payload(info: ModelInfo) -> dict[str, object]:
+    return {
+        "path": info.path,
+        "dimension": info.dimension,
+        "version": info.version,
+    }
+
+
+def neighbors_payload(items: list[NeighborItem]) -> list[dict[str, object]]:
+    return [{"word": item.word, "score": item.score} for item in items]
+
+
+def _encode_word(word: str) -> bytes:
+    # The length is one byte; cut whole characters so a long word still decodes as valid UTF-8.
+    encoded = word.encode("utf-8")
+    if len(encoded) <= _MAX_WORD_BYTES:
+        return encoded
+    return encoded[:_MAX_WORD_BYTES].decode("utf-8", errors="ignore").encode("utf-8")
+
+
+def encode_neighbors_binary(items: list[NeighborItem]) -> bytes:
+    """`WSN1`, uint16 count, then per item: float32 score, uint8 byte length, UTF-8 word (little-endian)."""
+    chunks = [_HEADER.pack(BINARY_MAGIC, len(items))]
+    for item in items:
+        encoded = _encode_word(item.word)
+        chunks.append(_ITEM.pack(item.score, len(encoded)))
+        chunks.append(encoded)
+    return b"".join(chunks)
+
+
+def neighbors_response(
+    response_format: str,
+    full_body: dict[str, object],
+    items_key: str,
+    items: list[NeighborItem],
+    tier: str,
+    path: str,
+    model: ModelInfo,
+) -> Response:
+    """Render a neighbor list as the full JSON body, compact JSON, or the binary layout.
+
+    Compact and binary drop the per-response model block; the metadata a caller still needs travels in
+    headers, which also lets keep-alive clients skip JSON parsing entirely for the binary form.
+    """
+    if response_format == "full":
+        return jsonify(full_body)
+
+    if response_format == "binary":
+        response = Response(encode_neighbors_binary(items), mimetype=BINARY_CONTENT_TYPE)
+    else:
+        response = jsonify({items_key: [[item.word, item.score] for item in items]})
+    response.headers["X-Model-Version"] = model.version
+    response.headers["X-Model-Tier"] = tier
+    response.headers["X-Answer-Path"] = path
+    return response
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 
 class ApiError(Exception):
-    def __init__(self, code: str, message: str, status_code: int) -> None:
+    def __init__(self, code: str, message: str, status_code: int, retry_after_ms: int | None = None) -> None:
         self.code = code
         self.message = message
         self.status_code = status_code
+        self.retry_after_ms = retry_after_ms
         super().__init__(message)
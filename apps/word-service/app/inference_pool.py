@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from dataclasses import dataclass
+import queue
+import threading
+import time
+from typing import Callable, Generic, TypeVar
+
+from .deadline import Deadline, SharedDeadline
+from .errors import ApiError
+from .metrics import Metrics
+
+
+V = TypeVar("V")
+
+_MIN_RETRY_AFTER_MS = 100
+
+
+@dataclass
+class _Task(Generic[V]):
+    fn: Callable[[], V]
+    deadline: Deadline | SharedDeadline | None
+    enqueued_at: float
+    future: "Future[V]"
+
+
+class InferencePool:
+    """Fixed set of inference threads behind a bounded queue.
+
+    numpy releases the GIL inside the matrix scans, so threads run searches in parallel. When the queue is
+    full, `submit` fails fast with `503 OVERLOADED` and a retry hint instead of letting latency grow for everyone.
+    """
+
+    def __init__(self, workers: int, max_queue: int, metrics: Metrics) -> None:
+        self._workers = workers
+        self._queue: queue.Queue[_Task[object]] = queue.Queue(maxsize=max_queue)
+        self._metrics = metrics
+        self._service_ms = 0.0
+        self._busy = 0
+        self._busy_lock = threading.Lock()
+        metrics.register_gauge("inference.queue_depth", self._queue.qsize)
+        metrics.register_gauge("inference.busy_workers", lambda: self._busy)
+        for index in range(workers):
+            threading.Thread(target=self._run_worker, name=f"inference-{index}", daemon=True).start()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, fn: Callable[[], V], deadline: Deadline | SharedDeadline | None = None) -> "Future[V]":
+        future: Future[V] = Future()
+        try:
+            self._queue.put_nowait(_Task(fn=fn, deadline=deadline, enqueued_at=time.perf_counter(), future=future))
+        except queue.Full:
+            self._metrics.increment("inference.rejected")
+            raise ApiError("OVERLOADED", "inference queue is full", 503, retry_after_ms=self._retry_after_ms()) from None
+        return future
+
+    def _retry_after_ms(self) -> int:
+        # Roughly the time for the workers to drain what is queued now.
+        drain_ms = self._queue.qsize() * self._service_ms / max(self._workers, 1)
+        return max(_MIN_RETRY_AFTER_MS, int(drain_ms))
+
+    def _run_worker(self) -> None:
+        while True:
+            # Handled in a separate frame so no reference to the finished task (whose closure can pin a whole
+            # model snapshot) survives while the worker blocks on the next `get`.
+            self._run_task(self._queue.get())
+
+    def _run_task(self, task: _Task[object]) -> None:
+        self._metrics.observe_ms("inference.queue_wait", (time.perf_counter() - task.enqueued_at) * 1000.0)
+        if not task.future.set_running_or_notify_cancel():
+            return
+        if task.deadline is not None and task.deadline.expired:
+            self._metrics.increment("inference.expired_in_queue")
+            task.future.set_exception(
+                ApiError("DEADLINE_EXCEEDED", "request deadline passed while queued for inference", 504)
+            )
+            return
+
+        with self._busy_lock:
+            self._busy += 1
+        started = time.perf_counter()
+        try:
+            task.future.set_result(task.fn())
+        except BaseException as exc:  # noqa: BLE001
+            task.future.set_exception(exc)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            self._service_ms = elapsed_ms if self._service_ms == 0.0 else self._service_ms * 0.8 + elapsed_ms * 0.2
+            with self._busy_lock:
+                self._busy -= 1
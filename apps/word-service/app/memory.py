@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+from dataclasses import dataclass
+import os
+import threading
+from typing import Callable, Mapping
+
+from .metrics import Metrics
+
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss_bytes() -> int | None:
+    try:
+        with open("/proc/self/statm", "rb") as handle:
+            fields = handle.read().split()
+        return int(fields[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def release_free_memory() -> None:
+    # glibc keeps freed heap pages mapped; ask it to hand them back to the OS.
+    libc_name = ctypes.util.find_library("c")
+    if not libc_name:
+        return
+    try:
+        libc = ctypes.CDLL(libc_name)
+        malloc_trim = getattr(libc, "malloc_trim", None)
+        if malloc_trim is not None:
+            malloc_trim(0)
+    except OSError:
+        pass
+
+
+class RssPeakSampler:
+    """Samples process RSS on a background thread and keeps the maximum seen."""
+
+    def __init__(self, interval_seconds: float = 0.05) -> None:
+        self._interval_seconds = interval_seconds
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._peak_bytes: int | None = current_rss_bytes()
+
+    @property
+    def peak_bytes(self) -> int | None:
+        return self._peak_bytes
+
+    def _observe(self) -> None:
+        rss = current_rss_bytes()
+        if rss is None:
+            return
+        if self._peak_bytes is None or rss > self._peak_bytes:
+            self._peak_bytes = rss
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._interval_seconds):
+            self._observe()
+
+    def __enter__(self) -> "RssPeakSampler":
+        self._thread = threading.Thread(target=self._run, name="rss-peak-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._observe()
+
+
+@dataclass(frozen=True)
+class MemoryFootprint:
+    nbytes: int
+    # Mapped file pages live in the shared page cache: every process mapping the file shares them.
+    shared: bool = False
+
+
+@dataclass
+class _CacheEntry:
+    measure: Callable[[], int]
+    limit: Callable[[int | None], object]
+    max_bytes: int | None = None
+
+
+class MemoryAccountant:
+    """Breaks process memory down by component and, with a budget, shrinks caches to stay within it.
+
+    Components register a callable reporting their current footprint; caches also register a byte limit. The
+    budget is charged with private footprints only, since shared mappings cost the same however many instances
+    map them. Under a budget the caches split whatever the fixed components leave, re-evaluated every
+    `interval_seconds` and whenever `enforce` is called (e.g. after a model swap).
+    """
+
+    def __init__(self, budget_bytes: int | None, metrics: Metrics, interval_seconds: float = 5.0) -> None:
+        self._budget_bytes = budget_bytes
+        self._metrics = metrics
+        self._interval_seconds = interval_seconds
+        self._lock = threading.Lock()
+        self._components: dict[str, Callable[[], Mapping[str, MemoryFootprint]]] = {}
+        self._caches: dict[str, _CacheEntry] = {}
+        metrics.register_gauge("memory.accounted_private_bytes", lambda: self._private_bytes(self._measure_all()))
+
+    @property
+    def budget_bytes(self) -> int | None:
+        return self._budget_bytes
+
+    def register(self, name: str, measure: Callable[[], MemoryFootprint | Mapping[str, MemoryFootprint]]) -> None:
+        """`measure` returns one footprint, or several keyed by part (reported as `<name>.<part>`)."""
+
+        def measure_parts() -> Mapping[str, MemoryFootprint]:
+            footprint = measure()
+            if isinstance(footprint, MemoryFootprint):
+                return {name: footprint}
+            return {f"{name}.{part}": value for part, value in footprint.items()}
+
+        with self._lock:
+            self._components[name] = measure_parts
+
+    def register_cache(self, name: str, measure: Callable[[], int], limit: Callable[[int | None], object]) -> None:
+        """`limit(max_bytes)` bounds the cache in bytes, evicting down to it (None lifts the bound)."""
+        with self._lock:
+            self._caches[name] = _CacheEntry(measure=measure, limit=limit)
+
+    def _measure_all(self) -> dict[str, MemoryFootprint]:
+        with self._lock:
+            components = list(self._components.values())
+            caches = list(self._caches.items())
+        footprints: dict[str, MemoryFootprint] = {}
+        for measure in components:
+            footprints.update(measure())
+        for name, cache in caches:
+            footprints[name] = MemoryFootprint(cache.measure())
+        return footprints
+
+    @staticmethod
+    def _private_bytes(footprints: Mapping[str, MemoryFootprint]) -> int:
+        return sum(footprint.nbytes for footprint in footprints.values() if not footprint.shared)
+
+    def enforce(self) -> None:
+        if self._budget_bytes is None:
+            return
+        footprints = self._measure_all()
+        with self._lock:
+            caches = list(self._caches.items())
+        if not caches:
+            return
+        cache_names = {name for name, _ in caches}
+        fixed_bytes = self._private_bytes(
+            {name: footprint for name, footprint in footprints.items() if name not in cache_names}
+        )
+        share = max(0, self._budget_bytes - fixed_bytes) // len(caches)
+        for _, cache in caches:
+            cache.max_bytes = share
+            cache.limit(share)
+
+    def report(self) -> dict[str, object]:
+        footprints = self._measure_all()
+        private_bytes = self._private_bytes(footprints)
+        shared_bytes = sum(footprint.nbytes for footprint in footprints.values() if footprint.shared)
+        rss_bytes = current_rss_bytes()
+        with self._lock:
+            cache_limits = {name: cache.max_bytes for name, cache in self._caches.items()}
+        return {
+            "budget_bytes": self._budget_bytes,
+            "accounted_private_bytes": private_bytes,
+            "accounted_shared_bytes": shared_bytes,
+            "over_budget": self._budget_bytes is not None and private_bytes > self._budget_bytes,
+            "rss_bytes": rss_bytes,
+            # Interpreter, libraries, request buffers, and any resident shared pages not registered above.
+            "unaccounted_bytes": (
+                max(0, rss_bytes - private_bytes - shared_bytes) if rss_bytes is not None else None
+            ),
+            "components": {
+                name: {"bytes": footprint.nbytes, "shared": footprint.shared}
+                for name, footprint in sorted(footprints.items())
+            },
+            "cache_limits": cache_limits,
+        }
+
+    def start(self) -> None:
+        if self._budget_bytes is None:
+            return
+        self.enforce()
+        threading.Thread(target=self._run, name="memory-budget", daemon=True).start()
+
+    def _run(self) -> None:
+        stop = threading.Event()
+        while not stop.wait(self._interval_seconds):
+            try:
+                self.enforce()
+            except Exception:  # noqa: BLE001
+                # A failed measurement must not stop enforcement; the next tick tries again.
+                self._metrics.increment("memory.enforce_failed")
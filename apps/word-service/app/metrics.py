@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from collections import deque
+import threading
+from typing import Callable
+
+
+class _LatencyWindow:
+    def __init__(self, window_size: int) -> None:
+        self.samples: deque[float] = deque(maxlen=window_size)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        self.samples.append(value_ms)
+        self.count += 1
+        self.total_ms += value_ms
+
+    def summary(self) -> dict[str, float | int]:
+        ordered = sorted(self.samples)
+
+        def percentile(fraction: float) -> float:
+            if not ordered:
+                return 0.0
+            index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+            return round(ordered[index], 3)
+
+        return {
+            "count": self.count,
+            "mean": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "max": round(ordered[-1], 3) if ordered else 0.0,
+        }
+
+
+class Metrics:
+    """Thread-safe in-process counters and recent-latency percentiles, exported as JSON."""
+
+    def __init__(self, window_size: int = 2048) -> None:
+        self._window_size = window_size
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = {}
+        self._latencies: dict[str, _LatencyWindow] = {}
+        self._gauges: dict[str, Callable[[], float | int]] = {}
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def observe_ms(self, name: str, value_ms: float) -> None:
+        with self._lock:
+            window = self._latencies.get(name)
+            if window is None:
+                window = self._latencies[name] = _LatencyWindow(self._window_size)
+            window.observe(value_ms)
+
+    def register_gauge(self, name: str, read: Callable[[], float | int]) -> None:
+        with self._lock:
+            self._gauges[name] = read
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "counters": dict(sorted(self._counters.items())),
+                "gauges": {name: read() for name, read in sorted(self._gauges.items())},
+                "latency_ms": {name: window.summary() for name, window in sorted(self._latencies.items())},
+            }
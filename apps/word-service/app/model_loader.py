@@ -1,59 +1,289 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import gc
+import hashlib
 from pathlib import Path
-from typing import Any
+import threading
+import time
+from typing import Any, Callable
 
 import fasttext
+import numpy as np
+
+from .char_index import CharacterIndex
+from .memory import MemoryFootprint, RssPeakSampler, current_rss_bytes, release_free_memory
+from .neighbor_table import NeighborTable, load_neighbor_table
+from .search_engine import WordVectorIndex, normalize
+from .sharded_search import ShardedSearchPool
+from .vocabulary import load_vocabulary
+from .word_matrix import load_normalized_word_matrix
+
+
+_FINGERPRINT_CHUNK_BYTES = 1 << 20
 
 
 @dataclass(frozen=True)
 class ModelInfo:
     path: str
     dimension: int
+    version: str
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    model: Any
+    info: ModelInfo
+    index: WordVectorIndex
+    # fastText reads the whole .bin into this process's heap; only the derived word matrix is shared.
+    model_private_bytes: int = 0
+    # Precomputed neighbor lists of the word-bank words, if tools/build_neighbor_table.py built one for this model.
+    neighbor_table: NeighborTable | None = None
+
+    def query_vector(self, word: str) -> np.ndarray | None:
+        # In-vocabulary words reuse their mapped row; OOV words fall back to fastText subword composition.
+        row = self.index.row_of(word)
+        if row is not None:
+            return self.index.row_vector(row)
+        return normalize(self.model.get_word_vector(word))
+
+
+@dataclass(frozen=True)
+class ReloadStatus:
+    state: str
+    target_path: str | None = None
+    started_at: int | None = None
+    finished_at: int | None = None
+    error: str | None = None
+    previous_version: str | None = None
+    current_version: str | None = None
+    rss_before_bytes: int | None = None
+    rss_peak_bytes: int | None = None
+    rss_after_bytes: int | None = None
+    listener_errors: tuple[str, ...] = ()
+
+
+SwapListener = Callable[[ModelInfo | None, ModelInfo], None]
+
+
+def compute_model_version(model_path: Path) -> str:
+    # Hash size plus head/tail bytes: cheap for multi-GB files, but changes on any rebuild.
+    size = model_path.stat().st_size
+    digest = hashlib.sha1(str(size).encode("ascii"))
+    with model_path.open("rb") as handle:
+        digest.update(handle.read(_FINGERPRINT_CHUNK_BYTES))
+        if size > _FINGERPRINT_CHUNK_BYTES:
+            handle.seek(max(size - _FINGERPRINT_CHUNK_BYTES, _FINGERPRINT_CHUNK_BYTES))
+            digest.update(handle.read(_FINGERPRINT_CHUNK_BYTES))
+    return f"{model_path.stem}-{digest.hexdigest()[:12]}"
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
 
 
 class FastTextModelStore:
-    def __init__(self, model_path: Path) -> None:
+    def __init__(
+        self,
+        model_path: Path,
+        matrix_cache_dir: Path,
+        shard_pool: ShardedSearchPool | None = None,
+    ) -> None:
         self._model_path = model_path
-        self._model: Any | None = None
+        self._matrix_cache_dir = matrix_cache_dir
+        self._shard_pool = shard_pool
+        self._current: LoadedModel | None = None
         self._load_error: str | None = None
+        self._swap_listeners: list[SwapListener] = []
+        self._reload_lock = threading.Lock()
+        self._reload_status = ReloadStatus(state="idle")
 
     def load(self) -> None:
         try:
-            if not self._model_path.exists():
-                self._load_error = f"model file not found: {self._model_path}"
-                self._model = None
-                return
-            self._model = fasttext.load_model(str(self._model_path))
+            self._swap(self._load_from_path(self._model_path))
             self._load_error = None
         except Exception as exc:  # noqa: BLE001
-            self._model = None
+            self._current = None
             self._load_error = str(exc)
 
     def warm_up(self, probe_word: str = "中国") -> None:
-        model = self._model
-        if model is None:
+        current = self._current
+        if current is None:
             return
+        self._warm_up_model(current, probe_word)
+
+    @staticmethod
+    def _warm_up_model(loaded: LoadedModel, probe_word: str) -> None:
         try:
-            # Trigger one lightweight inference path to reduce first-request latency.
-            model.get_nearest_neighbors(probe_word, k=1)
+            # One full scan faults the mapped word matrix into memory before the first real request.
+            query = loaded.query_vector(probe_word)
+            if query is not None:
+                loaded.index.top_k(query, 1)
         except Exception:
             # Warm-up failure should not block service start.
             pass
 
+    def _load_from_path(self, model_path: Path) -> LoadedModel:
+        if not model_path.exists():
+            raise FileNotFoundError(f"model file not found: {model_path}")
+        version = compute_model_version(model_path)
+        rss_before = current_rss_bytes()
+        model = fasttext.load_model(str(model_path))
+        rss_after = current_rss_bytes()
+        if rss_before is not None and rss_after is not None:
+            model_private_bytes = max(rss_after - rss_before, 0)
+        else:
+            model_private_bytes = model_path.stat().st_size
+        # Built once per model version; later starts map the file instead of materializing a list of strings.
+        vocabulary = load_vocabulary(version, self._matrix_cache_dir, model.get_words)
+        matrix = load_normalized_word_matrix(model, vocabulary, version, self._matrix_cache_dir)
+        info = ModelInfo(path=str(model_path), dimension=int(model.get_dimension()), version=version)
+        return LoadedModel(
+            model=model,
+            info=info,
+            index=WordVectorIndex(vocabulary, matrix, self._shard_pool, CharacterIndex.build(vocabulary)),
+            model_private_bytes=model_private_bytes,
+            neighbor_table=load_neighbor_table(version, self._matrix_cache_dir),
+        )
+
+    def add_swap_listener(self, listener: SwapListener) -> None:
+        self._swap_listeners.append(listener)
+
+    def _swap(self, loaded: LoadedModel) -> tuple[LoadedModel | None, list[str]]:
+        """Make `loaded` current and notify listeners. Returns the previous model and any listener errors."""
+        previous = self._current
+        # A single reference assignment is atomic; in-flight requests keep the snapshot they already read.
+        self._current = loaded
+        self._model_path = Path(loaded.info.path)
+        previous_info = previous.info if previous is not None else None
+        # The new model is live from here on; a failing listener must not make the swap look undone.
+        listener_errors: list[str] = []
+        for listener in self._swap_listeners:
+            try:
+                listener(previous_info, loaded.info)
+            except Exception as exc:  # noqa: BLE001
+                listener_errors.append(f"{type(exc).__name__}: {exc}")
+        return previous, listener_errors
+
+    def reload(self, model_path: Path | None = None, probe_word: str = "中国") -> bool:
+        """Load and warm a model in the background, then swap it in. Returns False if a reload is running."""
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        target_path = model_path or self._model_path
+        current = self._current
+        self._reload_status = ReloadStatus(
+            state="loading",
+            target_path=str(target_path),
+            started_at=_now_ms(),
+            previous_version=current.info.version if current is not None else None,
+            rss_before_bytes=current_rss_bytes(),
+        )
+        thread = threading.Thread(
+            target=self._run_reload,
+            args=(target_path, probe_word),
+            name="model-reload",
+            daemon=True,
+        )
+        try:
+            thread.start()
+        except Exception:
+            self._reload_lock.release()
+            raise
+        return True
+
+    def _run_reload(self, target_path: Path, probe_word: str) -> None:
+        status = self._reload_status
+        try:
+            with RssPeakSampler() as sampler:
+                listener_errors: list[str] = []
+                try:
+                    loaded = self._load_from_path(target_path)
+                    self._warm_up_model(loaded, probe_word)
+                except Exception as exc:  # noqa: BLE001
+                    loaded = None
+                    previous = None
+                    error = str(exc)
+                else:
+                    previous, listener_errors = self._swap(loaded)
+                    self._load_error = None
+                    error = None
+
+            # Drop the last reference to the old model before measuring what was given back.
+            del previous
+            gc.collect()
+            release_free_memory()
+
+            self._reload_status = ReloadStatus(
+                state="failed" if loaded is None else "succeeded",
+                target_path=status.target_path,
+                started_at=status.started_at,
+                finished_at=_now_ms(),
+                error=error,
+                previous_version=status.previous_version,
+                current_version=loaded.info.version if loaded is not None else status.previous_version,
+                rss_before_bytes=status.rss_before_bytes,
+                rss_peak_bytes=sampler.peak_bytes,
+                rss_after_bytes=current_rss_bytes(),
+                listener_errors=tuple(listener_errors),
+            )
+        finally:
+            self._reload_lock.release()
+
+    @property
+    def reload_status(self) -> ReloadStatus:
+        return self._reload_status
+
     @property
     def is_ready(self) -> bool:
-        return self._model is not None
+        return self._current is not None
 
     @property
     def load_error(self) -> str | None:
         return self._load_error
 
+    def memory_usage(self) -> dict[str, object]:
+        current = self._current
+        if current is None:
+            return {}
+        return {
+            "model_file_bytes": Path(current.info.path).stat().st_size,
+            # The full fastText model (kept for OOV subword vectors) is private to every process and tier.
+            "fasttext_private_bytes": current.model_private_bytes,
+            "word_matrix_bytes": current.index.nbytes,
+            # The mapped word matrix and vocabulary live in the shared page cache.
+            "word_matrix_shared": current.index.is_memory_mapped,
+            "vocabulary_size": current.index.size,
+            "vocabulary_bytes": current.index.vocabulary.nbytes,
+            "vocabulary_shared": current.index.vocabulary.is_memory_mapped,
+            "character_index_bytes": current.index.characters.nbytes,
+            "search_shards": current.index.shards,
+            "neighbor_table_words": len(current.neighbor_table) if current.neighbor_table is not None else 0,
+            "neighbor_table_bytes": current.neighbor_table.nbytes if current.neighbor_table is not None else 0,
+        }
+
+    def memory_footprints(self) -> dict[str, MemoryFootprint]:
+        current = self._current
+        if current is None:
+            return {}
+        index = current.index
+        return {
+            "fasttext": MemoryFootprint(current.model_private_bytes),
+            "word_matrix": MemoryFootprint(index.nbytes, shared=index.is_memory_mapped),
+            "vocabulary": MemoryFootprint(index.vocabulary.nbytes, shared=index.vocabulary.is_memory_mapped),
+            "character_index": MemoryFootprint(index.characters.nbytes),
+            "neighbor_table": MemoryFootprint(
+                current.neighbor_table.nbytes if current.neighbor_table is not None else 0,
+                shared=True,
+            ),
+        }
+
+    def get_snapshot_or_none(self) -> LoadedModel | None:
+        return self._current
+
     def get_model_or_none(self) -> Any | None:
-        return self._model
+        current = self._current
+        return current.model if current is not None else None
 
     def get_model_info_or_none(self) -> ModelInfo | None:
-        if self._model is None:
-            return None
-        return ModelInfo(path=str(self._model_path), dimension=int(self._model.get_dimension()))
+        current = self._current
+        return current.info if current is not None else None
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from .errors import ApiError
+from .model_loader import FastTextModelStore, ModelInfo
+from .sharded_search import ShardedSearchPool
+from .word_matrix import prune_model_cache
+
+
+class ModelRegistry:
+    """Named model tiers (e.g. `fast`, `quality`) resident side by side in one process."""
+
+    def __init__(
+        self,
+        model_tiers: dict[str, Path],
+        default_tier: str,
+        matrix_cache_dir: Path,
+        shard_pool: ShardedSearchPool | None = None,
+    ) -> None:
+        # One shard pool serves every tier: workers map whichever matrix file a query names.
+        self._stores = {
+            tier: FastTextModelStore(model_path, matrix_cache_dir, shard_pool)
+            for tier, model_path in model_tiers.items()
+        }
+        self._default_tier = default_tier
+        self._matrix_cache_dir = matrix_cache_dir
+        for store in self._stores.values():
+            store.add_swap_listener(lambda previous, _current, store=store: self._prune_model_cache(store, previous))
+
+    @property
+    def default_tier(self) -> str:
+        return self._default_tier
+
+    @property
+    def tiers(self) -> list[str]:
+        return list(self._stores)
+
+    def items(self) -> list[tuple[str, FastTextModelStore]]:
+        return list(self._stores.items())
+
+    def resolve_tier(self, tier: str | None) -> str:
+        if tier is None:
+            return self._default_tier
+        if tier not in self._stores:
+            raise ApiError("INVALID_ARGUMENT", f"tier must be one of: {', '.join(self._stores)}", 400)
+        return tier
+
+    def get_store(self, tier: str | None = None) -> FastTextModelStore:
+        return self._stores[self.resolve_tier(tier)]
+
+    def _prune_model_cache(self, swapped: FastTextModelStore, previous: ModelInfo | None) -> None:
+        if previous is None:
+            return
+        # Another tier's reload may be loading the very version just dropped; leave its files alone meanwhile.
+        if any(store is not swapped and store.reload_status.state == "loading" for store in self._stores.values()):
+            return
+        resident = {info.version for store in self._stores.values() if (info := store.get_model_info_or_none())}
+        if previous.version not in resident:
+            prune_model_cache(self._matrix_cache_dir, previous.version)
+
+    def load_all(self) -> None:
+        for store in self._stores.values():
+            store.load()
+
+    def warm_up_all(self) -> None:
+        for store in self._stores.values():
+            store.warm_up()
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+from pathlib import Path
+import struct
+
+import numpy as np
+
+
+# Layout (native byte order, little-endian on every host we deploy to):
+#   header         magic "WSNBTAB1", uint32 k, uint32 reserved, uint64 row count n, model version (NUL-padded)
+#   query_rows     uint32[n]     vocabulary rows that have a neighbor list, ascending
+#   neighbor_rows  uint32[n, k]  vocabulary rows of each list's neighbors, best first; NO_NEIGHBOR pads short lists
+#   scores         float32[n, k] cosine similarity of each neighbor
+_LOGGER = logging.getLogger(__name__)
+_MAGIC = b"WSNBTAB1"
+_VERSION_BYTES = 64
+_HEADER = struct.Struct(f"=8sIIQ{_VERSION_BYTES}s")
+NEIGHBOR_TABLE_SUFFIX = ".neighbors"
+NO_NEIGHBOR = np.iinfo(np.uint32).max
+
+
+class NeighborTable:
+    """Precomputed top-k neighbor lists of the word-bank words, looked up by vocabulary row.
+
+    Lists are built offline (tools/build_neighbor_table.py) with the same filtering as a live search: the
+    query word itself and words without hanzi are left out. Mapped from a file, every worker shares one copy.
+    """
+
+    def __init__(self, buffer: bytes | mmap.mmap) -> None:
+        self._buffer = buffer
+        magic, k, _reserved, count, raw_version = _HEADER.unpack_from(buffer, 0)
+        if magic != _MAGIC:
+            raise ValueError("not a neighbor table")
+        rows_start = _HEADER.size
+        neighbors_start = rows_start + 4 * count
+        scores_start = neighbors_start + 4 * count * k
+        if len(buffer) != scores_start + 4 * count * k:
+            raise ValueError("neighbor table is truncated")
+        self._k = k
+        self._version = raw_version.rstrip(b"\0").decode("utf-8")
+        self._query_rows = np.frombuffer(buffer, dtype=np.uint32, count=count, offset=rows_start)
+        self._neighbor_rows = np.frombuffer(buffer, dtype=np.uint32, count=count * k, offset=neighbors_start).reshape(
+            count, k
+        )
+        self._scores = np.frombuffer(buffer, dtype=np.float32, count=count * k, offset=scores_start).reshape(count, k)
+
+    @classmethod
+    def open(cls, path: Path) -> "NeighborTable":
+        with path.open("rb") as handle:
+            return cls(mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self) -> int:
+        return len(self._query_rows)
+
+    @property
+    def k(self) -> int:
+        return self._k
+
+    @property
+    def version(self) -> str:
+        return self._version
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def is_memory_mapped(self) -> bool:
+        return isinstance(self._buffer, mmap.mmap)
+
+    def lookup(self, row: int) -> tuple[np.ndarray, np.ndarray] | None:
+        """Neighbor rows and scores of vocabulary row `row`, best first, or None if the table has no list for it."""
+        index = int(np.searchsorted(self._query_rows, row))
+        if index >= len(self._query_rows) or self._query_rows[index] != row:
+            return None
+        neighbor_rows = self._neighbor_rows[index]
+        filled = int(np.count_nonzero(neighbor_rows != NO_NEIGHBOR))
+        return neighbor_rows[:filled], self._scores[index, :filled]
+
+
+def load_neighbor_table(version: str, cache_dir: Path) -> NeighborTable | None:
+    """Map `<version>.neighbors` from `cache_dir`, or None if no usable table was built for this model version.
+
+    The table only speeds up bank-word queries, so a damaged or mismatched file is logged and skipped rather than
+    failing the model load; it is not deleted either, since the service cannot rebuild it.
+    """
+    path = cache_dir / f"{version}{NEIGHBOR_TABLE_SUFFIX}"
+    if not path.exists():
+        return None
+    try:
+        table = NeighborTable.open(path)
+    except (OSError, ValueError, struct.error) as exc:
+        _LOGGER.warning("ignoring unreadable neighbor table %s: %s", path, exc)
+        return None
+    if table.version != version:
+        _LOGGER.warning("ignoring neighbor table %s: built for model %s, not %s", path, table.version, version)
+        return None
+    return table
+
+
+def write_neighbor_table(
+    path: Path,
+    version: str,
+    query_rows: np.ndarray,
+    neighbor_rows: np.ndarray,
+    scores: np.ndarray,
+) -> None:
+    """Write a table atomically. `query_rows` must be ascending; `neighbor_rows` and `scores` are (n, k)."""
+    encoded_version = version.encode("utf-8")
+    if len(encoded_version) > _VERSION_BYTES:
+        raise ValueError(f"model version is too long for a neighbor table header: {version}")
+    query_rows = np.ascontiguousarray(query_rows, dtype=np.uint32)
+    neighbor_rows = np.ascontiguousarray(neighbor_rows, dtype=np.uint32)
+    scores = np.ascontiguousarray(scores, dtype=np.float32)
+    count, k = neighbor_rows.shape
+    if query_rows.shape != (count,) or scores.shape != (count, k):
+        raise ValueError("neighbor table arrays have inconsistent shapes")
+    if count > 1 and not bool(np.all(query_rows[1:] > query_rows[:-1])):
+        raise ValueError("neighbor table query rows must be strictly ascending")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("wb") as handle:
+            handle.write(_HEADER.pack(_MAGIC, k, 0, count, encoded_version))
+            handle.write(query_rows.tobytes())
+            handle.write(neighbor_rows.tobytes())
+            handle.write(scores.tobytes())
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_path, path)
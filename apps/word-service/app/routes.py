@@ -4,44 +4,270 @@ import time
 
 from flask import Blueprint, jsonify, request
 
+from .clue_history import ClueHistoryResult, ClueHistoryService
 from .config import Settings
-from .schemas import parse_consistency_score_request, parse_related_words_request
+from .encoding import model_payload, neighbors_payload, neighbors_response
+from .memory import MemoryAccountant, current_rss_bytes
+from .metrics import Metrics
+from .model_registry import ModelRegistry
+from .schemas import (
+    parse_clue_candidates_request,
+    parse_clue_history_request,
+    parse_consistency_score_request,
+    parse_create_session_request,
+    parse_guess_scores_request,
+    parse_related_words_request,
+    parse_vector_query_request,
+)
 from .service import RelatedWordsService
+from .sessions import PrefetchSession, PrefetchSessionService
+from .warmup import CacheWarmer, WarmUpStatus
 
 
-def create_routes_blueprint(settings: Settings, related_words_service: RelatedWordsService) -> Blueprint:
+def session_payload(session: PrefetchSession) -> dict[str, object]:
+    return {
+        "session_id": session.session_id,
+        "room_id": session.room_id,
+        "status": session.status,
+        "error": session.error,
+        "words": session.words,
+        "k": session.k,
+        "tier": session.tier,
+        "created_at": session.created_at,
+        "model": model_payload(session.model) if session.model is not None else None,
+    }
+
+
+def clue_history_payload(result: ClueHistoryResult) -> dict[str, object]:
+    return {
+        "room_id": result.room_id,
+        "team_id": result.team_id,
+        "round": result.round,
+        "appended": result.appended,
+        "slots": [
+            {
+                "slot": slot.slot,
+                "clues": slot.clues,
+                "coherence": slot.coherence,
+                "intercept_risk": slot.intercept_risk,
+            }
+            for slot in result.slots
+        ],
+        "tier": result.tier,
+        "model": model_payload(result.model),
+    }
+
+
+def warm_up_payload(status: WarmUpStatus) -> dict[str, object]:
+    return {
+        "state": status.state,
+        "word_bank_path": status.word_bank_path,
+        "words_total": status.words_total,
+        "words_done": status.words_done,
+        "entries_cached": status.entries_cached,
+        "started_at": status.started_at,
+        "finished_at": status.finished_at,
+        "error": status.error,
+    }
+
+
+def create_routes_blueprint(
+    settings: Settings,
+    related_words_service: RelatedWordsService,
+    session_service: PrefetchSessionService,
+    clue_history_service: ClueHistoryService,
+    model_registry: ModelRegistry,
+    cache_warmer: CacheWarmer,
+    memory_accountant: MemoryAccountant,
+    metrics: Metrics,
+) -> Blueprint:
     bp = Blueprint("word_service", __name__)
 
-    @bp.get("/health")
-    def health() -> tuple[dict[str, object], int]:
+    def models_payload() -> dict[str, object]:
+        return {
+            tier: {
+                "ready": model_store.is_ready,
+                "version": info.version if (info := model_store.get_model_info_or_none()) is not None else None,
+                "error": model_store.load_error,
+            }
+            for tier, model_store in model_registry.items()
+        }
+
+    def models_ready() -> bool:
+        return all(model_store.is_ready for _, model_store in model_registry.items())
+
+    @bp.get("/health/live")
+    def health_live() -> tuple[dict[str, object], int]:
+        # Liveness: the process answers. Restarting it would not fix a missing model file.
         return {
             "ok": True,
             "service": settings.service_name,
             "ts": int(time.time() * 1000),
         }, 200
 
+    @bp.get("/health")
+    def health() -> tuple[dict[str, object], int]:
+        ok = models_ready()
+        return {
+            "ok": ok,
+            "service": settings.service_name,
+            "ts": int(time.time() * 1000),
+            "models": models_payload(),
+        }, 200 if ok else 503
+
+    @bp.get("/health/ready")
+    def health_ready() -> tuple[dict[str, object], int]:
+        # Readiness: every tier loaded and warm-up finished, so a load balancer only routes to warm instances.
+        warm_up = cache_warmer.status
+        ok = models_ready() and warm_up.finished
+        return {
+            "ok": ok,
+            "service": settings.service_name,
+            "ts": int(time.time() * 1000),
+            "models": models_payload(),
+            "warm_up": warm_up_payload(warm_up),
+            "neighbor_cache": {
+                "entries": related_words_service.neighbor_cache_size,
+                "capacity": related_words_service.neighbor_cache_capacity,
+            },
+        }, 200 if ok else 503
+
     @bp.post("/api/v1/related-words")
     def related_words():
         payload = request.get_json(silent=True)
-        req = parse_related_words_request(payload, settings.max_k)
-        result = related_words_service.find_related_words(word=req.word, k=req.k)
-        return jsonify(
+        req = parse_related_words_request(payload, settings.max_k, request.headers.get("X-Request-Deadline"))
+        result = None
+        if req.session_id is not None:
+            result = session_service.find_related_words(req.session_id, req.word, req.k, req.exclude_containing)
+        if result is None:
+            result = related_words_service.find_related_words(
+                word=req.word,
+                k=req.k,
+                tier=req.tier,
+                deadline=req.deadline,
+                exclude_containing=req.exclude_containing,
+            )
+        return neighbors_response(
+            req.response_format,
             {
                 "word": result.word,
                 "k": result.k,
-                "neighbors": [{"word": item.word, "score": item.score} for item in result.neighbors],
-                "model": {
-                    "path": result.model.path,
-                    "dimension": result.model.dimension,
-                },
-            }
+                "neighbors": neighbors_payload(result.neighbors),
+                "tier": result.tier,
+                "path": result.path,
+                "model": model_payload(result.model),
+            },
+            "neighbors",
+            result.neighbors,
+            result.tier,
+            result.path,
+            result.model,
         )
 
+    @bp.post("/api/v1/query")
+    def vector_query():
+        payload = request.get_json(silent=True)
+        req = parse_vector_query_request(payload, settings.max_k, request.headers.get("X-Request-Deadline"))
+        result = related_words_service.query_vectors(req.queries, req.k, tier=req.tier, deadline=req.deadline)
+        body: dict[str, object] = {"k": result.k, "tier": result.tier, "model": model_payload(result.model)}
+        if req.batch:
+            body["results"] = [{"neighbors": neighbors_payload(neighbors)} for neighbors in result.neighbors]
+        else:
+            body["neighbors"] = neighbors_payload(result.neighbors[0])
+        return jsonify(body)
+
     @bp.post("/api/v1/consistency-score")
     def consistency_score():
         payload = request.get_json(silent=True)
         req = parse_consistency_score_request(payload)
-        score = related_words_service.calculate_consistency_score(req.words)
-        return jsonify({"score": score})
+        result = related_words_service.calculate_consistency_score(req.words, tier=req.tier)
+        return jsonify({"score": result.score, "tier": result.tier, "model": model_payload(result.model)})
+
+    @bp.post("/api/v1/clue-history")
+    def clue_history():
+        req = parse_clue_history_request(request.get_json(silent=True))
+        result = clue_history_service.append_round(req.room_id, req.team_id, req.round, req.clues, tier=req.tier)
+        return jsonify(clue_history_payload(result))
+
+    @bp.post("/api/v1/sessions")
+    def create_session():
+        req = parse_create_session_request(request.get_json(silent=True), settings.max_k)
+        session = session_service.create_session(req.words, req.k, req.tier, req.room_id)
+        return jsonify(session_payload(session)), 202
+
+    @bp.get("/api/v1/sessions/<session_id>")
+    def get_session(session_id: str):
+        session = session_service.get_session(session_id)
+        payload = session_payload(session)
+        payload["entries"] = {
+            word: {
+                "neighbors": neighbors_payload(entry.neighbors),
+                "clue_candidates": neighbors_payload(entry.clue_candidates),
+            }
+            for word, entry in session.entries.items()
+        }
+        return jsonify(payload)
+
+    @bp.post("/api/v1/sessions/<session_id>/clues")
+    def session_clues(session_id: str):
+        req = parse_clue_candidates_request(
+            request.get_json(silent=True), settings.max_k, request.headers.get("X-Request-Deadline")
+        )
+        result = session_service.find_clue_candidates(
+            session_id, req.word, req.k, req.exclude_containing, deadline=req.deadline
+        )
+        return neighbors_response(
+            req.response_format,
+            {
+                "word": result.word,
+                "k": result.k,
+                "candidates": neighbors_payload(result.candidates),
+                "tier": result.tier,
+                "path": result.path,
+                "model": model_payload(result.model),
+            },
+            "candidates",
+            result.candidates,
+            result.tier,
+            result.path,
+            result.model,
+        )
+
+    @bp.post("/api/v1/sessions/<session_id>/guess")
+    def session_guess(session_id: str):
+        req = parse_guess_scores_request(request.get_json(silent=True))
+        result = session_service.score_guess(session_id, req.clues, req.candidates)
+        return jsonify(
+            {
+                "clues": result.clues,
+                "candidates": result.candidates,
+                "scores": result.scores,
+                "tier": result.tier,
+                "model": model_payload(result.model),
+            }
+        )
+
+    @bp.get("/debug/memory")
+    def debug_memory():
+        return jsonify(memory_accountant.report())
+
+    @bp.get("/metrics")
+    def metrics_snapshot():
+        tiers: dict[str, object] = {}
+        for tier, model_store in model_registry.items():
+            info = model_store.get_model_info_or_none()
+            tiers[tier] = {
+                "ready": model_store.is_ready,
+                "model": model_payload(info) if info is not None else None,
+                "memory": model_store.memory_usage(),
+            }
+        return jsonify(
+            {
+                "default_tier": model_registry.default_tier,
+                "tiers": tiers,
+                "process": {"rss_bytes": current_rss_bytes()},
+                **metrics.snapshot(),
+            }
+        )
 
     return bp
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import math
+from pathlib import Path
 from typing import Any
 
+from .deadline import Deadline
 from .errors import ApiError
 
 
@@ -10,17 +13,100 @@ from .errors import ApiError
 class RelatedWordsRequest:
     word: str
     k: int
+    tier: str | None = None
+    deadline: Deadline | None = None
+    session_id: str | None = None
+    response_format: str = "full"
+    exclude_containing: tuple[str, ...] = ()
 
 
 @dataclass(frozen=True)
 class ConsistencyScoreRequest:
     words: list[str]
+    tier: str | None = None
 
 
-def parse_related_words_request(payload: Any, max_k: int) -> RelatedWordsRequest:
-    if not isinstance(payload, dict):
-        raise ApiError("INVALID_ARGUMENT", "request body must be a JSON object", 400)
+@dataclass(frozen=True)
+class ClueHistoryRequest:
+    room_id: str
+    team_id: str
+    round: int
+    clues: dict[int, list[str]]
+    tier: str | None = None
+
+
+@dataclass(frozen=True)
+class CreateSessionRequest:
+    words: list[str]
+    k: int
+    tier: str | None = None
+    room_id: str | None = None
+
+
+@dataclass(frozen=True)
+class ClueCandidatesRequest:
+    word: str
+    k: int
+    deadline: Deadline | None = None
+    response_format: str = "full"
+    exclude_containing: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class WeightedWord:
+    word: str
+    weight: float = 1.0
+
+
+@dataclass(frozen=True)
+class VectorQuery:
+    positive: list[WeightedWord]
+    negative: list[WeightedWord]
+    exclude_containing: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class VectorQueryRequest:
+    queries: list[VectorQuery]
+    k: int
+    batch: bool
+    tier: str | None = None
+    deadline: Deadline | None = None
+
+
+@dataclass(frozen=True)
+class GuessScoresRequest:
+    clues: list[str]
+    candidates: list[str] | None = None
+
+
+@dataclass(frozen=True)
+class ReloadModelRequest:
+    model_path: Path | None
+    tier: str | None = None
+
+
+def parse_tier(payload: dict[str, Any]) -> str | None:
+    raw_tier = payload.get("tier")
+    if raw_tier is None:
+        return None
+    if not isinstance(raw_tier, str) or not raw_tier.strip():
+        raise ApiError("INVALID_ARGUMENT", "tier must be a non-empty string", 400)
+    return raw_tier.strip()
+
 
+MAX_SESSION_WORDS = 16
+MAX_EXCLUDE_FRAGMENTS = 16
+MAX_QUERY_TERMS = 16
+MAX_BATCH_QUERIES = 32
+# Longer than any caller waits; it also keeps every derived wait far below `threading.TIMEOUT_MAX`.
+MAX_DEADLINE_BUDGET_MS = 10 * 60 * 1000.0
+RESPONSE_FORMATS = ("full", "compact", "binary")
+SECRET_SLOTS = (1, 2, 3, 4)
+MAX_CLUES_PER_SLOT = 16
+
+
+def parse_word(payload: dict[str, Any]) -> str:
     raw_word = payload.get("word")
     if not isinstance(raw_word, str):
         raise ApiError("INVALID_ARGUMENT", "word must be a string", 400)
@@ -28,14 +114,174 @@ def parse_related_words_request(payload: Any, max_k: int) -> RelatedWordsRequest
     word = raw_word.strip()
     if not word:
         raise ApiError("INVALID_ARGUMENT", "word must not be empty", 400)
+    return word
+
 
+def parse_k(payload: dict[str, Any], max_k: int) -> int:
     raw_k = payload.get("k", 10)
     if isinstance(raw_k, bool) or not isinstance(raw_k, int):
         raise ApiError("INVALID_ARGUMENT", f"k must be an integer between 1 and {max_k}", 400)
     if raw_k <= 0 or raw_k > max_k:
         raise ApiError("INVALID_ARGUMENT", f"k must be an integer between 1 and {max_k}", 400)
+    return raw_k
+
+
+def parse_word_list(payload: dict[str, Any], field_name: str, max_items: int) -> list[str]:
+    raw_words = payload.get(field_name)
+    if not isinstance(raw_words, list):
+        raise ApiError("INVALID_ARGUMENT", f"{field_name} must be an array of strings", 400)
+    if len(raw_words) < 1 or len(raw_words) > max_items:
+        raise ApiError("INVALID_ARGUMENT", f"{field_name} must contain between 1 and {max_items} items", 400)
+
+    words: list[str] = []
+    for raw_word in raw_words:
+        if not isinstance(raw_word, str):
+            raise ApiError("INVALID_ARGUMENT", f"{field_name} must be an array of strings", 400)
+        word = raw_word.strip()
+        if not word:
+            raise ApiError("INVALID_ARGUMENT", "word must not be empty", 400)
+        if word not in words:
+            words.append(word)
+    return words
 
-    return RelatedWordsRequest(word=word, k=raw_k)
+
+def parse_exclude_containing(payload: dict[str, Any]) -> tuple[str, ...]:
+    if payload.get("exclude_containing") is None:
+        return ()
+    # Sorted so the same set of fragments always maps to the same cache entry.
+    return tuple(sorted(parse_word_list(payload, "exclude_containing", MAX_EXCLUDE_FRAGMENTS)))
+
+
+def parse_weighted_words(payload: dict[str, Any], field_name: str, required: bool) -> list[WeightedWord]:
+    raw_items = payload.get(field_name)
+    if raw_items is None and not required:
+        return []
+    minimum = 1 if required else 0
+    if not isinstance(raw_items, list) or not minimum <= len(raw_items) <= MAX_QUERY_TERMS:
+        raise ApiError(
+            "INVALID_ARGUMENT",
+            f"{field_name} must be an array of {minimum} to {MAX_QUERY_TERMS} words or {{word, weight}} objects",
+            400,
+        )
+
+    items: list[WeightedWord] = []
+    for raw_item in raw_items:
+        # A bare string is shorthand for weight 1.
+        item = {"word": raw_item} if isinstance(raw_item, str) else raw_item
+        if not isinstance(item, dict):
+            raise ApiError("INVALID_ARGUMENT", f"{field_name} items must be strings or {{word, weight}} objects", 400)
+        raw_weight = item.get("weight", 1.0)
+        if isinstance(raw_weight, bool) or not isinstance(raw_weight, (int, float)) or raw_weight <= 0:
+            raise ApiError("INVALID_ARGUMENT", "weight must be a positive number", 400)
+        items.append(WeightedWord(word=parse_word(item), weight=float(raw_weight)))
+    return items
+
+
+def parse_vector_query(payload: Any) -> VectorQuery:
+    if not isinstance(payload, dict):
+        raise ApiError("INVALID_ARGUMENT", "each query must be a JSON object", 400)
+    return VectorQuery(
+        positive=parse_weighted_words(payload, "positive", required=True),
+        negative=parse_weighted_words(payload, "negative", required=False),
+        exclude_containing=parse_exclude_containing(payload),
+    )
+
+
+def parse_optional_string(payload: dict[str, Any], field_name: str) -> str | None:
+    raw_value = payload.get(field_name)
+    if raw_value is None:
+        return None
+    if not isinstance(raw_value, str) or not raw_value.strip():
+        raise ApiError("INVALID_ARGUMENT", f"{field_name} must be a non-empty string", 400)
+    return raw_value.strip()
+
+
+def parse_response_format(payload: dict[str, Any]) -> str:
+    raw_format = payload.get("format", "full")
+    if raw_format not in RESPONSE_FORMATS:
+        raise ApiError("INVALID_ARGUMENT", f"format must be one of: {', '.join(RESPONSE_FORMATS)}", 400)
+    return raw_format
+
+
+def parse_deadline(payload: dict[str, Any], deadline_header: str | None) -> Deadline | None:
+    # `budget_ms` is relative to arrival; the `X-Request-Deadline` header (epoch ms) also covers time
+    # spent queued before the handler ran. When both are given the earlier one wins.
+    deadline: Deadline | None = None
+
+    raw_budget = payload.get("budget_ms")
+    if raw_budget is not None:
+        if isinstance(raw_budget, bool) or not isinstance(raw_budget, (int, float)):
+            raise ApiError("INVALID_ARGUMENT", "budget_ms must be a positive number", 400)
+        try:
+            budget_ms = float(raw_budget)
+        except OverflowError:
+            budget_ms = MAX_DEADLINE_BUDGET_MS
+        # JSON bodies may carry `Infinity` / `NaN`; neither is a budget.
+        if not math.isfinite(budget_ms) or budget_ms <= 0:
+            raise ApiError("INVALID_ARGUMENT", "budget_ms must be a positive number", 400)
+        deadline = Deadline.from_budget(budget_ms)
+
+    if deadline_header is not None and deadline_header.strip():
+        try:
+            expires_at_ms = float(deadline_header.strip())
+        except ValueError:
+            expires_at_ms = math.nan
+        if not math.isfinite(expires_at_ms):
+            raise ApiError("INVALID_ARGUMENT", "X-Request-Deadline must be epoch milliseconds", 400)
+        deadline = Deadline(expires_at_ms=expires_at_ms).earliest(deadline)
+
+    if deadline is not None:
+        deadline = deadline.earliest(Deadline.from_budget(MAX_DEADLINE_BUDGET_MS))
+    return deadline
+
+
+def parse_related_words_request(
+    payload: Any,
+    max_k: int,
+    deadline_header: str | None = None,
+) -> RelatedWordsRequest:
+    if not isinstance(payload, dict):
+        raise ApiError("INVALID_ARGUMENT", "request body must be a JSON object", 400)
+
+    return RelatedWordsRequest(
+        word=parse_word(payload),
+        k=parse_k(payload, max_k),
+        tier=parse_tier(payload),
+        deadline=parse_deadline(payload, deadline_header),
+        session_id=parse_optional_string(payload, "session_id"),
+        response_format=parse_response_format(payload),
+        exclude_containing=parse_exclude_containing(payload),
+    )
+
+
+def parse_vector_query_request(
+    payload: Any,
+    max_k: int,
+    deadline_header: str | None = None,
+) -> VectorQueryRequest:
+    if not isinstance(payload, dict):
+        raise ApiError("INVALID_ARGUMENT", "request body must be a JSON object", 400)
+
+    # Either one query at the top level, or `queries` for a batch answered from one matrix scan.
+    raw_queries = payload.get("queries")
+    if raw_queries is None:
+        queries = [parse_vector_query(payload)]
+    else:
+        if not isinstance(raw_queries, list) or len(raw_queries) < 1 or len(raw_queries) > MAX_BATCH_QUERIES:
+            raise ApiError(
+                "INVALID_ARGUMENT",
+                f"queries must contain between 1 and {MAX_BATCH_QUERIES} items",
+                400,
+            )
+        queries = [parse_vector_query(raw_query) for raw_query in raw_queries]
+
+    return VectorQueryRequest(
+        queries=queries,
+        k=parse_k(payload, max_k),
+        batch=raw_queries is not None,
+        tier=parse_tier(payload),
+        deadline=parse_deadline(payload, deadline_header),
+    )
 
 
 def parse_consistency_score_request(payload: Any) -> ConsistencyScoreRequest:
@@ -58,4 +304,108 @@ def parse_consistency_score_request(payload: Any) -> ConsistencyScoreRequest:
             raise ApiError("INVALID_ARGUMENT", "word must not be empty", 400)
         words.append(word)
 
-    return ConsistencyScoreRequest(words=words)
+    return ConsistencyScoreRequest(words=words, tier=parse_tier(payload))
+
+
+def parse_clue_history_request(payload: Any) -> ClueHistoryRequest:
+    if not isinstance(payload, dict):
+        raise ApiError("INVALID_ARGUMENT", "request body must be a JSON object", 400)
+
+    room_id = parse_optional_string(payload, "room_id")
+    team_id = parse_optional_string(payload, "team_id")
+    if room_id is None or team_id is None:
+        raise ApiError("INVALID_ARGUMENT", "room_id and team_id are required", 400)
+
+    raw_round = payload.get("round")
+    if isinstance(raw_round, bool) or not isinstance(raw_round, int) or raw_round <= 0:
+        raise ApiError("INVALID_ARGUMENT", "round must be a positive integer", 400)
+
+    raw_clues = payload.get("clues", {})
+    if not isinstance(raw_clues, dict):
+        raise ApiError("INVALID_ARGUMENT", "clues must be an object keyed by slot number", 400)
+    slot_names = ", ".join(str(slot) for slot in SECRET_SLOTS)
+    clues: dict[int, list[str]] = {}
+    for raw_slot, raw_words in raw_clues.items():
+        slot = int(raw_slot) if isinstance(raw_slot, str) and raw_slot.isdigit() else None
+        if slot not in SECRET_SLOTS:
+            raise ApiError("INVALID_ARGUMENT", f"clues keys must be slot numbers: {slot_names}", 400)
+        if not isinstance(raw_words, list) or len(raw_words) < 1 or len(raw_words) > MAX_CLUES_PER_SLOT:
+            raise ApiError(
+                "INVALID_ARGUMENT",
+                f"clues of a slot must be an array of 1 to {MAX_CLUES_PER_SLOT} strings",
+                400,
+            )
+        words: list[str] = []
+        # Unlike other word lists, repeats are kept: giving the same clue twice is part of a slot's history.
+        for raw_word in raw_words:
+            if not isinstance(raw_word, str) or not raw_word.strip():
+                raise ApiError("INVALID_ARGUMENT", "clues must be non-empty strings", 400)
+            words.append(raw_word.strip())
+        clues[slot] = words
+
+    return ClueHistoryRequest(
+        room_id=room_id,
+        team_id=team_id,
+        round=raw_round,
+        clues=clues,
+        tier=parse_tier(payload),
+    )
+
+
+def parse_create_session_request(payload: Any, max_k: int) -> CreateSessionRequest:
+    if not isinstance(payload, dict):
+        raise ApiError("INVALID_ARGUMENT", "request body must be a JSON object", 400)
+
+    return CreateSessionRequest(
+        words=parse_word_list(payload, "words", MAX_SESSION_WORDS),
+        k=parse_k(payload, max_k),
+        tier=parse_tier(payload),
+        room_id=parse_optional_string(payload, "room_id"),
+    )
+
+
+def parse_clue_candidates_request(
+    payload: Any,
+    max_k: int,
+    deadline_header: str | None = None,
+) -> ClueCandidatesRequest:
+    if not isinstance(payload, dict):
+        raise ApiError("INVALID_ARGUMENT", "request body must be a JSON object", 400)
+
+    return ClueCandidatesRequest(
+        word=parse_word(payload),
+        k=parse_k(payload, max_k),
+        deadline=parse_deadline(payload, deadline_header),
+        response_format=parse_response_format(payload),
+        exclude_containing=parse_exclude_containing(payload),
+    )
+
+
+def parse_guess_scores_request(payload: Any) -> GuessScoresRequest:
+    if not isinstance(payload, dict):
+        raise ApiError("INVALID_ARGUMENT", "request body must be a JSON object", 400)
+
+    candidates = None
+    if payload.get("candidates") is not None:
+        candidates = parse_word_list(payload, "candidates", MAX_SESSION_WORDS)
+    return GuessScoresRequest(clues=parse_word_list(payload, "clues", MAX_SESSION_WORDS), candidates=candidates)
+
+
+def parse_reload_model_request(payload: Any) -> ReloadModelRequest:
+    if payload is None:
+        return ReloadModelRequest(model_path=None)
+    if not isinstance(payload, dict):
+        raise ApiError("INVALID_ARGUMENT", "request body must be a JSON object", 400)
+
+    tier = parse_tier(payload)
+    raw_path = payload.get("path")
+    if raw_path is None:
+        return ReloadModelRequest(model_path=None, tier=tier)
+    if not isinstance(raw_path, str) or not raw_path.strip():
+        raise ApiError("INVALID_ARGUMENT", "path must be a non-empty string", 400)
+
+    model_path = Path(raw_path.strip())
+    if not model_path.is_file():
+        raise ApiError("INVALID_ARGUMENT", f"model file not found: {model_path}", 400)
+
+    return ReloadModelRequest(model_path=model_path, tier=tier)
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import numpy as np
+
+from .char_index import CharacterIndex
+from .sharded_search import ShardedSearchPool, ShardUnavailableError
+from .vocabulary import VocabularyIndex
+
+
+class WordVectorIndex:
+    """Exact cosine top-k search over a row-normalized word matrix."""
+
+    def __init__(
+        self,
+        vocabulary: VocabularyIndex,
+        matrix: np.ndarray,
+        shard_pool: ShardedSearchPool | None = None,
+        characters: CharacterIndex | None = None,
+    ) -> None:
+        self._vocabulary = vocabulary
+        self._matrix = matrix
+        self._characters = characters
+        # Shard workers map the matrix by file name, so only a file-backed matrix can be sharded.
+        self._shard_pool = shard_pool if isinstance(matrix, np.memmap) and matrix.filename else None
+
+    @property
+    def size(self) -> int:
+        return len(self._vocabulary)
+
+    @property
+    def vocabulary(self) -> VocabularyIndex:
+        return self._vocabulary
+
+    @property
+    def dimension(self) -> int:
+        return int(self._matrix.shape[1])
+
+    @property
+    def nbytes(self) -> int:
+        return int(self._matrix.nbytes)
+
+    @property
+    def is_memory_mapped(self) -> bool:
+        return isinstance(self._matrix, np.memmap)
+
+    def row_of(self, word: str) -> int | None:
+        return self._vocabulary.row_of(word)
+
+    def word_at(self, row: int) -> str:
+        return self._vocabulary.word_at(row)
+
+    def row_vector(self, row: int) -> np.ndarray:
+        return np.asarray(self._matrix[row])
+
+    @property
+    def characters(self) -> CharacterIndex:
+        if self._characters is None:
+            # Model loads build this up front; indexes made by tools only pay for it if they filter.
+            self._characters = CharacterIndex.build(self._vocabulary)
+        return self._characters
+
+    def rows_containing_any(self, fragments: tuple[str, ...]) -> np.ndarray:
+        return self.characters.rows_containing_any(fragments)
+
+    @property
+    def shards(self) -> int:
+        return self._shard_pool.shards if self._shard_pool is not None else 1
+
+    def top_k(
+        self,
+        query: np.ndarray,
+        k: int,
+        timeout: float | None = None,
+        excluded_rows: np.ndarray | None = None,
+    ) -> list[tuple[float, int]]:
+        """Top-k rows by cosine. `timeout` (seconds) bounds the wait for shard workers, if sharded.
+
+        `excluded_rows` are masked out before selection, so up to k other rows come back from the same scan.
+        """
+        masks = None if excluded_rows is None else [excluded_rows]
+        return self.top_k_batch(np.asarray(query)[np.newaxis, :], k, timeout, masks)[0]
+
+    def top_k_batch(
+        self,
+        queries: np.ndarray,
+        k: int,
+        timeout: float | None = None,
+        excluded_rows: list[np.ndarray] | None = None,
+    ) -> list[list[tuple[float, int]]]:
+        """Top-k for several queries with one pass over the matrix instead of one pass per query.
+
+        `excluded_rows`, if given, holds one array of rows to mask per query.
+        """
+        if k <= 0 or self.size == 0 or len(queries) == 0:
+            return [[] for _ in range(len(queries))]
+        if excluded_rows is not None and not any(len(rows) for rows in excluded_rows):
+            excluded_rows = None
+        if self._shard_pool is not None:
+            try:
+                results = self._shard_pool.top_k_batch(
+                    str(self._matrix.filename), queries, k, timeout, excluded_rows
+                )
+                return results if excluded_rows is None else [_drop_masked(hits) for hits in results]
+            except ShardUnavailableError:
+                # A shard is being replaced; answer from this process rather than failing the request.
+                pass
+        scores = np.asarray(queries, dtype=np.float32) @ self._matrix.T
+        if excluded_rows is not None:
+            for row_scores, rows in zip(scores, excluded_rows):
+                row_scores[rows] = -np.inf
+        k = min(k, scores.shape[1])
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results: list[list[tuple[float, int]]] = []
+        for row_scores, row_candidates in zip(scores, candidates):
+            ordered = row_candidates[np.argsort(-row_scores[row_candidates], kind="stable")]
+            hits = [(float(row_scores[row]), int(row)) for row in ordered]
+            results.append(hits if excluded_rows is None else _drop_masked(hits))
+        return results
+
+    def nearest_words(
+        self,
+        query: np.ndarray,
+        k: int,
+        timeout: float | None = None,
+        excluded_rows: np.ndarray | None = None,
+    ) -> list[tuple[float, str]]:
+        return [
+            (score, self._vocabulary.word_at(row)) for score, row in self.top_k(query, k, timeout, excluded_rows)
+        ]
+
+    def nearest_words_batch(
+        self,
+        queries: np.ndarray,
+        k: int,
+        timeout: float | None = None,
+        excluded_rows: list[np.ndarray] | None = None,
+    ) -> list[list[tuple[float, str]]]:
+        return [
+            [(score, self._vocabulary.word_at(row)) for score, row in hits]
+            for hits in self.top_k_batch(queries, k, timeout, excluded_rows)
+        ]
+
+
+def _drop_masked(hits: list[tuple[float, int]]) -> list[tuple[float, int]]:
+    # Only reachable when fewer than k rows survive the mask.
+    return [hit for hit in hits if hit[0] != -np.inf]
+
+
+def normalize(vector: np.ndarray) -> np.ndarray | None:
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    if norm == 0.0:
+        return None
+    return vector / norm
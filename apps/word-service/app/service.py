@@ -1,11 +1,40 @@
 from __future__ import annotations
 
+from concurrent.futures import Future
 from dataclasses import dataclass
 import math
+import sys
+import time
 from typing import Any
 
+import numpy as np
+
+from .cache import NeighborCache
+from .deadline import Deadline, SharedDeadline
 from .errors import ApiError
-from .model_loader import FastTextModelStore, ModelInfo
+from .inference_pool import InferencePool
+from .metrics import Metrics
+from .model_loader import LoadedModel, ModelInfo
+from .model_registry import ModelRegistry
+from .schemas import VectorQuery, WeightedWord
+from .search_engine import normalize
+from .single_flight import SingleFlight
+
+
+# Warm-up caches this many times k unfiltered neighbors per word, so a request that excludes a few fragments
+# (callers always exclude their own team's words) can still be answered from the warmed list.
+_WARM_UP_HEADROOM = 2
+# An exact-search cost sample loses half its weight every this many seconds, so one slow scan cannot pin a
+# tier to the low-dim path: the estimate falls back under the budget and the next exact search re-measures.
+_SEARCH_COST_HALF_LIFE_SECONDS = 10.0
+
+
+def contains_hanzi(word: str) -> bool:
+    """Whether `word` has a CJK unified ideograph; only such words are ever returned as neighbors."""
+    for ch in word:
+        if "\u4e00" <= ch <= "\u9fff":
+            return True
+    return False
 
 
 @dataclass(frozen=True)
@@ -14,42 +43,479 @@ class NeighborItem:
     score: float
 
 
+def without_fragments(items: list[NeighborItem], fragments: tuple[str, ...]) -> list[NeighborItem]:
+    if not fragments:
+        return items
+    return [item for item in items if not any(fragment in item.word for fragment in fragments)]
+
+
+def neighbor_list_bytes(neighbors: list[NeighborItem]) -> int:
+    """Approximate heap bytes of a neighbor list: the list, each item with its attribute dict, word and score."""
+    if not neighbors:
+        return sys.getsizeof(neighbors)
+    sample = neighbors[0]
+    per_item = sys.getsizeof(sample) + sys.getsizeof(sample.__dict__) + sys.getsizeof(sample.score)
+    return sys.getsizeof(neighbors) + sum(per_item + sys.getsizeof(item.word) for item in neighbors)
+
+
 @dataclass(frozen=True)
 class RelatedWordsResult:
     word: str
     k: int
     neighbors: list[NeighborItem]
+    tier: str
+    model: ModelInfo
+    path: str
+
+
+@dataclass(frozen=True)
+class VectorQueryResult:
+    neighbors: list[list[NeighborItem]]
+    k: int
+    tier: str
+    model: ModelInfo
+
+
+@dataclass(frozen=True)
+class ConsistencyScoreResult:
+    score: float
+    tier: str
     model: ModelInfo
 
 
 class RelatedWordsService:
-    def __init__(self, model_store: FastTextModelStore) -> None:
-        self._model_store = model_store
+    def __init__(
+        self,
+        model_registry: ModelRegistry,
+        metrics: Metrics,
+        inference_pool: InferencePool,
+        neighbor_cache_size: int,
+        neighbor_cache_ttl_seconds: float = 0.0,
+    ) -> None:
+        self._model_registry = model_registry
+        self._metrics = metrics
+        self._inference_pool = inference_pool
+        self._neighbor_cache: NeighborCache[list[NeighborItem]] = NeighborCache(
+            neighbor_cache_size,
+            ttl_seconds=neighbor_cache_ttl_seconds,
+            size_of=neighbor_list_bytes,
+        )
+        self._single_flight: SingleFlight[list[NeighborItem]] = SingleFlight()
+        metrics.register_gauge("neighbor_cache.bytes", lambda: self._neighbor_cache.nbytes)
+        metrics.register_gauge("neighbor_cache.evicted_for_memory", lambda: self._neighbor_cache.byte_evictions)
+        self._search_cost_ms: dict[str, tuple[float, float]] = {}
+        for tier, model_store in model_registry.items():
+            model_store.add_swap_listener(
+                lambda previous, current, tier=tier: self._on_model_swapped(tier, previous, current)
+            )
 
-    def find_related_words(self, word: str, k: int) -> RelatedWordsResult:
-        model = self._model_store.get_model_or_none()
-        if model is None:
-            reason = self._model_store.load_error or "model not loaded"
-            raise ApiError("MODEL_UNAVAILABLE", reason, 503)
+    @property
+    def neighbor_cache_size(self) -> int:
+        return len(self._neighbor_cache)
 
+    @property
+    def neighbor_cache_capacity(self) -> int:
+        return self._neighbor_cache.max_entries
+
+    @property
+    def neighbor_cache_bytes(self) -> int:
+        return self._neighbor_cache.nbytes
+
+    def limit_neighbor_cache_bytes(self, max_bytes: int | None) -> int:
+        """Bound the neighbor cache in bytes (None lifts the bound). Returns the entries evicted."""
+        return self._neighbor_cache.limit_bytes(max_bytes)
+
+    def warm_neighbor_cache(self, tier: str, snapshot: LoadedModel, words: list[str], k: int) -> int:
+        """Compute and cache unfiltered neighbors for `words` in one batched scan. Returns the entries added.
+
+        Each entry holds up to `_WARM_UP_HEADROOM * k` neighbors under the key for `k`: plain lookups read the
+        first k, fragment-filtered lookups filter the whole list (see `_cached_neighbors`).
+        """
+        version = snapshot.info.version
+        # Words the precomputed table answers never reach the cache; their entries would only take its room.
+        missing = [
+            word
+            for word in words
+            if self._table_neighbors(snapshot, word, k) is None
+            and self._neighbor_cache.get((tier, version, word, k, ())) is None
+        ]
+        added = 0
+        for word, neighbors in zip(missing, self.search_neighbors_batch(snapshot, missing, k * _WARM_UP_HEADROOM)):
+            # A short list would need the over-fetch retry of a live search; leave that word to it.
+            if len(neighbors) >= k:
+                self._neighbor_cache.put((tier, version, word, k, ()), neighbors)
+                added += 1
+        return added
+
+    def _on_model_swapped(self, tier: str, previous: ModelInfo | None, _current: ModelInfo) -> None:
+        # Keyed by tier too: two tiers may serve the same file, and swapping one must not empty the other.
+        if previous is not None:
+            self._neighbor_cache.invalidate_model(tier, previous.version)
+
+    def find_related_words(
+        self,
+        word: str,
+        k: int,
+        tier: str | None = None,
+        deadline: Deadline | None = None,
+        exclude_containing: tuple[str, ...] = (),
+    ) -> RelatedWordsResult:
+        """Neighbors of `word`; words containing any `exclude_containing` fragment are masked out of the scan."""
+        tier = self._model_registry.resolve_tier(tier)
+        started = time.perf_counter()
+        if deadline is not None and deadline.expired:
+            # Nobody is waiting for this answer any more; do not spend CPU on it.
+            self._metrics.increment("related_words.deadline_dropped")
+            raise ApiError("DEADLINE_EXCEEDED", "request deadline passed before work started", 504)
+
+        snapshot = self.require_snapshot(tier)
+        table_neighbors = self._table_neighbors(snapshot, word, k, exclude_containing)
+        if table_neighbors is not None:
+            self._metrics.increment("related_words.path.table")
+            self._observe_latency("related_words", tier, started)
+            return RelatedWordsResult(
+                word=word,
+                k=k,
+                neighbors=table_neighbors,
+                tier=tier,
+                model=snapshot.info,
+                path="table",
+            )
+
+        answer_tier, answer_snapshot, path = self._choose_path(tier, snapshot, word, k, exclude_containing, deadline)
+        neighbors = (
+            self._cached_neighbors(answer_tier, answer_snapshot.info.version, word, k, exclude_containing)
+            if path == "cache"
+            else None
+        )
+        if neighbors is None:
+            if path == "cache":
+                # Evicted between path selection and lookup.
+                path = "exact" if answer_tier == tier else "low_dim"
+            neighbors = self._compute_neighbors_coalesced(
+                answer_tier, answer_snapshot, word, k, exclude_containing, deadline
+            )
+
+        self._metrics.increment(f"related_words.path.{path}")
+        self._observe_latency("related_words", answer_tier, started)
+        return RelatedWordsResult(
+            word=word,
+            k=k,
+            neighbors=neighbors,
+            tier=answer_tier,
+            model=answer_snapshot.info,
+            path=path,
+        )
+
+    def _cached_neighbors(
+        self,
+        tier: str,
+        version: str,
+        word: str,
+        k: int,
+        exclude_containing: tuple[str, ...],
+    ) -> list[NeighborItem] | None:
+        """Cached neighbors for the query, or None.
+
+        A filtered query without its own entry is answered from the unfiltered entry of the same word and k if
+        at least k neighbors survive the filter, which is what makes warm-up pay off for real callers.
+        """
+        neighbors = self._neighbor_cache.get((tier, version, word, k, exclude_containing))
+        if neighbors is not None:
+            return neighbors[:k]
+        if not exclude_containing:
+            return None
+        unfiltered = self._neighbor_cache.get((tier, version, word, k, ()))
+        if unfiltered is None:
+            return None
+        filtered = without_fragments(unfiltered, exclude_containing)
+        if len(filtered) < k:
+            self._metrics.increment("neighbor_cache.filtered_short")
+            return None
+        return filtered[:k]
+
+    @staticmethod
+    def _table_neighbors(
+        snapshot: LoadedModel,
+        word: str,
+        k: int,
+        exclude_containing: tuple[str, ...] = (),
+    ) -> list[NeighborItem] | None:
+        """Neighbors from the precomputed word-bank table, or None if the table cannot answer this query.
+
+        Excluded fragments are filtered out of the stored list; if fewer than k neighbors survive, only a live
+        scan (which masks them before selection) can fill the list.
+        """
+        table = snapshot.neighbor_table
+        if table is None or k > table.k:
+            return None
+        row = snapshot.index.row_of(word)
+        entry = table.lookup(row) if row is not None else None
+        if entry is None:
+            return None
+        neighbor_rows, scores = entry
         neighbors: list[NeighborItem] = []
+        for neighbor_row, score in zip(neighbor_rows.tolist(), scores.tolist()):
+            neighbor_word = snapshot.index.word_at(neighbor_row)
+            if any(fragment in neighbor_word for fragment in exclude_containing):
+                continue
+            neighbors.append(NeighborItem(word=neighbor_word, score=score))
+            if len(neighbors) == k:
+                return neighbors
+        return None
+
+    def _compute_neighbors_coalesced(
+        self,
+        tier: str,
+        snapshot: LoadedModel,
+        word: str,
+        k: int,
+        exclude_containing: tuple[str, ...],
+        deadline: Deadline | None,
+    ) -> list[NeighborItem]:
+        cache_key = (tier, snapshot.info.version, word, k, exclude_containing)
+
+        def start(shared_deadline: SharedDeadline) -> "Future[list[NeighborItem]]":
+            def compute() -> list[NeighborItem]:
+                # A leader that lost the race with a just-finished computation can reuse its result.
+                cached = self._cached_neighbors(tier, snapshot.info.version, word, k, exclude_containing)
+                if cached is not None:
+                    return cached
+                # Timed inside the worker: queue wait says nothing about how long the scan itself takes.
+                scan_started = time.perf_counter()
+                neighbors = self._search_neighbors(snapshot, word, k, shared_deadline, exclude_containing)
+                self._record_search_cost(tier, scan_started)
+                self._neighbor_cache.put(cache_key, neighbors)
+                return neighbors
+
+            return self._inference_pool.submit(compute, shared_deadline)
+
+        while True:
+            try:
+                neighbors, shared = self._single_flight.do(cache_key, start, deadline)
+            except TimeoutError:
+                self._metrics.increment("related_words.deadline_dropped")
+                raise ApiError("DEADLINE_EXCEEDED", "request deadline passed while waiting for search", 504) from None
+            except ApiError as error:
+                # The shared work only expires once every waiter's deadline has; a caller that joined just as
+                # it was dropped still has time, so it starts a fresh computation instead of inheriting the 504.
+                if error.code == "DEADLINE_EXCEEDED" and (deadline is None or not deadline.expired):
+                    continue
+                raise
+            break
+        self._metrics.increment("related_words.coalesced" if shared else "related_words.computed")
+        return neighbors
+
+    def _choose_path(
+        self,
+        tier: str,
+        snapshot: LoadedModel,
+        word: str,
+        k: int,
+        exclude_containing: tuple[str, ...],
+        deadline: Deadline | None,
+    ) -> tuple[str, LoadedModel, str]:
+        """Pick the cheapest way to answer that still fits the deadline: cache, low-dim tier, exact search."""
+        if self._cached_neighbors(tier, snapshot.info.version, word, k, exclude_containing) is not None:
+            return tier, snapshot, "cache"
+        if deadline is None:
+            return tier, snapshot, "exact"
+
+        remaining_ms = deadline.remaining_ms()
+        if self._estimated_search_cost_ms(tier) <= remaining_ms:
+            return tier, snapshot, "exact"
+
+        low_dim = self._low_dim_snapshot(snapshot.info.dimension)
+        if low_dim is None:
+            # Nothing cheaper is resident; a late exact answer still beats the caller's fallback clue.
+            return tier, snapshot, "exact"
+        low_dim_tier, low_dim_snapshot = low_dim
+        if self._cached_neighbors(low_dim_tier, low_dim_snapshot.info.version, word, k, exclude_containing) is not None:
+            return low_dim_tier, low_dim_snapshot, "cache"
+        return low_dim_tier, low_dim_snapshot, "low_dim"
+
+    def _low_dim_snapshot(self, dimension: int) -> tuple[str, LoadedModel] | None:
+        best: tuple[str, LoadedModel] | None = None
+        for candidate_tier, model_store in self._model_registry.items():
+            candidate = model_store.get_snapshot_or_none()
+            if candidate is None or candidate.info.dimension >= dimension:
+                continue
+            if best is None or candidate.info.dimension < best[1].info.dimension:
+                best = (candidate_tier, candidate)
+        return best
+
+    def _estimated_search_cost_ms(self, tier: str) -> float:
+        sample = self._search_cost_ms.get(tier)
+        if sample is None:
+            return 0.0
+        cost_ms, recorded_at = sample
+        return cost_ms * 0.5 ** ((time.monotonic() - recorded_at) / _SEARCH_COST_HALF_LIFE_SECONDS)
+
+    def _record_search_cost(self, tier: str, started: float) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        previous = self._estimated_search_cost_ms(tier) if tier in self._search_cost_ms else None
+        # EWMA keeps the estimate responsive to load without chasing single outliers.
+        cost_ms = elapsed_ms if previous is None else previous * 0.8 + elapsed_ms * 0.2
+        self._search_cost_ms[tier] = (cost_ms, time.monotonic())
+
+    def _search_neighbors(
+        self,
+        snapshot: LoadedModel,
+        word: str,
+        k: int,
+        deadline: Deadline | SharedDeadline | None = None,
+        exclude_containing: tuple[str, ...] = (),
+    ) -> list[NeighborItem]:
+        query = snapshot.query_vector(word)
+        neighbors: list[NeighborItem] = []
+        excluded_rows: np.ndarray | None = None
+        if exclude_containing and query is not None:
+            # Masked before selection, so excluded words do not eat into the over-fetch margin.
+            excluded_rows = snapshot.index.rows_containing_any(exclude_containing)
+            query_row = snapshot.index.row_of(word)
+            if query_row is not None:
+                excluded_rows = np.union1d(excluded_rows, [query_row])
         target_size = k
         requested_k = max(target_size + 5, target_size * 2)
         max_requested_k = max(200, target_size * 10)
 
-        # fastText may return the query word itself; we over-fetch and filter.
-        while len(neighbors) < target_size and requested_k <= max_requested_k:
-            raw_neighbors: list[tuple[float, str]] = model.get_nearest_neighbors(word, k=requested_k)
+        # The index may return the query word itself; we over-fetch and filter.
+        while query is not None and len(neighbors) < target_size and requested_k <= max_requested_k:
+            remaining_ms = math.inf if deadline is None else deadline.remaining_ms()
+            timeout = max(remaining_ms, 0.0) / 1000.0 if math.isfinite(remaining_ms) else None
+            try:
+                raw_neighbors = snapshot.index.nearest_words(query, requested_k, timeout, excluded_rows)
+            except TimeoutError:
+                raise ApiError(
+                    "DEADLINE_EXCEEDED",
+                    "request deadline passed while waiting for search shards",
+                    504,
+                ) from None
             neighbors = self._normalize_neighbors(raw_neighbors, query_word=word, k=target_size)
             if len(neighbors) >= target_size:
                 break
             requested_k *= 2
 
-        model_info = self._model_store.get_model_info_or_none()
-        if model_info is None:
-            raise ApiError("MODEL_UNAVAILABLE", "model metadata unavailable", 503)
+        return neighbors
+
+    def search_neighbors_batch(self, snapshot: LoadedModel, words: list[str], k: int) -> list[list[NeighborItem]]:
+        """Neighbors for several words from one batched scan; used by background prefetch jobs.
 
-        return RelatedWordsResult(word=word, k=target_size, neighbors=neighbors, model=model_info)
+        Words the precomputed table covers are answered from it and left out of the scan.
+        """
+        results: list[list[NeighborItem]] = [[] for _ in words]
+        queries: list[np.ndarray | None] = []
+        for index, word in enumerate(words):
+            table_neighbors = self._table_neighbors(snapshot, word, k)
+            if table_neighbors is not None:
+                results[index] = table_neighbors
+                queries.append(None)
+            else:
+                queries.append(snapshot.query_vector(word))
+        present = [index for index, query in enumerate(queries) if query is not None]
+        if not present:
+            return results
+
+        requested_k = max(k + 5, k * 2)
+        batch = np.stack([queries[index] for index in present])
+        for index, raw_neighbors in zip(present, snapshot.index.nearest_words_batch(batch, requested_k)):
+            results[index] = self._normalize_neighbors(raw_neighbors, query_word=words[index], k=k)
+        return results
+
+    def query_vectors(
+        self,
+        queries: list[VectorQuery],
+        k: int,
+        tier: str | None = None,
+        deadline: Deadline | None = None,
+    ) -> VectorQueryResult:
+        """Neighbors of weighted positive-minus-negative word combinations, all answered by one matrix scan."""
+        tier = self._model_registry.resolve_tier(tier)
+        started = time.perf_counter()
+        if deadline is not None and deadline.expired:
+            self._metrics.increment("vector_query.deadline_dropped")
+            raise ApiError("DEADLINE_EXCEEDED", "request deadline passed before work started", 504)
+        snapshot = self.require_snapshot(tier)
+
+        def compute() -> list[list[NeighborItem]]:
+            return self._search_vector_queries(snapshot, queries, k, deadline)
+
+        future = self._inference_pool.submit(compute, deadline)
+        remaining_ms = math.inf if deadline is None else deadline.remaining_ms()
+        try:
+            neighbors = future.result(timeout=max(remaining_ms, 0.0) / 1000.0 if math.isfinite(remaining_ms) else None)
+        except TimeoutError:
+            self._metrics.increment("vector_query.deadline_dropped")
+            raise ApiError("DEADLINE_EXCEEDED", "request deadline passed while waiting for search", 504) from None
+
+        self._metrics.increment("vector_query.queries", len(queries))
+        self._observe_latency("vector_query", tier, started)
+        return VectorQueryResult(neighbors=neighbors, k=k, tier=tier, model=snapshot.info)
+
+    def _search_vector_queries(
+        self,
+        snapshot: LoadedModel,
+        queries: list[VectorQuery],
+        k: int,
+        deadline: Deadline | None,
+    ) -> list[list[NeighborItem]]:
+        vectors: list[np.ndarray] = []
+        masks: list[np.ndarray] = []
+        present: list[int] = []
+        for index, query in enumerate(queries):
+            combined = self._combine_query_vector(snapshot, query)
+            if combined is None:
+                continue
+            # The input words themselves are the trivial answer to every analogy; mask them like the fragments.
+            input_rows = [snapshot.index.row_of(item.word) for item in query.positive + query.negative]
+            masks.append(
+                np.union1d(
+                    snapshot.index.rows_containing_any(query.exclude_containing),
+                    [row for row in input_rows if row is not None],
+                ).astype(np.int64)
+            )
+            vectors.append(combined)
+            present.append(index)
+
+        results: list[list[NeighborItem]] = [[] for _ in queries]
+        if not present:
+            return results
+        remaining_ms = math.inf if deadline is None else deadline.remaining_ms()
+        timeout = max(remaining_ms, 0.0) / 1000.0 if math.isfinite(remaining_ms) else None
+        requested_k = max(k + 5, k * 2)
+        try:
+            raw_lists = snapshot.index.nearest_words_batch(np.stack(vectors), requested_k, timeout, masks)
+        except TimeoutError:
+            raise ApiError("DEADLINE_EXCEEDED", "request deadline passed while waiting for search shards", 504) from None
+        for index, raw_neighbors in zip(present, raw_lists):
+            results[index] = self._normalize_neighbors(raw_neighbors, query_word="", k=k)
+        return results
+
+    @staticmethod
+    def _combine_query_vector(snapshot: LoadedModel, query: VectorQuery) -> np.ndarray | None:
+        """Weighted sum of unit word vectors, positives added and negatives subtracted, renormalized."""
+
+        def weighted_sum(items: list[WeightedWord]) -> np.ndarray:
+            total = np.zeros(snapshot.info.dimension, dtype=np.float32)
+            for item in items:
+                vector = snapshot.query_vector(item.word)
+                if vector is not None:
+                    total += item.weight * vector
+            return total
+
+        return normalize(weighted_sum(query.positive) - weighted_sum(query.negative))
+
+    def require_snapshot(self, tier: str) -> LoadedModel:
+        # Read the model reference once per request so a concurrent hot swap cannot mix two models.
+        model_store = self._model_registry.get_store(tier)
+        snapshot = model_store.get_snapshot_or_none()
+        if snapshot is None:
+            reason = model_store.load_error or "model not loaded"
+            raise ApiError("MODEL_UNAVAILABLE", reason, 503)
+        return snapshot
+
+    def _observe_latency(self, operation: str, tier: str, started: float) -> None:
+        self._metrics.observe_ms(f"{operation}.{tier}", (time.perf_counter() - started) * 1000.0)
 
     @staticmethod
     def _normalize_neighbors(
@@ -61,7 +527,7 @@ class RelatedWordsService:
         for score, neighbor_word in raw_neighbors:
             if neighbor_word == query_word:
                 continue
-            if not RelatedWordsService._contains_hanzi(neighbor_word):
+            if not contains_hanzi(neighbor_word):
                 continue
             if neighbor_word in dedup and dedup[neighbor_word] >= score:
                 continue
@@ -70,18 +536,11 @@ class RelatedWordsService:
         sorted_items = sorted(dedup.items(), key=lambda item: item[1], reverse=True)[:k]
         return [NeighborItem(word=item_word, score=float(item_score)) for item_word, item_score in sorted_items]
 
-    @staticmethod
-    def _contains_hanzi(word: str) -> bool:
-        for ch in word:
-            if "\u4e00" <= ch <= "\u9fff":
-                return True
-        return False
-
-    def calculate_consistency_score(self, words: list[str]) -> float:
-        model = self._model_store.get_model_or_none()
-        if model is None:
-            reason = self._model_store.load_error or "model not loaded"
-            raise ApiError("MODEL_UNAVAILABLE", reason, 503)
+    def calculate_consistency_score(self, words: list[str], tier: str | None = None) -> ConsistencyScoreResult:
+        tier = self._model_registry.resolve_tier(tier)
+        started = time.perf_counter()
+        snapshot = self.require_snapshot(tier)
+        model = snapshot.model
 
         vectors = [model.get_word_vector(word) for word in words]
         pair_scores: list[float] = []
@@ -94,7 +553,12 @@ class RelatedWordsService:
         if not pair_scores:
             raise ApiError("INVALID_ARGUMENT", "at least two words are required", 400)
 
-        return float(sum(pair_scores) / len(pair_scores))
+        self._observe_latency("consistency_score", tier, started)
+        return ConsistencyScoreResult(
+            score=float(sum(pair_scores) / len(pair_scores)),
+            tier=tier,
+            model=snapshot.info,
+        )
 
     @staticmethod
     def _cosine_similarity(vec_a: Any, vec_b: Any) -> float:
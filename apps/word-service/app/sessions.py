@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import threading
+import time
+import uuid
+
+import numpy as np
+
+from .deadline import Deadline
+from .errors import ApiError
+from .inference_pool import InferencePool
+from .metrics import Metrics
+from .model_loader import LoadedModel, ModelInfo
+from .model_registry import ModelRegistry
+from .service import NeighborItem, RelatedWordsResult, RelatedWordsService, neighbor_list_bytes, without_fragments
+
+
+@dataclass(frozen=True)
+class SessionWordEntry:
+    word: str
+    neighbors: list[NeighborItem]
+    clue_candidates: list[NeighborItem]
+    vector: np.ndarray | None
+
+
+@dataclass
+class PrefetchSession:
+    session_id: str
+    room_id: str | None
+    words: list[str]
+    k: int
+    tier: str
+    created_at: int
+    expires_at: float
+    status: str = "pending"
+    error: str | None = None
+    model: ModelInfo | None = None
+    building_version: str | None = None
+    entries: dict[str, SessionWordEntry] = field(default_factory=dict)
+    # Approximate heap bytes of `entries`, set when a build finishes.
+    nbytes: int = 0
+
+    @property
+    def is_ready(self) -> bool:
+        return self.status == "ready"
+
+
+@dataclass(frozen=True)
+class ClueCandidatesResult:
+    word: str
+    k: int
+    candidates: list[NeighborItem]
+    tier: str
+    model: ModelInfo
+    path: str
+
+
+@dataclass(frozen=True)
+class GuessScoresResult:
+    clues: list[str]
+    candidates: list[str]
+    scores: list[list[float]]
+    tier: str
+    model: ModelInfo
+
+
+def is_leaky_clue(candidate: str, secret_words: list[str]) -> bool:
+    # A clue that contains a secret word (or is part of one) gives the answer away.
+    return any(secret in candidate or candidate in secret for secret in secret_words)
+
+
+class SessionStore:
+    """TTL + LRU bounded map of prefetch sessions."""
+
+    def __init__(self, max_sessions: int, ttl_seconds: float) -> None:
+        self._max_sessions = max_sessions
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._sessions: OrderedDict[str, PrefetchSession] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @property
+    def ttl_seconds(self) -> float:
+        return self._ttl_seconds
+
+    @property
+    def nbytes(self) -> int:
+        with self._lock:
+            return sum(session.nbytes for session in self._sessions.values())
+
+    def add(self, session: PrefetchSession) -> None:
+        with self._lock:
+            self._sessions[session.session_id] = session
+            self._evict_locked()
+
+    def get(self, session_id: str) -> PrefetchSession | None:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if session.expires_at <= time.monotonic():
+                del self._sessions[session_id]
+                return None
+            # Every use extends the session, so an active game never loses its prefetched data.
+            session.expires_at = time.monotonic() + self._ttl_seconds
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def _evict_locked(self) -> None:
+        now = time.monotonic()
+        expired = [session_id for session_id, session in self._sessions.items() if session.expires_at <= now]
+        for session_id in expired:
+            del self._sessions[session_id]
+        while len(self._sessions) > self._max_sessions:
+            self._sessions.popitem(last=False)
+
+
+class PrefetchSessionService:
+    """Precomputes neighbors, clue candidates and vectors for a room's secret words in one background batch."""
+
+    def __init__(
+        self,
+        model_registry: ModelRegistry,
+        related_words_service: RelatedWordsService,
+        inference_pool: InferencePool,
+        metrics: Metrics,
+        session_store: SessionStore,
+    ) -> None:
+        self._model_registry = model_registry
+        self._related_words_service = related_words_service
+        self._inference_pool = inference_pool
+        self._metrics = metrics
+        self._sessions = session_store
+        metrics.register_gauge("sessions.active", lambda: len(self._sessions))
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._sessions.nbytes
+
+    def create_session(self, words: list[str], k: int, tier: str | None, room_id: str | None) -> PrefetchSession:
+        tier = self._model_registry.resolve_tier(tier)
+        snapshot = self._related_words_service.require_snapshot(tier)
+        session = PrefetchSession(
+            session_id=uuid.uuid4().hex,
+            room_id=room_id,
+            words=words,
+            k=k,
+            tier=tier,
+            created_at=int(time.time() * 1000),
+            expires_at=time.monotonic() + self._sessions.ttl_seconds,
+        )
+        self._start_build(session, snapshot)
+        self._sessions.add(session)
+        self._metrics.increment("sessions.created")
+        return session
+
+    def _start_build(self, session: PrefetchSession, snapshot: LoadedModel) -> None:
+        words = session.words
+        k = session.k
+        session.building_version = snapshot.info.version
+
+        def build() -> None:
+            started = time.perf_counter()
+            # Over-fetch so the leak filter still leaves k clue candidates per word.
+            neighbor_lists = self._related_words_service.search_neighbors_batch(snapshot, words, k * 3)
+            entries: dict[str, SessionWordEntry] = {}
+            for word, neighbors in zip(words, neighbor_lists):
+                vector = snapshot.query_vector(word)
+                entries[word] = SessionWordEntry(
+                    word=word,
+                    neighbors=neighbors[:k],
+                    clue_candidates=[item for item in neighbors if not is_leaky_clue(item.word, words)][:k],
+                    vector=np.array(vector) if vector is not None else None,
+                )
+            session.entries = entries
+            session.nbytes = sum(
+                neighbor_list_bytes(entry.neighbors)
+                + neighbor_list_bytes(entry.clue_candidates)
+                + (entry.vector.nbytes if entry.vector is not None else 0)
+                for entry in entries.values()
+            )
+            session.model = snapshot.info
+            session.status = "ready"
+            self._metrics.observe_ms(f"sessions.build.{session.tier}", (time.perf_counter() - started) * 1000.0)
+
+        future = self._inference_pool.submit(build)
+        future.add_done_callback(lambda done: self._on_build_done(session, done.exception()))
+
+    def _on_build_done(self, session: PrefetchSession, error: BaseException | None) -> None:
+        if error is None:
+            return
+        session.status = "failed"
+        session.error = str(error)
+        self._metrics.increment("sessions.failed")
+
+    def _current_entry(self, session: PrefetchSession, word: str) -> SessionWordEntry | None:
+        """The prefetched entry for `word`, or None if it is missing or was built by a model since swapped out."""
+        entry = session.entries.get(word) if session.is_ready else None
+        if entry is None or session.model is None:
+            return None
+        snapshot = self._model_registry.get_store(session.tier).get_snapshot_or_none()
+        if snapshot is None or snapshot.info == session.model:
+            return entry
+        # Hot swap since the build: never serve old-model neighbors under the old version. Rebuild once per
+        # new version in the background; until then callers fall back to live search.
+        if session.building_version != snapshot.info.version:
+            self._metrics.increment("sessions.rebuilt")
+            try:
+                self._start_build(session, snapshot)
+            except ApiError:
+                # Inference queue full: a later lookup retries the rebuild.
+                session.building_version = None
+        return None
+
+    def get_session(self, session_id: str) -> PrefetchSession:
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise ApiError("SESSION_NOT_FOUND", f"session not found or expired: {session_id}", 404)
+        return session
+
+    def find_related_words(
+        self,
+        session_id: str,
+        word: str,
+        k: int,
+        exclude_containing: tuple[str, ...] = (),
+    ) -> RelatedWordsResult | None:
+        """Answer from session memory, or None so the caller falls back to a live query."""
+        session = self._sessions.get(session_id)
+        entry = self._current_entry(session, word) if session is not None else None
+        neighbors = without_fragments(entry.neighbors, exclude_containing) if entry is not None else []
+        if session is None or entry is None or session.model is None or k > len(neighbors):
+            self._metrics.increment("sessions.miss")
+            return None
+        self._metrics.increment("sessions.hit")
+        return RelatedWordsResult(
+            word=word,
+            k=k,
+            neighbors=neighbors[:k],
+            tier=session.tier,
+            model=session.model,
+            path="session",
+        )
+
+    def find_clue_candidates(
+        self,
+        session_id: str,
+        word: str,
+        k: int,
+        exclude_containing: tuple[str, ...] = (),
+        deadline: Deadline | None = None,
+    ) -> ClueCandidatesResult:
+        """Leak-filtered clue candidates for `word`; a miss searches live under the caller's `deadline`."""
+        session = self.get_session(session_id)
+        entry = self._current_entry(session, word)
+        candidates = without_fragments(entry.clue_candidates, exclude_containing) if entry is not None else []
+        if entry is not None and session.model is not None and k <= min(session.k, len(candidates)):
+            self._metrics.increment("sessions.hit")
+            return ClueCandidatesResult(
+                word=word,
+                k=k,
+                candidates=candidates[:k],
+                tier=session.tier,
+                model=session.model,
+                path="session",
+            )
+
+        # Not prefetched (or still building): search live, but apply the same leak filter. Words containing a
+        # secret are masked in the scan itself; only clues that are part of a secret are left to filter here.
+        self._metrics.increment("sessions.miss")
+        result = self._related_words_service.find_related_words(
+            word,
+            k * 2,
+            tier=session.tier,
+            deadline=deadline,
+            exclude_containing=tuple(sorted(set(exclude_containing) | set(session.words))),
+        )
+        return ClueCandidatesResult(
+            word=word,
+            k=k,
+            candidates=[item for item in result.neighbors if not is_leaky_clue(item.word, session.words)][:k],
+            tier=result.tier,
+            model=result.model,
+            path=result.path,
+        )
+
+    def score_guess(self, session_id: str, clues: list[str], candidates: list[str] | None) -> GuessScoresResult:
+        """Cosine similarity of every clue against every candidate secret word."""
+        session = self.get_session(session_id)
+        candidate_words = candidates if candidates is not None else session.words
+        snapshot = self._related_words_service.require_snapshot(session.tier)
+
+        def vector_of(word: str) -> np.ndarray:
+            entry = session.entries.get(word)
+            # Prefetched vectors are only reused while the model that produced them is still current.
+            if entry is not None and entry.vector is not None and session.model == snapshot.info:
+                return entry.vector
+            vector = snapshot.query_vector(word)
+            return vector if vector is not None else np.zeros(snapshot.info.dimension, dtype=np.float32)
+
+        clue_matrix = np.stack([vector_of(word) for word in clues])
+        candidate_matrix = np.stack([vector_of(word) for word in candidate_words])
+        scores = np.clip(clue_matrix @ candidate_matrix.T, 0.0, 1.0)
+        return GuessScoresResult(
+            clues=clues,
+            candidates=candidate_words,
+            scores=[[float(value) for value in row] for row in scores],
+            tier=session.tier,
+            model=snapshot.info,
+        )
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import itertools
+import multiprocessing
+from multiprocessing.connection import Connection
+import threading
+
+import numpy as np
+
+
+# Mapped matrices kept open per worker: the current model of each tier plus one being swapped in.
+_MAX_MAPPED_MATRICES = 4
+# A shard that has not answered a query within this long is treated as hung and replaced.
+_SHARD_HANG_SECONDS = 5.0
+
+
+class ShardUnavailableError(RuntimeError):
+    """A shard died, hung or failed the scan; the caller should answer with an in-process scan instead."""
+
+
+@dataclass
+class _Shard:
+    index: int
+    process: multiprocessing.process.BaseProcess
+    connection: Connection
+    send_lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+@dataclass
+class _PendingQuery:
+    waiting: set[int]
+    scores: list[np.ndarray] = field(default_factory=list)
+    rows: list[np.ndarray] = field(default_factory=list)
+    error: str | None = None
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+def _local_top_k(scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        empty = np.empty((scores.shape[0], 0))
+        return empty.astype(np.float32), empty.astype(np.int64)
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return np.take_along_axis(scores, candidates, axis=1), candidates
+
+
+def _run_shard_worker(connection: Connection, shard: int, shards: int) -> None:
+    """Serve top-k queries for rows [shard/shards, (shard+1)/shards) of whichever matrix file is named."""
+    mapped: OrderedDict[str, np.ndarray] = OrderedDict()
+    while True:
+        try:
+            message = connection.recv()
+        except (EOFError, OSError):
+            # The coordinator closed its end (shutdown or replacement): exit quietly.
+            return
+        if message is None:
+            return
+        query_id, matrix_path, queries, k, excluded_rows = message
+        try:
+            matrix = mapped.get(matrix_path)
+            if matrix is None:
+                # The same cache file the coordinator maps: shard rows come from the shared page cache.
+                matrix = np.load(matrix_path, mmap_mode="r")
+                mapped[matrix_path] = matrix
+                while len(mapped) > _MAX_MAPPED_MATRICES:
+                    mapped.popitem(last=False)
+            mapped.move_to_end(matrix_path)
+            start = matrix.shape[0] * shard // shards
+            end = matrix.shape[0] * (shard + 1) // shards
+            scores = queries @ matrix[start:end].T
+            if excluded_rows is not None:
+                for row_scores, rows in zip(scores, excluded_rows):
+                    row_scores[rows[(rows >= start) & (rows < end)] - start] = -np.inf
+            scores, rows = _local_top_k(scores, k)
+            reply = (query_id, scores, rows + start, None)
+        except Exception as exc:  # noqa: BLE001
+            reply = (query_id, None, None, str(exc))
+        try:
+            connection.send(reply)
+        except OSError:
+            return
+
+
+class ShardedSearchPool:
+    """Exact top-k over row-range shards of a mapped word matrix, one worker process per shard.
+
+    A query is broadcast to every shard, each worker scans only its rows of the shared matrix file and returns
+    its local top-k, and the coordinator merges them. Scans run on separate cores instead of one core's
+    memory bandwidth bounding the whole matrix. A shard that exits or hangs is replaced in the background;
+    queries it was part of raise `ShardUnavailableError` so the caller can scan in-process meanwhile.
+    """
+
+    def __init__(self, shards: int) -> None:
+        if shards < 2:
+            raise ValueError("sharded search needs at least two shards")
+        # spawn: the parent already runs threads, which fork would copy in an undefined state.
+        self._context = multiprocessing.get_context("spawn")
+        self._shard_count = shards
+        self._query_ids = itertools.count()
+        self._pending: dict[int, _PendingQuery] = {}
+        self._pending_lock = threading.Lock()
+        self._shards_lock = threading.Lock()
+        self._closed = False
+        self.restarts = 0
+        self._shards = [self._start_shard(index) for index in range(shards)]
+
+    @property
+    def shards(self) -> int:
+        return self._shard_count
+
+    def _start_shard(self, index: int) -> _Shard:
+        parent_end, child_end = self._context.Pipe()
+        process = self._context.Process(
+            target=_run_shard_worker,
+            args=(child_end, index, self._shard_count),
+            name=f"search-shard-{index}",
+            daemon=True,
+        )
+        process.start()
+        child_end.close()
+        shard = _Shard(index=index, process=process, connection=parent_end)
+        threading.Thread(
+            target=self._receive_results,
+            args=(shard,),
+            name=f"search-shard-{index}-results",
+            daemon=True,
+        ).start()
+        return shard
+
+    def top_k_batch(
+        self,
+        matrix_path: str,
+        queries: np.ndarray,
+        k: int,
+        timeout: float | None = None,
+        excluded_rows: list[np.ndarray] | None = None,
+    ) -> list[list[tuple[float, int]]]:
+        """Merged top-k per query. Raises `TimeoutError` once `timeout` seconds pass without every shard's answer.
+
+        `excluded_rows` (global row ids, one array per query) are masked to -inf by each shard before its local
+        selection.
+        """
+        queries = np.ascontiguousarray(queries, dtype=np.float32)
+        query_id = next(self._query_ids)
+        pending = _PendingQuery(waiting=set(range(self._shard_count)))
+        with self._pending_lock:
+            self._pending[query_id] = pending
+        try:
+            for shard in list(self._shards):
+                try:
+                    with shard.send_lock:
+                        shard.connection.send((query_id, matrix_path, queries, k, excluded_rows))
+                except (OSError, ValueError):
+                    self._replace_shard(shard, "search shard connection is closed")
+                    raise ShardUnavailableError(f"search shard {shard.index} is unavailable") from None
+
+            wait_seconds = _SHARD_HANG_SECONDS if timeout is None else min(max(timeout, 0.0), _SHARD_HANG_SECONDS)
+            if not pending.done.wait(wait_seconds):
+                if timeout is not None and timeout < _SHARD_HANG_SECONDS:
+                    raise TimeoutError("deadline passed while waiting for search shards")
+                for index in sorted(pending.waiting):
+                    self._replace_shard(self._shards[index], "search shard did not answer in time")
+                raise ShardUnavailableError("search shards did not answer in time")
+        finally:
+            with self._pending_lock:
+                self._pending.pop(query_id, None)
+        if pending.error is not None:
+            raise ShardUnavailableError(pending.error)
+
+        # Merge: the global top-k is the top-k of the union of every shard's local top-k.
+        scores = np.concatenate(pending.scores, axis=1)
+        rows = np.concatenate(pending.rows, axis=1)
+        results: list[list[tuple[float, int]]] = []
+        for row_scores, row_ids in zip(scores, rows):
+            ordered = np.argsort(-row_scores, kind="stable")[:k]
+            results.append([(float(row_scores[index]), int(row_ids[index])) for index in ordered])
+        return results
+
+    def _receive_results(self, shard: _Shard) -> None:
+        while True:
+            try:
+                query_id, scores, rows, error = shard.connection.recv()
+            except (EOFError, OSError):
+                self._replace_shard(shard, "search shard exited")
+                return
+            with self._pending_lock:
+                pending = self._pending.get(query_id)
+                if pending is None:
+                    continue
+                if error is not None:
+                    pending.error = error
+                else:
+                    pending.scores.append(scores)
+                    pending.rows.append(rows)
+                pending.waiting.discard(shard.index)
+                if not pending.waiting or pending.error is not None:
+                    pending.done.set()
+
+    def _replace_shard(self, shard: _Shard, reason: str) -> None:
+        with self._shards_lock:
+            # Several threads can notice the same failure; only the first one respawns.
+            if self._closed or self._shards[shard.index] is not shard:
+                return
+            self._shards[shard.index] = self._start_shard(shard.index)
+            self.restarts += 1
+        shard.connection.close()
+        if shard.process.is_alive():
+            shard.process.kill()
+        # Queries that were waiting on the old shard will never hear from it.
+        with self._pending_lock:
+            for pending in self._pending.values():
+                if shard.index in pending.waiting:
+                    pending.error = reason
+                    pending.done.set()
+
+    def close(self) -> None:
+        with self._shards_lock:
+            self._closed = True
+        for shard in self._shards:
+            with shard.send_lock:
+                try:
+                    shard.connection.send(None)
+                except (OSError, ValueError):
+                    pass
+        for shard in self._shards:
+            shard.process.join(timeout=5)
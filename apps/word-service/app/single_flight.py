@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+import threading
+from typing import Callable, Generic, Hashable, TypeVar
+
+from .deadline import Deadline, SharedDeadline
+
+
+V = TypeVar("V")
+
+
+class _Call(Generic[V]):
+    def __init__(self, future: "Future[V]", deadline: SharedDeadline) -> None:
+        self.future = future
+        self.deadline = deadline
+
+
+class SingleFlight(Generic[V]):
+    """Coalesces concurrent calls for the same key onto one execution whose result fans out to all waiters."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call[V]] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def do(
+        self,
+        key: Hashable,
+        start: Callable[[SharedDeadline], "Future[V]"],
+        deadline: Deadline | None = None,
+    ) -> tuple[V, bool]:
+        """Start the work once per key at a time. Returns `(value, shared)`; `shared` is True for coalesced waiters.
+
+        `start` receives a deadline that lasts as long as the latest waiter's, so no single caller's budget cuts
+        the work short for the others. Every caller, the first one included, waits only until its own
+        `deadline` and then gives up with `TimeoutError` while the work carries on for the rest.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                shared_deadline = SharedDeadline(deadline)
+                call = self._calls[key] = _Call(start(shared_deadline), shared_deadline)
+            else:
+                call.deadline.extend(deadline)
+
+        if leader:
+            # Outside the lock: an already finished future runs the callback immediately.
+            call.future.add_done_callback(lambda _done: self._forget(key, call))
+
+        timeout = None if deadline is None else max(deadline.remaining_ms(), 0.0) / 1000.0
+        try:
+            return call.future.result(timeout), not leader
+        except FutureTimeoutError:
+            raise TimeoutError("timed out waiting for in-flight computation") from None
+
+    def _forget(self, key: Hashable, call: _Call[V]) -> None:
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
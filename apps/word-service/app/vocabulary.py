@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from array import array
+import mmap
+import os
+from pathlib import Path
+import struct
+from typing import Callable, Iterable, Iterator
+
+
+# Layout (native byte order, little-endian on every host we deploy to):
+#   header       magic "WSVOCAB1", uint64 word count n, uint64 blob size
+#   offsets      uint64[n + 1]  byte offset of each row's word in the blob (row order)
+#   sorted_rows  uint32[n]      rows ordered by their UTF-8 bytes, for binary search
+#   blob         UTF-8 words concatenated in row order
+_MAGIC = b"WSVOCAB1"
+_HEADER = struct.Struct("=8sQQ")
+VOCABULARY_SUFFIX = ".vocab"
+
+
+class VocabularyIndex:
+    """Word <-> row mapping backed by one flat buffer instead of a list and dict of Python strings.
+
+    A multi-million-word vocabulary as `list[str]` plus `dict[str, int]` costs hundreds of MB of object
+    overhead in every process. Mapped from a file, the same data is a few bytes per word of shared page cache.
+    """
+
+    def __init__(self, buffer: bytes | mmap.mmap) -> None:
+        self._buffer = buffer
+        view = memoryview(buffer)
+        magic, count, blob_size = _HEADER.unpack_from(view, 0)
+        if magic != _MAGIC:
+            raise ValueError("not a vocabulary index")
+        offsets_start = _HEADER.size
+        sorted_start = offsets_start + 8 * (count + 1)
+        blob_start = sorted_start + 4 * count
+        if len(view) != blob_start + blob_size:
+            raise ValueError("vocabulary index is truncated")
+        self._count = count
+        self._offsets = view[offsets_start:sorted_start].cast("Q")
+        self._sorted_rows = view[sorted_start:blob_start].cast("I")
+        self._blob_start = blob_start
+
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> "VocabularyIndex":
+        return cls(encode_vocabulary(words))
+
+    @classmethod
+    def open(cls, path: Path) -> "VocabularyIndex":
+        with path.open("rb") as handle:
+            return cls(mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        for row in range(self._count):
+            yield self.word_at(row)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def is_memory_mapped(self) -> bool:
+        return isinstance(self._buffer, mmap.mmap)
+
+    def prefault(self) -> None:
+        """Ask the kernel to read the mapped file in ahead of the first lookups."""
+        if isinstance(self._buffer, mmap.mmap) and hasattr(mmap, "MADV_WILLNEED"):
+            self._buffer.madvise(mmap.MADV_WILLNEED)
+
+    def _word_bytes(self, row: int) -> bytes:
+        # Slicing the mmap/bytes directly yields `bytes` without an intermediate memoryview copy.
+        start = self._blob_start
+        return self._buffer[start + self._offsets[row] : start + self._offsets[row + 1]]
+
+    def word_at(self, row: int) -> str:
+        return self._word_bytes(row).decode("utf-8")
+
+    def row_of(self, word: str) -> int | None:
+        key = word.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._word_bytes(self._sorted_rows[middle]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count:
+            row = self._sorted_rows[low]
+            if self._word_bytes(row) == key:
+                return row
+        return None
+
+
+def encode_vocabulary(words: Iterable[str]) -> bytes:
+    encoded = [word.encode("utf-8") for word in words]
+    offsets = [0]
+    for item in encoded:
+        offsets.append(offsets[-1] + len(item))
+    # fastText vocabularies are unique; with duplicates, the lowest row wins (stable sort).
+    sorted_rows = sorted(range(len(encoded)), key=encoded.__getitem__)
+    return b"".join(
+        [
+            _HEADER.pack(_MAGIC, len(encoded), offsets[-1]),
+            array("Q", offsets).tobytes(),
+            array("I", sorted_rows).tobytes(),
+            *encoded,
+        ]
+    )
+
+
+def load_vocabulary(version: str, cache_dir: Path, words: Callable[[], Iterable[str]]) -> VocabularyIndex:
+    """Map `<version>.vocab` from `cache_dir`, building it from `words()` only if no build exists yet."""
+    path = cache_dir / f"{version}{VOCABULARY_SUFFIX}"
+    if not path.exists():
+        write_vocabulary_file(words(), path)
+    return VocabularyIndex.open(path)
+
+
+def write_vocabulary_file(words: Iterable[str], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(encode_vocabulary(words))
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_path, path)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from pathlib import Path
+import threading
+import time
+
+from .model_registry import ModelRegistry
+from .service import RelatedWordsService
+
+
+_WARM_UP_BATCH_SIZE = 64
+_FINISHED_STATES = ("done", "budget_exhausted", "skipped", "failed")
+
+
+@dataclass(frozen=True)
+class WarmUpStatus:
+    state: str
+    word_bank_path: str | None = None
+    words_total: int = 0
+    words_done: int = 0
+    entries_cached: int = 0
+    started_at: int | None = None
+    finished_at: int | None = None
+    error: str | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.state in _FINISHED_STATES
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def read_word_bank(path: Path) -> list[str]:
+    words: list[str] = []
+    seen: set[str] = set()
+    for line in path.read_text(encoding="utf-8").splitlines():
+        word = line.strip()
+        if word and word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+class CacheWarmer:
+    """Fills the neighbor cache for every word-bank word in the background, within a time budget.
+
+    Secret words are always drawn from the bank, so after warm-up the first turns of a game hit the cache
+    instead of paying for a cold scan. Batched scans also fault the mapped matrix and vocabulary into memory.
+    """
+
+    def __init__(
+        self,
+        model_registry: ModelRegistry,
+        related_words_service: RelatedWordsService,
+        word_bank_path: Path | None,
+        budget_seconds: float,
+        k: int,
+    ) -> None:
+        self._model_registry = model_registry
+        self._related_words_service = related_words_service
+        self._word_bank_path = word_bank_path
+        self._budget_seconds = budget_seconds
+        self._k = k
+        self._status = WarmUpStatus(
+            state="pending",
+            word_bank_path=str(word_bank_path) if word_bank_path is not None else None,
+        )
+
+    @property
+    def status(self) -> WarmUpStatus:
+        return self._status
+
+    def start(self) -> None:
+        threading.Thread(target=self._run, name="cache-warm-up", daemon=True).start()
+
+    def _run(self) -> None:
+        path = self._word_bank_path
+        if path is None or self._budget_seconds <= 0 or not path.is_file():
+            self._status = replace(self._status, state="skipped", finished_at=_now_ms())
+            return
+
+        try:
+            words = read_word_bank(path)
+            # Default tier first: it serves the AI turns, so it gets the budget if both tiers cannot fit.
+            tiers = [self._model_registry.default_tier]
+            tiers += [tier for tier in self._model_registry.tiers if tier not in tiers]
+            # Warming more words than the cache holds would only evict the earlier ones.
+            per_tier = min(len(words), self._related_words_service.neighbor_cache_capacity // len(tiers))
+            words = words[:per_tier]
+            self._status = replace(
+                self._status,
+                state="running",
+                words_total=len(words) * len(tiers),
+                started_at=_now_ms(),
+            )
+            expires_at = time.monotonic() + self._budget_seconds
+            for tier in tiers:
+                snapshot = self._model_registry.get_store(tier).get_snapshot_or_none()
+                if snapshot is None:
+                    continue
+                snapshot.index.vocabulary.prefault()
+                for start in range(0, len(words), _WARM_UP_BATCH_SIZE):
+                    if time.monotonic() >= expires_at:
+                        self._status = replace(self._status, state="budget_exhausted", finished_at=_now_ms())
+                        return
+                    batch = words[start : start + _WARM_UP_BATCH_SIZE]
+                    cached = self._related_words_service.warm_neighbor_cache(tier, snapshot, batch, self._k)
+                    status = self._status
+                    self._status = replace(
+                        status,
+                        words_done=status.words_done + len(batch),
+                        entries_cached=status.entries_cached + cached,
+                    )
+        except Exception as exc:  # noqa: BLE001
+            # Warm-up is an optimization; the instance still serves, just with a cold cache.
+            self._status = replace(self._status, state="failed", error=str(exc), finished_at=_now_ms())
+            return
+        self._status = replace(self._status, state="done", finished_at=_now_ms())
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+
+from .vocabulary import VOCABULARY_SUFFIX
+
+
+_NORMALIZE_CHUNK_ROWS = 1 << 16
+_MATRIX_SUFFIX = ".f32.npy"
+
+
+def load_normalized_word_matrix(model: Any, words: Sequence[str], version: str, cache_dir: Path) -> np.ndarray:
+    """Return the L2-normalized word-vector matrix for `words`, memory-mapped from a per-version cache file.
+
+    The file is built once per model version; every worker process and tier that maps it shares the same
+    page-cache pages instead of each holding a private copy.
+    """
+    matrix_path = cache_dir / f"{version}{_MATRIX_SUFFIX}"
+    if not matrix_path.exists():
+        _build_matrix_file(model, words, matrix_path)
+    matrix = np.load(matrix_path, mmap_mode="r")
+    if matrix.shape != (len(words), int(model.get_dimension())):
+        raise ValueError(f"word matrix cache has unexpected shape {matrix.shape}: {matrix_path}")
+    return matrix
+
+
+def _build_matrix_file(model: Any, words: Sequence[str], matrix_path: Path) -> None:
+    matrix_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = matrix_path.with_name(f"{matrix_path.stem}.{os.getpid()}.tmp.npy")
+    dimension = int(model.get_dimension())
+    out = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=(len(words), dimension))
+    try:
+        for row, word in enumerate(words):
+            out[row] = model.get_word_vector(word)
+        for start in range(0, len(words), _NORMALIZE_CHUNK_ROWS):
+            block = out[start : start + _NORMALIZE_CHUNK_ROWS]
+            norms = np.linalg.norm(block, axis=1, keepdims=True)
+            norms[norms == 0.0] = 1.0
+            block /= norms
+        out.flush()
+    except BaseException:
+        del out
+        tmp_path.unlink(missing_ok=True)
+        raise
+    del out
+    # Concurrent builders write to private temp files; the rename makes whichever finishes first visible.
+    os.replace(tmp_path, matrix_path)
+
+
+def prune_model_cache(cache_dir: Path, version: str) -> list[Path]:
+    """Delete the cached matrix and vocabulary of a version no tier serves any more.
+
+    Only the version just swapped out is removed: files of other versions may have been built offline, ahead of
+    a rollout or for `wordscorrelation/correlate_words.py`. The neighbor table is kept as well, since only
+    `tools/build_neighbor_table.py` can rebuild it. Returns the removed files. Processes that still map
+    a removed file keep their mapping; the pages are freed once the last one unmaps.
+    """
+    removed: list[Path] = []
+    for suffix in (_MATRIX_SUFFIX, VOCABULARY_SUFFIX):
+        cached_path = cache_dir / f"{version}{suffix}"
+        try:
+            cached_path.unlink()
+        except OSError:
+            continue
+        removed.append(cached_path)
+    return removed
@@ -0,0 +1,4 @@
+from __future__ import annotations
+
+from .config import RouterSettings
+from .proxy import create_router_app
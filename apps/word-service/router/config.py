@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RouterSettings:
+    port: int
+    replicas: list[str]
+    virtual_nodes: int = 64
+    timeout_ms: float = 2000.0
+    down_cooldown_seconds: float = 5.0
+    http_threads: int = 16
+    service_name: str = "word-service-router"
+
+    @classmethod
+    def from_env(cls) -> "RouterSettings":
+        raw_port = os.getenv("ROUTER_PORT", "4200")
+        raw_replicas = os.getenv("ROUTER_REPLICAS", "").strip()
+        raw_virtual_nodes = os.getenv("ROUTER_VIRTUAL_NODES", "64")
+        raw_timeout_ms = os.getenv("ROUTER_TIMEOUT_MS", "2000")
+        raw_down_cooldown = os.getenv("ROUTER_DOWN_COOLDOWN_SECONDS", "5")
+        raw_http_threads = os.getenv("ROUTER_HTTP_THREADS", "16")
+
+        # Format: "http://127.0.0.1:4201,http://127.0.0.1:4202"
+        replicas = [entry.strip().rstrip("/") for entry in raw_replicas.split(",") if entry.strip()]
+        port = int(raw_port)
+        virtual_nodes = int(raw_virtual_nodes)
+        timeout_ms = float(raw_timeout_ms)
+        down_cooldown_seconds = float(raw_down_cooldown)
+        http_threads = int(raw_http_threads)
+
+        if not replicas:
+            raise ValueError("ROUTER_REPLICAS must list at least one replica base URL")
+        if len(set(replicas)) != len(replicas):
+            raise ValueError("ROUTER_REPLICAS has duplicate replicas")
+        if any(not replica.startswith("http://") for replica in replicas):
+            raise ValueError("ROUTER_REPLICAS entries must be http:// base URLs")
+        if port <= 0:
+            raise ValueError("ROUTER_PORT must be a positive integer")
+        if virtual_nodes <= 0:
+            raise ValueError("ROUTER_VIRTUAL_NODES must be a positive integer")
+        if timeout_ms <= 0:
+            raise ValueError("ROUTER_TIMEOUT_MS must be a positive number")
+        if down_cooldown_seconds < 0:
+            raise ValueError("ROUTER_DOWN_COOLDOWN_SECONDS must be zero or a positive number")
+        if http_threads <= 0:
+            raise ValueError("ROUTER_HTTP_THREADS must be a positive integer")
+
+        return cls(
+            port=port,
+            replicas=replicas,
+            virtual_nodes=virtual_nodes,
+            timeout_ms=timeout_ms,
+            down_cooldown_seconds=down_cooldown_seconds,
+            http_threads=http_threads,
+        )
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import bisect
+import hashlib
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class ConsistentHashRing:
+    """Maps keys to nodes so that adding or removing one node only moves that node's share of the keys.
+
+    Each node owns `virtual_nodes` points on the ring to even out the partition sizes.
+    """
+
+    def __init__(self, nodes: list[str], virtual_nodes: int = 64) -> None:
+        if not nodes:
+            raise ValueError("a hash ring needs at least one node")
+        points = sorted((_hash(f"{node}#{replica}"), node) for node in nodes for replica in range(virtual_nodes))
+        self._hashes = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+        self._node_count = len(set(nodes))
+
+    def preference_list(self, key: str) -> list[str]:
+        """Every node, ordered by ring distance from `key`: the owner first, then its failover successors."""
+        start = bisect.bisect(self._hashes, _hash(key))
+        ordered: list[str] = []
+        for offset in range(len(self._owners)):
+            node = self._owners[(start + offset) % len(self._owners)]
+            if node not in ordered:
+                ordered.append(node)
+                if len(ordered) == self._node_count:
+                    break
+        return ordered
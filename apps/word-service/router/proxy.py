@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlparse
+
+from flask import Flask, Response, jsonify, request
+from werkzeug.exceptions import HTTPException
+
+from .config import RouterSettings
+from .hash_ring import ConsistentHashRing
+
+
+_FORWARDED_REQUEST_HEADERS = ("Content-Type", "X-Request-Deadline")
+_FORWARDED_RESPONSE_HEADERS = ("Content-Type", "Retry-After", "X-Model-Version", "X-Model-Tier", "X-Answer-Path")
+# Router session ids are `<node_id>.<replica session id>`; replica ids are hex, so the dot is unambiguous.
+_SESSION_ID_SEPARATOR = "."
+
+
+class ReplicaUnavailableError(RuntimeError):
+    """The replica refused or dropped the connection; the caller may fail over to the next node."""
+
+
+@dataclass
+class Replica:
+    url: str
+    node_id: str
+    host: str
+    port: int
+    down_until: float = 0.0
+    requests: int = 0
+    failures: int = 0
+
+    @property
+    def is_down(self) -> bool:
+        return self.down_until > time.monotonic()
+
+
+@dataclass(frozen=True)
+class ForwardedResponse:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+
+def _node_id(url: str) -> str:
+    # Derived from the URL rather than the list position, so reordering ROUTER_REPLICAS keeps every partition.
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:8]
+
+
+class ReplicaPool:
+    """Keep-alive connections to word-service replicas, placed on a consistent-hash ring by node id."""
+
+    def __init__(self, settings: RouterSettings) -> None:
+        self._replicas: dict[str, Replica] = {}
+        for url in settings.replicas:
+            parsed = urlparse(url)
+            node_id = _node_id(url)
+            self._replicas[node_id] = Replica(
+                url=url,
+                node_id=node_id,
+                host=parsed.hostname or "127.0.0.1",
+                port=parsed.port or 80,
+            )
+        self._ring = ConsistentHashRing(list(self._replicas), settings.virtual_nodes)
+        self._timeout_seconds = settings.timeout_ms / 1000.0
+        self._down_cooldown_seconds = settings.down_cooldown_seconds
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.failovers = 0
+
+    @property
+    def replicas(self) -> list[Replica]:
+        return list(self._replicas.values())
+
+    def replica(self, node_id: str) -> Replica | None:
+        return self._replicas.get(node_id)
+
+    def candidates(self, key: str) -> list[Replica]:
+        """Ring order from the key's owner; replicas marked down go last, as a final attempt."""
+        ordered = [self._replicas[node_id] for node_id in self._ring.preference_list(key)]
+        return [replica for replica in ordered if not replica.is_down] + [
+            replica for replica in ordered if replica.is_down
+        ]
+
+    def forward_by_key(
+        self,
+        key: str,
+        method: str,
+        path: str,
+        body: bytes,
+        headers: dict[str, str],
+    ) -> tuple[Replica, ForwardedResponse]:
+        for attempt, replica in enumerate(self.candidates(key)):
+            try:
+                response = self.forward(replica, method, path, body, headers)
+            except ReplicaUnavailableError:
+                continue
+            if attempt > 0:
+                with self._lock:
+                    self.failovers += 1
+            return replica, response
+        raise ReplicaUnavailableError("no word-service replica is reachable")
+
+    def forward(
+        self,
+        replica: Replica,
+        method: str,
+        path: str,
+        body: bytes,
+        headers: dict[str, str],
+        timeout_seconds: float | None = None,
+    ) -> ForwardedResponse:
+        with self._lock:
+            replica.requests += 1
+        try:
+            response = self._send(replica, method, path, body, headers, timeout_seconds or self._timeout_seconds)
+        except ReplicaUnavailableError:
+            with self._lock:
+                replica.failures += 1
+                replica.down_until = time.monotonic() + self._down_cooldown_seconds
+            raise
+        replica.down_until = 0.0
+        return response
+
+    def _send(
+        self,
+        replica: Replica,
+        method: str,
+        path: str,
+        body: bytes,
+        headers: dict[str, str],
+        timeout_seconds: float,
+    ) -> ForwardedResponse:
+        connections: dict[str, http.client.HTTPConnection] = self._local.__dict__.setdefault("connections", {})
+        for attempt in range(2):
+            connection = connections.get(replica.node_id)
+            reused = connection is not None
+            if connection is None:
+                connection = http.client.HTTPConnection(replica.host, replica.port, timeout=timeout_seconds)
+                connections[replica.node_id] = connection
+            connection.timeout = timeout_seconds
+            if connection.sock is not None:
+                connection.sock.settimeout(timeout_seconds)
+            try:
+                connection.request(method, path, body=body or None, headers=headers)
+                response = connection.getresponse()
+                payload = response.read()
+            except TimeoutError:
+                # Slow, not gone: failing over would only add a second slow request to the load.
+                connection.close()
+                connections.pop(replica.node_id, None)
+                raise
+            except (OSError, http.client.HTTPException) as exc:
+                connection.close()
+                connections.pop(replica.node_id, None)
+                if reused and attempt == 0:
+                    # The replica may have closed an idle keep-alive connection; retry once on a fresh one.
+                    continue
+                raise ReplicaUnavailableError(f"{replica.url}: {exc}") from None
+            forwarded_headers = {
+                name: value for name in _FORWARDED_RESPONSE_HEADERS if (value := response.getheader(name)) is not None
+            }
+            return ForwardedResponse(status=response.status, headers=forwarded_headers, body=payload)
+        raise ReplicaUnavailableError(f"{replica.url}: connection closed")
+
+
+def _error(code: str, message: str, status: int):
+    return jsonify({"ok": False, "error": {"code": code, "message": message}}), status
+
+
+def _prefix_session_id(forwarded: ForwardedResponse, replica: Replica) -> bytes:
+    if not forwarded.headers.get("Content-Type", "").startswith("application/json"):
+        return forwarded.body
+    payload = json.loads(forwarded.body)
+    if isinstance(payload, dict) and isinstance(payload.get("session_id"), str):
+        payload["session_id"] = f"{replica.node_id}{_SESSION_ID_SEPARATOR}{payload['session_id']}"
+        return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    return forwarded.body
+
+
+def _to_response(replica: Replica, forwarded: ForwardedResponse, body: bytes | None = None) -> Response:
+    response = Response(forwarded.body if body is None else body, status=forwarded.status)
+    for name, value in forwarded.headers.items():
+        response.headers[name] = value
+    response.headers["X-Replica"] = replica.node_id
+    return response
+
+
+def _routing_key(path: str) -> str:
+    # Every replica caches by word, so hashing the word gives each replica its own slice of the vocabulary.
+    payload = request.get_json(silent=True)
+    if isinstance(payload, dict):
+        word = payload.get("word")
+        if isinstance(word, str) and word.strip():
+            return word.strip()
+        # Per-room state (sessions, clue histories) must keep landing on the replica that holds it.
+        room_id = payload.get("room_id")
+        if isinstance(room_id, str) and room_id:
+            return f"room\n{room_id}"
+    return f"{path}\n{request.get_data(as_text=True)}"
+
+
+def create_router_app(settings: RouterSettings) -> Flask:
+    pool = ReplicaPool(settings)
+    app = Flask(__name__)
+
+    def forwarded_headers() -> dict[str, str]:
+        return {name: value for name in _FORWARDED_REQUEST_HEADERS if (value := request.headers.get(name)) is not None}
+
+    def forward_by_key(key: str, path: str) -> tuple[Replica, ForwardedResponse]:
+        return pool.forward_by_key(key, request.method, path, request.get_data(), forwarded_headers())
+
+    def forward_to_session(session_id: str, suffix: str):
+        # Sessions live in one replica's memory, so these requests are pinned to it and never fail over.
+        node_id, separator, replica_session_id = session_id.partition(_SESSION_ID_SEPARATOR)
+        replica = pool.replica(node_id) if separator else None
+        if replica is None:
+            return _error("SESSION_NOT_FOUND", f"session not found or expired: {session_id}", 404)
+        path = f"/api/v1/sessions/{replica_session_id}{suffix}"
+        try:
+            forwarded = pool.forward(replica, request.method, path, request.get_data(), forwarded_headers())
+        except ReplicaUnavailableError:
+            # Same answer as an expired session: callers drop it and fall back to live queries.
+            return _error("SESSION_NOT_FOUND", f"session replica is unavailable: {session_id}", 404)
+        return _to_response(replica, forwarded, _prefix_session_id(forwarded, replica))
+
+    @app.get("/health/live")
+    def health_live() -> tuple[dict[str, object], int]:
+        return {"ok": True, "service": settings.service_name, "ts": int(time.time() * 1000)}, 200
+
+    @app.get("/health/ready")
+    def health_ready() -> tuple[dict[str, object], int]:
+        replicas: dict[str, object] = {}
+        for replica in pool.replicas:
+            try:
+                forwarded = pool.forward(replica, "GET", "/health/ready", b"", {}, timeout_seconds=1.0)
+                replicas[replica.node_id] = {"url": replica.url, "ready": forwarded.status == 200}
+            except (ReplicaUnavailableError, TimeoutError):
+                replicas[replica.node_id] = {"url": replica.url, "ready": False}
+        # One warm replica can serve every key through failover; the others only lose their cache partition.
+        ok = any(entry["ready"] for entry in replicas.values())
+        return {
+            "ok": ok,
+            "service": settings.service_name,
+            "ts": int(time.time() * 1000),
+            "replicas": replicas,
+        }, 200 if ok else 503
+
+    @app.get("/router/status")
+    def router_status():
+        return jsonify(
+            {
+                "failovers": pool.failovers,
+                "replicas": [
+                    {
+                        "node_id": replica.node_id,
+                        "url": replica.url,
+                        "down": replica.is_down,
+                        "requests": replica.requests,
+                        "failures": replica.failures,
+                    }
+                    for replica in pool.replicas
+                ],
+            }
+        )
+
+    @app.post("/api/v1/sessions")
+    def create_session():
+        replica, forwarded = forward_by_key(_routing_key(request.path), request.path)
+        return _to_response(replica, forwarded, _prefix_session_id(forwarded, replica))
+
+    @app.get("/api/v1/sessions/<session_id>")
+    def get_session(session_id: str):
+        return forward_to_session(session_id, "")
+
+    @app.post("/api/v1/sessions/<session_id>/<action>")
+    def session_action(session_id: str, action: str):
+        return forward_to_session(session_id, f"/{action}")
+
+    @app.route("/api/v1/<path:_subpath>", methods=["GET", "POST"])
+    def forward_api(_subpath: str):
+        replica, forwarded = forward_by_key(_routing_key(request.path), request.full_path.rstrip("?"))
+        return _to_response(replica, forwarded)
+
+    @app.errorhandler(ReplicaUnavailableError)
+    def handle_replica_unavailable(error: ReplicaUnavailableError):
+        return _error("REPLICAS_UNAVAILABLE", str(error), 503)
+
+    @app.errorhandler(TimeoutError)
+    def handle_timeout(_error: TimeoutError):
+        return _error("DEADLINE_EXCEEDED", "word-service replica did not answer in time", 504)
+
+    @app.errorhandler(HTTPException)
+    def handle_http_error(error: HTTPException):
+        return _error((error.name or "HTTP_ERROR").upper().replace(" ", "_"), error.description or "", error.code or 500)
+
+    @app.errorhandler(Exception)
+    def handle_unexpected_error(_error: Exception):
+        return _error("INTERNAL_ERROR", "internal server error", 500)
+
+    return app
@@ -2,6 +2,9 @@
 from __future__ import annotations
 
 import os
+import threading
+
+from waitress.server import create_server
 
 from app import create_app
 
@@ -9,7 +12,20 @@ from app import create_app
 def main() -> None:
     os.environ.setdefault("PYTHONUTF8", "1")
     app, settings = create_app()
-    app.run(host="0.0.0.0", port=settings.port)
+
+    # waitress keeps HTTP/1.1 connections alive, unlike the werkzeug dev server which closes after every response.
+    tcp_server = create_server(app, host="0.0.0.0", port=settings.port, threads=settings.http_threads)
+    if settings.unix_socket_path is not None:
+        # waitress serves either TCP or a Unix socket per server, so co-located callers get their own. It only
+        # replaces an existing path if that is a stale socket, never a regular file.
+        unix_server = create_server(
+            app,
+            unix_socket=str(settings.unix_socket_path),
+            unix_socket_perms=settings.unix_socket_perms,
+            threads=settings.http_threads,
+        )
+        threading.Thread(target=unix_server.run, name="unix-socket-server", daemon=True).start()
+    tcp_server.run()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import os
+
+from waitress.server import create_server
+
+from router import RouterSettings, create_router_app
+
+
+def main() -> None:
+    os.environ.setdefault("PYTHONUTF8", "1")
+    settings = RouterSettings.from_env()
+    app = create_router_app(settings)
+    create_server(app, host="0.0.0.0", port=settings.port, threads=settings.http_threads).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Measure aggregate neighbor-cache hit rate and throughput behind the consistent-hash router.
+
+For each replica count, starts that many local word-service replicas (each with a deliberately small
+NEIGHBOR_CACHE_SIZE) plus one router, replays a Zipf-distributed stream of word-bank queries through the router,
+and sums the replicas' /metrics counters. With partitioned caches, total cache capacity (and so the hit rate)
+grows with the number of replicas. `--check-failover` then kills one replica and checks that every key is
+still answered by its ring successor.
+
+    python3.11 apps/word-service/tools/bench_router.py --model-path apps/word-service/models/cc.zh.100.bin
+
+Python: 3.11+
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import http.client
+import json
+import os
+from pathlib import Path
+import random
+import subprocess
+import sys
+import threading
+import time
+
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_WORD_BANK_PATH = ROOT / "apps" / "server" / "src" / "data" / "thuocl_words_max4.txt"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark partitioned caching behind the word-service router.")
+    parser.add_argument("--model-path", type=Path, required=True, help="fastText model (.bin) every replica loads.")
+    parser.add_argument("--replicas", default="1,2,4", help="Comma-separated replica counts to measure.")
+    parser.add_argument("--cache-size", type=int, default=300, help="NEIGHBOR_CACHE_SIZE of each replica.")
+    parser.add_argument("--word-bank", type=Path, default=DEFAULT_WORD_BANK_PATH, help="Query words, one per line.")
+    parser.add_argument("--requests", type=int, default=4000, help="Requests per replica count.")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent of the word popularity.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent client connections.")
+    parser.add_argument("--base-port", type=int, default=4300, help="First port; the router takes the next one.")
+    parser.add_argument("--check-failover", action="store_true", help="Kill one replica and re-run the stream.")
+    return parser.parse_args()
+
+
+def request_json(port: int, method: str, path: str, body: dict[str, object] | None = None) -> tuple[int, object]:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10.0)
+    try:
+        payload = json.dumps(body) if body is not None else None
+        connection.request(method, path, payload, {"content-type": "application/json"})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read() or b"null")
+    finally:
+        connection.close()
+
+
+def wait_ready(port: int, timeout_seconds: float = 120.0) -> None:
+    expires_at = time.monotonic() + timeout_seconds
+    while time.monotonic() < expires_at:
+        try:
+            if request_json(port, "GET", "/health/ready")[0] == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"port {port} did not become ready")
+
+
+def start_process(script: str, env: dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, str(SERVICE_ROOT / script)],
+        cwd=SERVICE_ROOT,
+        env={**os.environ, "PYTHONUTF8": "1", **env},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def zipf_stream(words: list[str], count: int, exponent: float) -> list[str]:
+    rng = random.Random(0)
+    weights = [1.0 / (rank + 1) ** exponent for rank in range(len(words))]
+    return rng.choices(words, weights=weights, k=count)
+
+
+def replay(router_port: int, stream: list[str], concurrency: int) -> tuple[float, list[float], Counter[int]]:
+    local = threading.local()
+
+    def call(word: str) -> tuple[float, int]:
+        connection = getattr(local, "connection", None)
+        if connection is None:
+            connection = local.connection = http.client.HTTPConnection("127.0.0.1", router_port, timeout=10.0)
+        started = time.perf_counter()
+        connection.request(
+            "POST",
+            "/api/v1/related-words",
+            json.dumps({"word": word, "k": 10}),
+            {"content-type": "application/json"},
+        )
+        response = connection.getresponse()
+        response.read()
+        return (time.perf_counter() - started) * 1000.0, response.status
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(call, stream))
+    elapsed = time.perf_counter() - started
+    return elapsed, sorted(latency for latency, _ in results), Counter(status for _, status in results if status != 200)
+
+
+def cache_counters(ports: list[int]) -> tuple[int, int]:
+    hits = 0
+    total = 0
+    for port in ports:
+        status, payload = request_json(port, "GET", "/metrics")
+        if status != 200 or not isinstance(payload, dict):
+            continue
+        for name, value in payload.get("counters", {}).items():
+            if name.startswith("related_words.path."):
+                total += value
+                if name == "related_words.path.cache":
+                    hits += value
+    return hits, total
+
+
+def main() -> int:
+    args = parse_args()
+    words = [line.strip() for line in args.word_bank.read_text(encoding="utf-8").splitlines() if line.strip()]
+    stream = zipf_stream(words, args.requests, args.zipf)
+    replica_counts = [int(value) for value in args.replicas.split(",") if value.strip()]
+
+    print(f"words: {len(words)}, requests: {len(stream)}, cache/replica: {args.cache_size}, cpus: {os.cpu_count()}")
+    print(f"{'replicas':>9}{'hit rate':>10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}  errors")
+    for count in replica_counts:
+        replica_ports = [args.base_port + index for index in range(count)]
+        router_port = args.base_port + count
+        replica_env = {
+            "FASTTEXT_MODEL_PATH": str(args.model_path),
+            "NEIGHBOR_CACHE_SIZE": str(args.cache_size),
+            # Measure caching driven by the stream itself, not by the startup bank warm-up.
+            "WARMUP_BUDGET_SECONDS": "0",
+        }
+        processes = [start_process("run.py", {**replica_env, "PORT": str(port)}) for port in replica_ports]
+        try:
+            for port in replica_ports:
+                wait_ready(port)
+            replicas = ",".join(f"http://127.0.0.1:{port}" for port in replica_ports)
+            processes.append(start_process("run_router.py", {"ROUTER_PORT": str(router_port), "ROUTER_REPLICAS": replicas}))
+            wait_ready(router_port)
+
+            elapsed, latencies, errors = replay(router_port, stream, args.concurrency)
+            hits, total = cache_counters(replica_ports)
+            print(
+                f"{count:>9}{hits / max(total, 1):>10.3f}{len(stream) / elapsed:>10.0f}"
+                f"{latencies[len(latencies) // 2]:>10.2f}{latencies[int(len(latencies) * 0.95)]:>10.2f}  {dict(errors)}"
+            )
+
+            if args.check_failover and count > 1:
+                processes[0].kill()
+                processes[0].wait()
+                elapsed, latencies, errors = replay(router_port, stream[: len(stream) // 4], args.concurrency)
+                status, router_status = request_json(router_port, "GET", "/router/status")
+                failovers = router_status.get("failovers") if isinstance(router_status, dict) else None
+                print(
+                    f"{'':>9}after killing one replica: errors {dict(errors)}, failovers {failovers}, "
+                    f"p95 {latencies[int(len(latencies) * 0.95)]:.2f} ms"
+                )
+                # Overload (503) is the replica's own back-pressure; anything else means a key was lost.
+                if any(status != 503 for status in errors):
+                    return 1
+        finally:
+            for process in processes:
+                if process.poll() is None:
+                    process.terminate()
+            for process in processes:
+                process.wait(timeout=10)
+    return 0
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("PYTHONUTF8", "1")
+    raise SystemExit(main())
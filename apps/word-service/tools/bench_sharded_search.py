@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Measure single-query exact search latency against the number of search shards.
+
+Shard count 1 is the in-process scan the service runs without SEARCH_SHARDS; larger counts start a
+ShardedSearchPool over the same mapped matrix file. Every sharded result is checked against the in-process
+top-k so the speed-up never comes from a wrong merge.
+
+Use a real matrix from WORD_MATRIX_CACHE_DIR, e.g.:
+    python3.11 apps/word-service/tools/bench_sharded_search.py --matrix apps/word-service/models/cache/<version>.f32.npy
+or a synthetic one:
+    python3.11 apps/word-service/tools/bench_sharded_search.py --rows 2000000 --dim 100
+
+Python: 3.11+
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SERVICE_ROOT))
+
+from app.search_engine import WordVectorIndex  # noqa: E402
+from app.sharded_search import ShardedSearchPool  # noqa: E402
+from app.vocabulary import VocabularyIndex  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark sharded exact top-k search.")
+    parser.add_argument("--matrix", type=Path, default=None, help="Normalized .f32.npy matrix from the cache dir.")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows of the synthetic matrix.")
+    parser.add_argument("--dim", type=int, default=100, help="Dimension of the synthetic matrix.")
+    parser.add_argument("--shards", default="1,2,4,8", help="Comma-separated shard counts to measure.")
+    parser.add_argument("--queries", type=int, default=200, help="Measured queries per shard count.")
+    parser.add_argument("--k", type=int, default=20, help="Neighbors per query.")
+    return parser.parse_args()
+
+
+def write_synthetic_matrix(path: Path, rows: int, dim: int) -> None:
+    rng = np.random.default_rng(0)
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(rows, dim))
+    for start in range(0, rows, 1 << 16):
+        block = rng.standard_normal((min(1 << 16, rows - start), dim), dtype=np.float32)
+        out[start : start + len(block)] = block / np.linalg.norm(block, axis=1, keepdims=True)
+    out.flush()
+    del out
+
+
+def main() -> int:
+    args = parse_args()
+    shard_counts = [int(value) for value in args.shards.split(",") if value.strip()]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        matrix_path = args.matrix
+        if matrix_path is None:
+            matrix_path = Path(tmp_dir) / "synthetic.f32.npy"
+            write_synthetic_matrix(matrix_path, args.rows, args.dim)
+        matrix = np.load(matrix_path, mmap_mode="r")
+        words = VocabularyIndex.from_words(str(row) for row in range(matrix.shape[0]))
+        rng = np.random.default_rng(1)
+        queries = [np.asarray(matrix[row]) for row in rng.integers(0, matrix.shape[0], size=args.queries)]
+
+        baseline_index = WordVectorIndex(words, matrix)
+        expected = [baseline_index.top_k(query, args.k) for query in queries]
+
+        print(f"matrix: {matrix.shape[0]} x {matrix.shape[1]} ({matrix.nbytes / (1 << 20):.0f} MiB), cpus: {os.cpu_count()}")
+        print(f"{'shards':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'speed-up':>10}")
+        baseline_mean: float | None = None
+        for shards in shard_counts:
+            pool = ShardedSearchPool(shards) if shards > 1 else None
+            index = WordVectorIndex(words, matrix, pool)
+            try:
+                # One untimed pass maps the matrix in every worker and faults its pages in.
+                index.top_k(queries[0], args.k)
+                samples: list[float] = []
+                for query, expected_hits in zip(queries, expected):
+                    started = time.perf_counter()
+                    hits = index.top_k(query, args.k)
+                    samples.append((time.perf_counter() - started) * 1000.0)
+                    if [row for _, row in hits] != [row for _, row in expected_hits]:
+                        print(f"shards={shards}: merged top-k differs from the in-process scan", file=sys.stderr)
+                        return 1
+            finally:
+                if pool is not None:
+                    pool.close()
+
+            samples.sort()
+            mean = statistics.fmean(samples)
+            baseline_mean = baseline_mean if baseline_mean is not None else mean
+            print(
+                f"{shards:>8}{mean:>10.3f}{samples[len(samples) // 2]:>10.3f}"
+                f"{samples[int(len(samples) * 0.95)]:>10.3f}{baseline_mean / mean:>9.2f}x"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("PYTHONUTF8", "1")
+    raise SystemExit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Measure per-call overhead of word-service transports.
+
+Compares the current path (TCP, new connection per call, full JSON) against keep-alive connections,
+a Unix domain socket, and the compact / binary response formats. Queries are warmed first so every
+measured call is a cache hit and the numbers reflect transport + encoding cost, not search time.
+
+Start the service with both listeners, e.g.:
+    UNIX_SOCKET_PATH=/tmp/word-service.sock python3.11 apps/word-service/run.py
+
+Python: 3.11+
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+
+ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_WORD_BANK_PATH = ROOT / "apps" / "server" / "src" / "data" / "thuocl_words_max4.txt"
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float = 5.0) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self._socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._socket_path)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark word-service transports and response formats.")
+    parser.add_argument("--url", default="http://127.0.0.1:4201", help="TCP base URL of the word-service.")
+    parser.add_argument("--unix-socket", type=Path, default=None, help="Unix socket path (UNIX_SOCKET_PATH).")
+    parser.add_argument("--word-bank", type=Path, default=DEFAULT_WORD_BANK_PATH, help="Query words, one per line.")
+    parser.add_argument("--words", type=int, default=200, help="Number of distinct query words.")
+    parser.add_argument("--calls", type=int, default=2000, help="Measured calls per mode.")
+    parser.add_argument("--k", type=int, default=10, help="Neighbors per query.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    words = [line.strip() for line in args.word_bank.read_text(encoding="utf-8").splitlines() if line.strip()]
+    words = words[: args.words]
+    target = urlparse(args.url)
+
+    def tcp_connection() -> http.client.HTTPConnection:
+        return http.client.HTTPConnection(target.hostname or "127.0.0.1", target.port or 80, timeout=5.0)
+
+    def unix_connection() -> http.client.HTTPConnection:
+        return UnixHTTPConnection(str(args.unix_socket))
+
+    modes: list[tuple[str, object, bool, str]] = [
+        ("tcp / new conn / full json", tcp_connection, False, "full"),
+        ("tcp / keep-alive / full json", tcp_connection, True, "full"),
+        ("tcp / keep-alive / compact json", tcp_connection, True, "compact"),
+    ]
+    if args.unix_socket is not None:
+        modes += [
+            ("unix / keep-alive / full json", unix_connection, True, "full"),
+            ("unix / keep-alive / compact json", unix_connection, True, "compact"),
+            ("unix / keep-alive / binary", unix_connection, True, "binary"),
+        ]
+
+    # Warm the neighbor cache so each mode measures the same cache-hit work.
+    warm = tcp_connection()
+    for word in words:
+        body = json.dumps({"word": word, "k": args.k})
+        warm.request("POST", "/api/v1/related-words", body, {"content-type": "application/json"})
+        warm.getresponse().read()
+    warm.close()
+
+    print(f"{'mode':<36}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'bytes/call':>12}")
+    baseline_mean: float | None = None
+    for label, make_connection, keep_alive, response_format in modes:
+        connection = make_connection() if keep_alive else None
+        samples: list[float] = []
+        total_bytes = 0
+        for index in range(args.calls):
+            body = json.dumps({"word": words[index % len(words)], "k": args.k, "format": response_format})
+            started = time.perf_counter()
+            active = connection if connection is not None else make_connection()
+            active.request("POST", "/api/v1/related-words", body, {"content-type": "application/json"})
+            response = active.getresponse()
+            payload = response.read()
+            if response_format != "binary":
+                json.loads(payload)
+            if connection is None:
+                active.close()
+            samples.append((time.perf_counter() - started) * 1000.0)
+            total_bytes += len(payload)
+        if connection is not None:
+            connection.close()
+
+        samples.sort()
+        mean = statistics.fmean(samples)
+        baseline_mean = baseline_mean if baseline_mean is not None else mean
+        saved = f"  (-{baseline_mean - mean:.3f} ms vs baseline)" if mean < baseline_mean else ""
+        print(
+            f"{label:<36}{mean:>10.3f}{samples[len(samples) // 2]:>10.3f}"
+            f"{samples[int(len(samples) * 0.95)]:>10.3f}{total_bytes // args.calls:>12}{saved}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("PYTHONUTF8", "1")
+    raise SystemExit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Compare the mapped vocabulary index against the `list[str]` + `dict[str, int]` baseline.
+
+Reports the Python heap cost of each structure (tracemalloc) next to the index file size, and the latency of
+word -> row and row -> word lookups. Both sides are checked to agree on every probed word.
+
+Use a real vocabulary from WORD_MATRIX_CACHE_DIR, e.g.:
+    python3.11 apps/word-service/tools/bench_vocabulary.py --vocab apps/word-service/models/cache/<version>.vocab
+or synthetic Chinese words:
+    python3.11 apps/word-service/tools/bench_vocabulary.py --words 2000000
+
+Python: 3.11+
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SERVICE_ROOT))
+
+from app.vocabulary import VocabularyIndex, write_vocabulary_file  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the mapped vocabulary index against a dict.")
+    parser.add_argument("--vocab", type=Path, default=None, help="A <version>.vocab file from the cache dir.")
+    parser.add_argument("--words", type=int, default=2_000_000, help="Size of the synthetic vocabulary.")
+    parser.add_argument("--lookups", type=int, default=100_000, help="Measured lookups per operation.")
+    return parser.parse_args()
+
+
+def synthetic_words(count: int) -> list[str]:
+    # Two to four CJK characters, like the fastText zh vocabulary; deduplicated, in random "frequency" order.
+    rng = random.Random(0)
+    seen: set[str] = set()
+    words: list[str] = []
+    while len(words) < count:
+        word = "".join(chr(rng.randint(0x4E00, 0x9FA5)) for _ in range(rng.randint(2, 4)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+def time_per_call_us(fn: Callable[[object], object], items: list) -> tuple[float, float]:
+    samples: list[float] = []
+    for start in range(0, len(items), 1000):
+        chunk = items[start : start + 1000]
+        started = time.perf_counter()
+        for item in chunk:
+            fn(item)
+        samples.append((time.perf_counter() - started) * 1e6 / len(chunk))
+    samples.sort()
+    return statistics.fmean(samples), samples[int(len(samples) * 0.95)]
+
+
+def main() -> int:
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        vocab_path = args.vocab
+        if vocab_path is None:
+            vocab_path = Path(tmp_dir) / "synthetic.vocab"
+            write_vocabulary_file(synthetic_words(args.words), vocab_path)
+
+        tracemalloc.start()
+        mapped = VocabularyIndex.open(vocab_path)
+        mapped_heap = tracemalloc.get_traced_memory()[0]
+        # Materialize the baseline from the index itself so both sides hold exactly the same words.
+        words = list(mapped)
+        row_of = {word: row for row, word in enumerate(words)}
+        baseline_heap = tracemalloc.get_traced_memory()[0] - mapped_heap
+        tracemalloc.stop()
+
+        rng = random.Random(1)
+        rows = [rng.randrange(len(words)) for _ in range(args.lookups)]
+        probes = [words[row] for row in rows]
+        for word, row in zip(probes[:1000], rows[:1000]):
+            if mapped.row_of(word) != row_of[word] or mapped.word_at(row) != words[row]:
+                print(f"mismatch for {word!r}", file=sys.stderr)
+                return 1
+
+        print(f"vocabulary: {len(words)} words, cpus: {os.cpu_count()}")
+        print(f"{'structure':<22}{'heap MiB':>10}{'file MiB':>10}")
+        print(f"{'list + dict':<22}{baseline_heap / (1 << 20):>10.1f}{'-':>10}")
+        print(f"{'mapped index':<22}{mapped_heap / (1 << 20):>10.1f}{mapped.nbytes / (1 << 20):>10.1f}")
+
+        print(f"{'lookup':<22}{'mean us':>10}{'p95 us':>10}")
+        for name, fn, items in (
+            ("dict word->row", row_of.get, probes),
+            ("index word->row", mapped.row_of, probes),
+            ("list row->word", words.__getitem__, rows),
+            ("index row->word", mapped.word_at, rows),
+        ):
+            mean, p95 = time_per_call_us(fn, items)
+            print(f"{name:<22}{mean:>10.3f}{p95:>10.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("PYTHONUTF8", "1")
+    raise SystemExit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Precompute the top-K neighbors of every word-bank word for a fastText model, as a mapped lookup table.
+
+Secret words always come from the word bank, so their neighbor lists only change with the model. This scores
+batches of bank words against the whole normalized word matrix (one matrix product per batch, batches spread
+over a thread pool), applies the live search's filtering (no query word, hanzi words only) and writes
+`<version>.neighbors` next to the model's `.vocab` / `.f32.npy`. The service maps it on model load and answers
+bank-word queries with k <= K by indexing; other words and larger k still go to live search.
+
+    python3.11 apps/word-service/tools/build_neighbor_table.py --model-path apps/word-service/models/cc.zh.100.bin
+
+Peak memory is about workers x batch size x vocabulary size x 4 bytes of score buffers on top of the matrix.
+
+Python: 3.11+
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import os
+from pathlib import Path
+import sys
+import time
+
+import fasttext
+import numpy as np
+
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_WORD_BANK_PATH = ROOT / "apps" / "server" / "src" / "data" / "thuocl_words_max4.txt"
+sys.path.insert(0, str(SERVICE_ROOT))
+
+from app.model_loader import compute_model_version  # noqa: E402
+from app.neighbor_table import NEIGHBOR_TABLE_SUFFIX, NO_NEIGHBOR, NeighborTable, write_neighbor_table  # noqa: E402
+from app.service import contains_hanzi  # noqa: E402
+from app.vocabulary import load_vocabulary  # noqa: E402
+from app.warmup import read_word_bank  # noqa: E402
+from app.word_matrix import load_normalized_word_matrix  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build <version>.neighbors for the word bank of a fastText model.")
+    parser.add_argument("--model-path", type=Path, required=True, help="fastText model (.bin).")
+    parser.add_argument("--word-bank", type=Path, default=DEFAULT_WORD_BANK_PATH, help="Bank words, one per line.")
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=SERVICE_ROOT / "models" / "cache",
+        help="Output directory; must match WORD_MATRIX_CACHE_DIR of the service.",
+    )
+    parser.add_argument("--k", type=int, default=50, help="Neighbors per word; queries with a larger k stay live.")
+    parser.add_argument("--batch-size", type=int, default=32, help="Bank words scored per matrix product.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Batches scored concurrently.")
+    return parser.parse_args()
+
+
+def hanzi_rows_mask(words: list[str]) -> np.ndarray:
+    """True for vocabulary rows a live search may return, i.e. words with at least one hanzi."""
+    return np.fromiter((contains_hanzi(word) for word in words), dtype=bool, count=len(words))
+
+
+def top_k_rows(
+    matrix: np.ndarray,
+    candidate_mask: np.ndarray,
+    query_rows: np.ndarray,
+    k: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Best `k` candidate rows and scores for each query row, best first; NO_NEIGHBOR pads short lists."""
+    scores = np.asarray(matrix[query_rows], dtype=np.float32) @ matrix.T
+    scores[:, ~candidate_mask] = -np.inf
+    scores[np.arange(len(query_rows)), query_rows] = -np.inf
+    width = min(k, scores.shape[1])
+    candidates = np.argpartition(-scores, width - 1, axis=1)[:, :width]
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind="stable")
+    neighbor_rows = np.full((len(query_rows), k), NO_NEIGHBOR, dtype=np.uint32)
+    neighbor_scores = np.zeros((len(query_rows), k), dtype=np.float32)
+    ordered_rows = np.take_along_axis(candidates, order, axis=1)
+    ordered_scores = np.take_along_axis(candidate_scores, order, axis=1)
+    filled = np.isfinite(ordered_scores)
+    neighbor_rows[:, :width] = np.where(filled, ordered_rows, NO_NEIGHBOR)
+    neighbor_scores[:, :width] = np.where(filled, ordered_scores, 0.0)
+    return neighbor_rows, neighbor_scores
+
+
+def main() -> int:
+    args = parse_args()
+    if not args.model_path.exists():
+        print(f"Model not found: {args.model_path}", file=sys.stderr)
+        return 3
+    if not args.word_bank.is_file():
+        print(f"Word bank not found: {args.word_bank}", file=sys.stderr)
+        return 3
+    if args.k <= 0 or args.batch_size <= 0 or args.workers <= 0:
+        print("--k, --batch-size and --workers must be positive", file=sys.stderr)
+        return 2
+
+    version = compute_model_version(args.model_path)
+    started = time.perf_counter()
+    model = fasttext.load_model(str(args.model_path))
+    vocabulary = load_vocabulary(version, args.cache_dir, model.get_words)
+    matrix = load_normalized_word_matrix(model, vocabulary, version, args.cache_dir)
+    print(f"loaded {args.model_path} in {time.perf_counter() - started:.1f}s, version {version}, {matrix.shape}")
+
+    bank = read_word_bank(args.word_bank)
+    rows = [vocabulary.row_of(word) for word in bank]
+    # Out-of-vocabulary bank words have only a subword vector; the service keeps answering those live.
+    query_rows = np.unique(np.array([row for row in rows if row is not None], dtype=np.int64))
+    print(f"word bank: {len(bank)} words, {len(query_rows)} in the vocabulary")
+
+    started = time.perf_counter()
+    candidate_mask = hanzi_rows_mask(list(vocabulary))
+    batches = [query_rows[start : start + args.batch_size] for start in range(0, len(query_rows), args.batch_size)]
+    # NumPy releases the GIL in the matrix product and selection, so threads keep every core busy.
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        results = list(executor.map(lambda batch: top_k_rows(matrix, candidate_mask, batch, args.k), batches))
+    neighbor_rows = np.concatenate([batch_rows for batch_rows, _ in results] or [np.empty((0, args.k), np.uint32)])
+    scores = np.concatenate([batch_scores for _, batch_scores in results] or [np.empty((0, args.k), np.float32)])
+    elapsed = time.perf_counter() - started
+    print(f"scored {len(query_rows)} words in {elapsed:.1f}s ({len(query_rows) / max(elapsed, 1e-9):.0f} words/s)")
+
+    path = args.cache_dir / f"{version}{NEIGHBOR_TABLE_SUFFIX}"
+    write_neighbor_table(path, version, query_rows, neighbor_rows, scores)
+    table = NeighborTable.open(path)
+    print(f"wrote {path}: {len(table)} words x k={table.k}, {table.nbytes / (1 << 20):.1f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("PYTHONUTF8", "1")
+    raise SystemExit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Build the mapped vocabulary index (and normalized word matrix) for a fastText model ahead of deployment.
+
+The service builds missing files on first load; running this offline moves that cost out of startup and lets
+every worker and `wordscorrelation/correlate_words.py --cache-dir` map the same files.
+
+    python3.11 apps/word-service/tools/build_vocabulary_index.py --model-path apps/word-service/models/cc.zh.100.bin
+
+Python: 3.11+
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+import sys
+import time
+
+import fasttext
+
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SERVICE_ROOT))
+
+from app.model_loader import compute_model_version  # noqa: E402
+from app.vocabulary import VOCABULARY_SUFFIX, VocabularyIndex, write_vocabulary_file  # noqa: E402
+from app.word_matrix import load_normalized_word_matrix  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build <version>.vocab and <version>.f32.npy for a fastText model.")
+    parser.add_argument("--model-path", type=Path, required=True, help="fastText model (.bin).")
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=SERVICE_ROOT / "models" / "cache",
+        help="Output directory; must match WORD_MATRIX_CACHE_DIR of the service.",
+    )
+    parser.add_argument("--skip-matrix", action="store_true", help="Only build the vocabulary index.")
+    parser.add_argument("--force", action="store_true", help="Rebuild the vocabulary index even if it exists.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if not args.model_path.exists():
+        print(f"Model not found: {args.model_path}", file=sys.stderr)
+        return 3
+
+    version = compute_model_version(args.model_path)
+    vocabulary_path = args.cache_dir / f"{version}{VOCABULARY_SUFFIX}"
+    started = time.perf_counter()
+    model = fasttext.load_model(str(args.model_path))
+    print(f"loaded {args.model_path} in {time.perf_counter() - started:.1f}s, version {version}")
+
+    if args.force or not vocabulary_path.exists():
+        started = time.perf_counter()
+        write_vocabulary_file(model.get_words(), vocabulary_path)
+        print(f"wrote {vocabulary_path} in {time.perf_counter() - started:.1f}s")
+    vocabulary = VocabularyIndex.open(vocabulary_path)
+    print(f"vocabulary: {len(vocabulary)} words, {vocabulary.nbytes / (1 << 20):.1f} MiB")
+
+    if not args.skip_matrix:
+        started = time.perf_counter()
+        matrix = load_normalized_word_matrix(model, vocabulary, version, args.cache_dir)
+        print(f"word matrix: {matrix.shape[0]} x {matrix.shape[1]} ready in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("PYTHONUTF8", "1")
+    raise SystemExit(main())
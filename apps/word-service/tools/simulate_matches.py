@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+Play headless AI-vs-AI matches against a running word-service and report speed and game quality.
+
+Each match follows the round loop of GAME_DRAFT.md and apps/server/src/core/game-service.ts: every team draws 4
+secret words from the word bank, and each round every team's speaker gives 3 clues for a random 3-digit code.
+The speaker's teammate guesses the order, and every other team tries to intercept it. An intercepting team
+scores +1 when it is right; an internal miss gives +1 to every other team. A match ends when any team reaches
+2 points, and ties are allowed.
+
+AI players call the word-service the way the Node backend does:
+- a prefetch session is opened per match;
+- a speaker asks the session for clue candidates, retries through the live /related-words query on failure, and
+  falls back to the first 2 characters of the word when both fail. All of this shares one deadline per lookup;
+- guessers score clues against the team's secret words with /sessions/<id>/guess and pick the best order;
+- interceptors score clues against the target team's earlier clues for each number.
+
+    python3.11 apps/word-service/tools/simulate_matches.py --matches 2000 --parallel 32
+
+Python: 3.11+
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import http.client
+import itertools
+import json
+import os
+from pathlib import Path
+import random
+import socket
+import sys
+import threading
+import time
+from urllib.parse import quote, urlparse
+
+
+ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_WORD_BANK_PATH = ROOT / "apps" / "server" / "src" / "data" / "thuocl_words_max4.txt"
+
+SECRET_WORD_COUNT = 4
+CODE_LENGTH = 3
+WINNING_SCORE = 2
+CLUE_MAX_LEN = 10
+# Intercept candidates are capped by the word-service's MAX_SESSION_WORDS; keep the latest clues per number.
+MAX_CLUES_PER_NUMBER = 4
+CODE_ORDERS = list(itertools.permutations(range(1, SECRET_WORD_COUNT + 1), CODE_LENGTH))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Simulate AI-vs-AI matches against the word-service.")
+    parser.add_argument("--url", default="http://127.0.0.1:4201", help="Base URL of the word-service or router.")
+    parser.add_argument("--word-bank", type=Path, default=DEFAULT_WORD_BANK_PATH, help="Secret words, one per line.")
+    parser.add_argument("--matches", type=int, default=1000, help="Number of matches to play.")
+    parser.add_argument("--parallel", type=int, default=32, help="Matches in flight at once.")
+    parser.add_argument("--teams", type=int, choices=(2, 3, 4), default=2, help="Teams per match.")
+    parser.add_argument("--max-rounds", type=int, default=20, help="Rounds before a match is called unfinished.")
+    parser.add_argument("--timeout-ms", type=int, default=1500, help="Budget per clue lookup (WORD_SERVICE_TIMEOUT_MS).")
+    parser.add_argument("--k", type=int, default=10, help="Clue candidates requested per secret word.")
+    parser.add_argument(
+        "--no-sessions", action="store_true", help="Skip prefetch sessions: live clue queries and blind guesses."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for word draws, codes and clue picks.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON instead of a table.")
+    return parser.parse_args()
+
+
+class CallFailedError(RuntimeError):
+    def __init__(self, endpoint: str, status: int | str) -> None:
+        super().__init__(f"{endpoint}: {status}")
+        self.status = status
+
+
+@dataclass
+class SimulationStats:
+    """Shared across match threads; every mutation goes through `record_*` under the lock."""
+
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    latencies_ms: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    failures: Counter[str] = field(default_factory=Counter)
+    clue_sources: Counter[str] = field(default_factory=Counter)
+    outcomes: Counter[str] = field(default_factory=Counter)
+    wins_by_seat: Counter[int] = field(default_factory=Counter)
+    rounds: list[int] = field(default_factory=list)
+    internal_guesses: int = 0
+    internal_misses: int = 0
+    intercept_guesses: int = 0
+    intercepts: int = 0
+    errors: Counter[str] = field(default_factory=Counter)
+
+    def record_call(self, endpoint: str, elapsed_ms: float, status: int | str) -> None:
+        with self.lock:
+            self.latencies_ms[endpoint].append(elapsed_ms)
+            if status != 200 and status != 202:
+                self.failures[f"{endpoint} {status}"] += 1
+
+    def record_match(self, match: "MatchResult") -> None:
+        with self.lock:
+            self.clue_sources.update(match.clue_sources)
+            self.outcomes[match.outcome] += 1
+            self.wins_by_seat.update(match.winner_seats)
+            self.rounds.append(match.rounds)
+            self.internal_guesses += match.internal_guesses
+            self.internal_misses += match.internal_misses
+            self.intercept_guesses += match.intercept_guesses
+            self.intercepts += match.intercepts
+
+
+@dataclass
+class MatchResult:
+    rounds: int = 0
+    outcome: str = "unfinished"
+    winner_seats: list[int] = field(default_factory=list)
+    clue_sources: Counter[str] = field(default_factory=Counter)
+    internal_guesses: int = 0
+    internal_misses: int = 0
+    intercept_guesses: int = 0
+    intercepts: int = 0
+
+
+class WordServiceClient:
+    """Keep-alive JSON client, one connection per match thread, timing every call into `stats`."""
+
+    def __init__(self, url: str, stats: SimulationStats) -> None:
+        target = urlparse(url)
+        self._host = target.hostname or "127.0.0.1"
+        self._port = target.port or 80
+        self._stats = stats
+        self._local = threading.local()
+
+    def post(self, endpoint: str, path: str, body: dict[str, object], deadline: float) -> dict[str, object]:
+        """POST before `deadline` (time.monotonic()); raises CallFailedError on timeout or a non-2xx status."""
+        budget = deadline - time.monotonic()
+        if budget <= 0:
+            raise CallFailedError(endpoint, "deadline")
+        headers = {
+            "content-type": "application/json",
+            "x-request-deadline": str(int(time.time() * 1000 + budget * 1000)),
+        }
+        raw = json.dumps({**body, "budget_ms": int(budget * 1000)})
+        started = time.perf_counter()
+        try:
+            status, payload = self._send(path, raw, headers, budget)
+        except (TimeoutError, socket.timeout):
+            self._stats.record_call(endpoint, (time.perf_counter() - started) * 1000.0, "timeout")
+            raise CallFailedError(endpoint, "timeout") from None
+        except (OSError, http.client.HTTPException):
+            self._stats.record_call(endpoint, (time.perf_counter() - started) * 1000.0, "connection")
+            raise CallFailedError(endpoint, "connection") from None
+        self._stats.record_call(endpoint, (time.perf_counter() - started) * 1000.0, status)
+        if status not in (200, 202):
+            raise CallFailedError(endpoint, status)
+        parsed = json.loads(payload)
+        if not isinstance(parsed, dict):
+            raise CallFailedError(endpoint, "malformed")
+        return parsed
+
+    def _send(self, path: str, raw: str, headers: dict[str, str], budget: float) -> tuple[int, bytes]:
+        for attempt in range(2):
+            connection = getattr(self._local, "connection", None)
+            reused = connection is not None
+            if connection is None:
+                connection = self._local.connection = http.client.HTTPConnection(self._host, self._port)
+            connection.timeout = budget
+            if connection.sock is not None:
+                connection.sock.settimeout(budget)
+            try:
+                connection.request("POST", path, raw, headers)
+                response = connection.getresponse()
+                return response.status, response.read()
+            except (OSError, http.client.HTTPException) as exc:
+                connection.close()
+                self._local.connection = None
+                # A timed-out call is over; only an idle keep-alive connection closed by the server is retried.
+                if isinstance(exc, TimeoutError) or not reused or attempt > 0:
+                    raise
+        raise http.client.HTTPException("connection closed")
+
+
+def trim_clue(value: str) -> str:
+    return value.strip()[:CLUE_MAX_LEN]
+
+
+def best_order(scores: dict[int, dict[str, float]], clues: list[str], rng: random.Random) -> tuple[int, ...]:
+    """Code order maximizing the summed clue-to-number score; ties are broken at random."""
+    orders = CODE_ORDERS[:]
+    rng.shuffle(orders)
+    return max(
+        orders,
+        key=lambda order: sum(scores.get(number, {}).get(clue, 0.0) for number, clue in zip(order, clues)),
+    )
+
+
+class MatchSimulator:
+    def __init__(self, args: argparse.Namespace, words: list[str], client: WordServiceClient) -> None:
+        self._args = args
+        self._words = words
+        self._client = client
+        self._timeout_seconds = args.timeout_ms / 1000.0
+
+    def play(self, match_index: int) -> MatchResult:
+        rng = random.Random(self._args.seed * 1_000_003 + match_index)
+        room_id = f"sim-{self._args.seed}-{match_index}"
+        team_count = self._args.teams
+        drawn = rng.sample(self._words, SECRET_WORD_COUNT * team_count)
+        secret_words = [drawn[team * SECRET_WORD_COUNT : (team + 1) * SECRET_WORD_COUNT] for team in range(team_count)]
+        # history[team][number] lists the clues given for that number in earlier rounds, oldest first.
+        history: list[dict[int, list[str]]] = [defaultdict(list) for _ in range(team_count)]
+        scores = [0] * team_count
+        result = MatchResult()
+
+        session_id = None if self._args.no_sessions else self._create_session(room_id, drawn)
+        for round_number in range(1, self._args.max_rounds + 1):
+            result.rounds = round_number
+            codes = [tuple(rng.sample(range(1, SECRET_WORD_COUNT + 1), CODE_LENGTH)) for _ in range(team_count)]
+            clues = [
+                self._speak(session_id, secret_words[team], codes[team], rng, result.clue_sources)
+                for team in range(team_count)
+            ]
+
+            for team in range(team_count):
+                # Guessing works on distinct clue texts; a clue repeated in one round scores the same everywhere.
+                own_guess = self._guess(
+                    session_id,
+                    clues[team],
+                    {number: [word] for number, word in enumerate(secret_words[team], start=1)},
+                    rng,
+                )
+                result.internal_guesses += 1
+                if own_guess != codes[team]:
+                    result.internal_misses += 1
+                    for other in range(team_count):
+                        if other != team:
+                            scores[other] += 1
+                for other in range(team_count):
+                    if other == team:
+                        continue
+                    # Both players of an intercepting team see the same table, so they submit the same guess
+                    # and the team scores at most once, as in resolveRound.
+                    intercept_guess = self._guess(session_id, clues[team], history[team], rng)
+                    result.intercept_guesses += 1
+                    if intercept_guess == codes[team]:
+                        result.intercepts += 1
+                        scores[other] += 1
+
+            for team in range(team_count):
+                for number, clue in zip(codes[team], clues[team]):
+                    history[team][number] = (history[team][number] + [clue])[-MAX_CLUES_PER_NUMBER:]
+
+            winners = [team for team in range(team_count) if scores[team] >= WINNING_SCORE]
+            if winners:
+                result.winner_seats = winners
+                result.outcome = "win" if len(winners) == 1 else "tie"
+                break
+        return result
+
+    def _create_session(self, room_id: str, words: list[str]) -> str | None:
+        try:
+            payload = self._client.post(
+                "sessions",
+                "/api/v1/sessions",
+                {"room_id": room_id, "words": words, "k": self._args.k},
+                time.monotonic() + self._timeout_seconds,
+            )
+        except CallFailedError:
+            # Same as the Node prefetch: the match goes on with live queries only.
+            return None
+        session_id = payload.get("session_id")
+        return session_id if isinstance(session_id, str) else None
+
+    def _speak(
+        self,
+        session_id: str | None,
+        team_words: list[str],
+        code: tuple[int, ...],
+        rng: random.Random,
+        sources: Counter[str],
+    ) -> list[str]:
+        clues: list[str] = []
+        for number in code:
+            word = team_words[number - 1]
+            source, candidates = self._fetch_candidates(session_id, word, team_words)
+            usable = [clue for clue in (trim_clue(item[0]) for item in candidates) if clue]
+            if usable:
+                sources[source] += 1
+                clues.append(rng.choice(usable))
+            else:
+                sources["fallback"] += 1
+                clues.append(trim_clue(word[:2]))
+        return clues
+
+    def _fetch_candidates(self, session_id: str | None, word: str, team_words: list[str]) -> tuple[str, list[list]]:
+        # One budget for the whole lookup, as in AIClueGenerator.fetchCandidates.
+        deadline = time.monotonic() + self._timeout_seconds
+        body = {"word": word, "k": self._args.k, "format": "compact", "exclude_containing": team_words}
+        if session_id is not None:
+            try:
+                path = f"/api/v1/sessions/{quote(session_id)}/clues"
+                payload = self._client.post("session_clues", path, body, deadline)
+                return "session", list(payload.get("candidates") or [])
+            except CallFailedError:
+                pass
+        try:
+            payload = self._client.post("related_words", "/api/v1/related-words", body, deadline)
+        except CallFailedError:
+            return "fallback", []
+        return "live", list(payload.get("neighbors") or [])
+
+    def _guess(
+        self,
+        session_id: str | None,
+        clues: list[str],
+        candidates_by_number: dict[int, list[str]],
+        rng: random.Random,
+    ) -> tuple[int, ...]:
+        candidates = sorted({word for words in candidates_by_number.values() for word in words})
+        if session_id is None or not candidates:
+            # Nothing to compare against (first round of intercepts, or no session): a blind guess.
+            return rng.choice(CODE_ORDERS)
+        try:
+            payload = self._client.post(
+                "session_guess",
+                f"/api/v1/sessions/{quote(session_id)}/guess",
+                {"clues": clues, "candidates": candidates},
+                time.monotonic() + self._timeout_seconds,
+            )
+        except CallFailedError:
+            return rng.choice(CODE_ORDERS)
+        by_pair = {
+            (clue, candidate): score
+            for clue, row in zip(payload.get("clues") or [], payload.get("scores") or [])
+            for candidate, score in zip(payload.get("candidates") or [], row)
+        }
+        scores = {
+            number: {clue: max((by_pair.get((clue, word), 0.0) for word in words), default=0.0) for clue in clues}
+            for number, words in candidates_by_number.items()
+        }
+        return best_order(scores, clues, rng)
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def build_report(stats: SimulationStats, args: argparse.Namespace, elapsed: float) -> dict[str, object]:
+    matches = max(sum(stats.outcomes.values()), 1)
+    all_latencies = sorted(value for values in stats.latencies_ms.values() for value in values)
+    endpoints: dict[str, object] = {}
+    for endpoint, values in sorted(stats.latencies_ms.items()):
+        ordered = sorted(values)
+        endpoints[endpoint] = {
+            "calls_per_match": round(len(ordered) / matches, 2),
+            "p50_ms": round(percentile(ordered, 0.50), 2),
+            "p95_ms": round(percentile(ordered, 0.95), 2),
+            "p99_ms": round(percentile(ordered, 0.99), 2),
+        }
+    clues_total = max(sum(stats.clue_sources.values()), 1)
+    return {
+        "matches": sum(stats.outcomes.values()),
+        "teams": args.teams,
+        "parallel": args.parallel,
+        "elapsed_seconds": round(elapsed, 2),
+        "matches_per_second": round(sum(stats.outcomes.values()) / elapsed, 2) if elapsed > 0 else 0.0,
+        "rounds_per_match": round(sum(stats.rounds) / matches, 2),
+        "calls_per_match": round(len(all_latencies) / matches, 2),
+        "latency_ms": {
+            "p50": round(percentile(all_latencies, 0.50), 2),
+            "p95": round(percentile(all_latencies, 0.95), 2),
+            "p99": round(percentile(all_latencies, 0.99), 2),
+        },
+        "endpoints": endpoints,
+        "failed_calls": dict(stats.failures),
+        "clue_sources": {source: round(count / clues_total, 4) for source, count in sorted(stats.clue_sources.items())},
+        "fallback_clue_rate": round(stats.clue_sources["fallback"] / clues_total, 4),
+        "internal_miss_rate": round(stats.internal_misses / max(stats.internal_guesses, 1), 4),
+        "intercept_rate": round(stats.intercepts / max(stats.intercept_guesses, 1), 4),
+        "outcomes": {outcome: round(count / matches, 4) for outcome, count in sorted(stats.outcomes.items())},
+        "win_rate_by_seat": {
+            f"team_{seat + 1}": round(stats.wins_by_seat[seat] / matches, 4) for seat in range(args.teams)
+        },
+        "match_errors": dict(stats.errors),
+    }
+
+
+def print_report(report: dict[str, object]) -> None:
+    latency = report["latency_ms"]
+    print(
+        f"matches: {report['matches']} ({report['teams']} teams, {report['parallel']} in flight) in "
+        f"{report['elapsed_seconds']}s, {report['matches_per_second']} matches/s, "
+        f"{report['rounds_per_match']} rounds/match"
+    )
+    print(
+        f"calls/match: {report['calls_per_match']}, latency p50/p95/p99: "
+        f"{latency['p50']}/{latency['p95']}/{latency['p99']} ms"
+    )
+    print(f"{'endpoint':<16}{'calls/match':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for endpoint, entry in report["endpoints"].items():
+        print(
+            f"{endpoint:<16}{entry['calls_per_match']:>12}{entry['p50_ms']:>10}{entry['p95_ms']:>10}{entry['p99_ms']:>10}"
+        )
+    print(f"clue sources: {report['clue_sources']} (fallback clue rate {report['fallback_clue_rate']})")
+    print(f"internal miss rate: {report['internal_miss_rate']}, intercept rate: {report['intercept_rate']}")
+    print(f"outcomes: {report['outcomes']}, wins by team: {report['win_rate_by_seat']}")
+    if report["failed_calls"]:
+        print(f"failed calls: {report['failed_calls']}")
+    if report["match_errors"]:
+        print(f"match errors: {report['match_errors']}")
+
+
+def main() -> int:
+    args = parse_args()
+    words = [line.strip() for line in args.word_bank.read_text(encoding="utf-8").splitlines() if line.strip()]
+    words = list(dict.fromkeys(words))
+    if len(words) < SECRET_WORD_COUNT * args.teams:
+        print(f"word bank has only {len(words)} words", file=sys.stderr)
+        return 1
+
+    stats = SimulationStats()
+    simulator = MatchSimulator(args, words, WordServiceClient(args.url, stats))
+
+    def play(match_index: int) -> None:
+        try:
+            stats.record_match(simulator.play(match_index))
+        except Exception as exc:  # noqa: BLE001
+            with stats.lock:
+                stats.errors[type(exc).__name__] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.parallel) as executor:
+        list(executor.map(play, range(args.matches)))
+    report = build_report(stats, args, time.perf_counter() - started)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+    return 1 if stats.errors else 0
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("PYTHONUTF8", "1")
+    raise SystemExit(main())
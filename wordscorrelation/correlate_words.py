@@ -13,13 +13,16 @@ import math
 import os
 import sys
 from pathlib import Path
+from typing import Any
 
 import fasttext
+import numpy as np
 
 
 ROOT = Path(__file__).resolve().parent
 DEFAULT_REDUCED_BIN_MODEL_PATH = ROOT / "data" / "models" / "cc.zh.100.bin"
 DEFAULT_BIN_MODEL_PATH = ROOT / "data" / "models" / "cc.zh.300.bin"
+WORD_SERVICE_ROOT = ROOT.parent / "apps" / "word-service"
 
 
 def resolve_default_model_path() -> Path:
@@ -28,6 +31,51 @@ def resolve_default_model_path() -> Path:
     return DEFAULT_BIN_MODEL_PATH
 
 
+def open_word_service_cache(cache_dir: Path, model_path: Path) -> tuple[Any, np.ndarray] | None:
+    """Map the word-service `<version>.vocab` and `<version>.f32.npy` of this model, if they were built.
+
+    The format and versioning belong to the word-service, so its modules are imported rather than copied; they
+    (and the word-service requirements) are only needed with `--cache-dir`.
+    """
+    sys.path.insert(0, str(WORD_SERVICE_ROOT))
+    from app.model_loader import compute_model_version
+    from app.vocabulary import VOCABULARY_SUFFIX, VocabularyIndex
+
+    version = compute_model_version(model_path)
+    vocab_path = cache_dir / f"{version}{VOCABULARY_SUFFIX}"
+    matrix_path = cache_dir / f"{version}.f32.npy"
+    if not vocab_path.exists() or not matrix_path.exists():
+        print(f"No cached index for {version} in {cache_dir}; using fastText search.", file=sys.stderr)
+        return None
+    return VocabularyIndex.open(vocab_path), np.load(matrix_path, mmap_mode="r")
+
+
+def mapped_neighbors(
+    word: str,
+    k: int,
+    model: fasttext.FastText._FastText,
+    vocabulary: Any,
+    matrix: np.ndarray,
+) -> list[tuple[float, str]]:
+    row = vocabulary.row_of(word)
+    if row is not None:
+        query = np.asarray(matrix[row])
+    else:
+        query = np.asarray(model.get_word_vector(word), dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if norm == 0.0:
+            return []
+        query = query / norm
+    scores = matrix @ query
+    if row is not None:
+        # Match get_nearest_neighbors, which never returns the query word itself.
+        scores[row] = -np.inf
+    k = min(k, scores.shape[0])
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    return [(float(scores[index]), vocabulary.word_at(int(index))) for index in top]
+
+
 def cosine_similarity(vec_a: list[float], vec_b: list[float]) -> float:
     dot = 0.0
     norm_a = 0.0
@@ -83,6 +131,15 @@ def parse_args() -> argparse.Namespace:
         default=8,
         help="Top-K nearest neighbors for each input word. Set 0 to disable.",
     )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help=(
+            "word-service WORD_MATRIX_CACHE_DIR. When it holds <version>.vocab and <version>.f32.npy for the "
+            "model, neighbors come from the mapped matrix instead of fastText's in-memory search."
+        ),
+    )
     parser.add_argument(
         "--json",
         action="store_true",
@@ -108,8 +165,12 @@ def main() -> int:
 
     neighbors_data: dict[str, list[dict[str, float]]] = {}
     if args.neighbors > 0:
+        cached = open_word_service_cache(args.cache_dir, model_path) if args.cache_dir is not None else None
         for word in args.words:
-            nn = model.get_nearest_neighbors(word, k=args.neighbors)
+            if cached is not None:
+                nn = mapped_neighbors(word, args.neighbors, model, *cached)
+            else:
+                nn = model.get_nearest_neighbors(word, k=args.neighbors)
             neighbors_data[word] = [{"word": w, "score": s} for s, w in nn]
 
     if args.json: